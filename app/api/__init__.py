@@ -24,10 +24,12 @@ from ..services.adjustment_service import AdjustmentService
 from ..services.employee_service import EmployeeAPIService, EmployeeService
 from ..services.message_service import MessageService
 from ..services.payout_service import PayoutService
+from ..services.salary_analytics_service import SalaryAnalyticsService
 from ..services.salary_service import SalaryService
 from ..services.schedule_service import ScheduleService
 from ..services.telegram_service import TelegramService
 from ..services.vacation_service import VacationService
+from ..utils.executor import get_executor_metrics, track_request
 from .adjustments import create_adjustment_router
 from .assets import create_asset_router
 from .auth import create_auth_router
@@ -74,6 +76,15 @@ def create_app() -> FastAPI:
     async def ping():
         return {"status": "ok"}
 
+    @app.middleware("http")
+    async def track_executor_time(request: Request, call_next):
+        with track_request():
+            return await call_next(request)
+
+    @app.get("/metrics/executor", dependencies=[Depends(get_current_user)])
+    async def executor_metrics():
+        return get_executor_metrics().snapshot()
+
     if telegram_app is not None:
 
         @app.on_event("startup")
@@ -129,7 +140,8 @@ def create_app() -> FastAPI:
 
     protected = [Depends(get_current_user)]
 
-    employee_service = EmployeeService()
+    # share the repository whose ``version`` invalidates the auth caches
+    employee_service = EmployeeService(access_service.employee_repo)
     employee_api = EmployeeAPIService(employee_service)
     app.include_router(
         create_employee_router(employee_api, access_service),
@@ -138,8 +150,9 @@ def create_app() -> FastAPI:
     )
 
     salary_service = SalaryService(employee_service._repo)
+    salary_analytics = SalaryAnalyticsService(salary_service)
     app.include_router(
-        create_salary_router(salary_service, access_service),
+        create_salary_router(salary_service, access_service, salary_analytics),
         prefix="/api",
         dependencies=protected,
     )
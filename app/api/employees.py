@@ -3,9 +3,9 @@ from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFil
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeOut
 from app.services.employee_service import EmployeeAPIService
 from app.services.pdf_profile import generate_employee_pdf
-from app.data.payout_repository import PayoutRepository
-from app.data.vacation_repository import VacationRepository
+from app.data.factory import get_payout_repository, get_vacation_repository
 from app.services.access_control_service import AccessControlService, ResolvedUser
+from app.utils.executor import run_blocking
 
 from .dependencies import get_current_user
 
@@ -25,12 +25,11 @@ def create_employee_router(
         current: ResolvedUser = Depends(get_current_user),
     ):
         employees = await service.list_employees(archived=archived)
+        visibility = access_service.visibility(current)
         return [
             employee
             for employee in employees
-            if access_service.is_employee_visible(
-                current, employee.id, employee.work_place
-            )
+            if visibility.contains(employee.id, employee.work_place)
         ]
 
     @router.post("/", response_model=EmployeeOut)
@@ -105,11 +104,12 @@ def create_employee_router(
             current, str(user_id), _employee_department(str(user_id))
         ):
             raise HTTPException(status_code=403, detail="forbidden")
-        pdf_bytes = generate_employee_pdf(
+        pdf_bytes = await run_blocking(
+            generate_employee_pdf,
             user_id,
             employee_repo=service.service._repo,
-            payout_repo=PayoutRepository(),
-            vacation_repo=VacationRepository(),
+            payout_repo=get_payout_repository(),
+            vacation_repo=get_vacation_repository(),
         )
         headers = {"Content-Disposition": "inline; filename=profile.pdf"}
         return Response(content=pdf_bytes,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Response
 from typing import Optional, List
 from app.schemas.message import MessageRequest, MessageOut
 from app.services.message_service import MessageService
@@ -10,8 +10,22 @@ def create_message_router(service: MessageService, templates: TemplateService |
     template_service = templates or TemplateService()
 
     @router.get("/", response_model=List[MessageOut])
-    async def list_messages() -> List[MessageOut]:
-        return await service.list_messages()
+    async def list_messages(
+        response: Response,
+        limit: int = Query(50, ge=1, le=500),
+        cursor: Optional[str] = Query(None),
+        user_id: Optional[str] = Query(None),
+        accepted: Optional[bool] = Query(None),
+    ) -> List[MessageOut]:
+        try:
+            items, next_cursor = await service.page_messages(
+                limit, cursor, user_id=user_id, accepted=accepted
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid_cursor")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return items
 
     @router.post("/", response_model=MessageOut)
     async def send_message(
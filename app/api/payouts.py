@@ -26,8 +26,8 @@ def create_payout_router(
             return payouts
         return [p for p in payouts if str(p.user_id) in allowed]
 
-    def _ensure_access(payout_id: str, current: ResolvedUser) -> None:
-        owner = service.get_payout_employee(payout_id)
+    async def _ensure_access(payout_id: str, current: ResolvedUser) -> None:
+        owner = await service.get_payout_employee(payout_id)
         if owner is None:
             return
         if not access_service.is_employee_visible(current, owner):
@@ -46,10 +46,15 @@ def create_payout_router(
         allowed = access_service.visible_employee_ids(current)
         if allowed is not None and employee_id and employee_id not in allowed:
             return []
-        payouts = await service.list_payouts(
-            employee_id, payout_type, status, method, from_date, to_date
+        return await service.list_payouts(
+            employee_id,
+            payout_type,
+            status,
+            method,
+            from_date,
+            to_date,
+            user_ids=allowed,
         )
-        return _filter_visible(payouts, current)
 
     @router.get("", response_model=list[Payout], include_in_schema=False)
     async def list_payouts_no_slash(
@@ -64,10 +69,15 @@ def create_payout_router(
         allowed = access_service.visible_employee_ids(current)
         if allowed is not None and employee_id and employee_id not in allowed:
             return []
-        payouts = await service.list_payouts(
-            employee_id, payout_type, status, method, from_date, to_date
+        return await service.list_payouts(
+            employee_id,
+            payout_type,
+            status,
+            method,
+            from_date,
+            to_date,
+            user_ids=allowed,
         )
-        return _filter_visible(payouts, current)
 
     @router.post("/", response_model=Payout)
     async def create_payout(
@@ -87,7 +97,7 @@ def create_payout_router(
         update: PayoutUpdate,
         current: ResolvedUser = Depends(get_current_user),
     ):
-        _ensure_access(payout_id, current)
+        await _ensure_access(payout_id, current)
         if update.timestamp is not None and not access_service.user_has_permission(
             current, MANAGE_DATES_PERMISSION
         ):
@@ -122,7 +132,7 @@ def create_payout_router(
     ):
         if body.status is None:
             raise HTTPException(status_code=400, detail="status required")
-        _ensure_access(payout_id, current)
+        await _ensure_access(payout_id, current)
         notify = True if body.notify_user is None else body.notify_user
         updated = await service.update_status(payout_id, body.status, notify)
         if updated:
@@ -135,7 +145,7 @@ def create_payout_router(
     async def approve(
         payout_id: str, current: ResolvedUser = Depends(get_current_user)
     ):
-        _ensure_access(payout_id, current)
+        await _ensure_access(payout_id, current)
         updated = await service.update_status(payout_id, PAYOUT_STATUSES[1])
         if updated:
             if not access_service.is_employee_visible(current, updated.user_id):
@@ -147,7 +157,7 @@ def create_payout_router(
     async def reject(
         payout_id: str, current: ResolvedUser = Depends(get_current_user)
     ):
-        _ensure_access(payout_id, current)
+        await _ensure_access(payout_id, current)
         updated = await service.update_status(payout_id, PAYOUT_STATUSES[2])
         if updated:
             if not access_service.is_employee_visible(current, updated.user_id):
@@ -159,7 +169,7 @@ def create_payout_router(
     async def mark_paid(
         payout_id: str, current: ResolvedUser = Depends(get_current_user)
     ):
-        _ensure_access(payout_id, current)
+        await _ensure_access(payout_id, current)
         updated = await service.update_status(payout_id, PAYOUT_STATUSES[3])
         if updated:
             if not access_service.is_employee_visible(current, updated.user_id):
@@ -171,7 +181,7 @@ def create_payout_router(
     async def delete_payout(
         payout_id: str, current: ResolvedUser = Depends(get_current_user)
     ):
-        _ensure_access(payout_id, current)
+        await _ensure_access(payout_id, current)
         deleted = await service.delete_payout(payout_id)
         if deleted:
             return {"detail": "deleted"}
@@ -186,7 +196,7 @@ def create_payout_router(
     async def delete_many(ids: str, current: ResolvedUser = Depends(get_current_user)):
         id_list = [i for i in ids.split(",") if i]
         for payout_id in id_list:
-            _ensure_access(payout_id, current)
+            await _ensure_access(payout_id, current)
         await service.delete_payouts(id_list)
         return {"ok": True}
 
@@ -241,11 +251,8 @@ def create_payout_router(
             employee_id,
             department,
             status,
+            user_ids=allowed,
         )
-        if allowed is not None:
-            result = [
-                item for item in result if str(item.get("user_id")) in allowed
-            ]
         return [{k: v for k, v in item.items() if k != "user_id"} for item in result]
 
     return router
@@ -2,17 +2,27 @@ from typing import Optional, List
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response
 
-from app.schemas.salary import SalaryRow
+from app.schemas.salary import (
+    SalaryPointTotal,
+    SalaryRow,
+    SalaryTotals,
+    SalaryTrend,
+)
+from app.services.salary_analytics_service import SalaryAnalyticsService
 from app.services.salary_service import SalaryService
+from app.utils.executor import run_blocking
 from app.services.access_control_service import AccessControlService, ResolvedUser
 
 from .dependencies import get_current_user
 
 
 def create_salary_router(
-    service: SalaryService, access_service: AccessControlService
+    service: SalaryService,
+    access_service: AccessControlService,
+    analytics: SalaryAnalyticsService | None = None,
 ) -> APIRouter:
     router = APIRouter(prefix="/salary", tags=["Salary"])
+    analytics = analytics or SalaryAnalyticsService(service)
 
     def _filter_salary(rows: List[SalaryRow], current: ResolvedUser) -> List[SalaryRow]:
         allowed = access_service.visible_employee_ids(current)
@@ -46,10 +56,53 @@ def create_salary_router(
         rows = await service.get_salary(month=month)
         from app.services.salary_report import generate_salary_pdf
 
-        pdf_bytes = generate_salary_pdf(rows, month)
+        pdf_bytes = await run_blocking(generate_salary_pdf, rows, month)
         headers = {"Content-Disposition": "inline; filename=salary_report.pdf"}
         return Response(content=pdf_bytes,
                         media_type="application/pdf",
                         headers=headers)
 
+    @router.get("/analytics/ytd", response_model=List[SalaryTotals])
+    async def salary_year_to_date(
+        until: Optional[str] = Query(None),
+        metrics: Optional[List[str]] = Query(None),
+        current: ResolvedUser = Depends(get_current_user),
+    ):
+        allowed = access_service.visible_employee_ids(current)
+        try:
+            return await analytics.year_to_date(
+                until=until, metrics=metrics, employee_ids=allowed
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    @router.get("/analytics/trend", response_model=List[SalaryTrend])
+    async def salary_trend(
+        metric: str = Query("final_amount"),
+        employee_id: Optional[str] = Query(None),
+        current: ResolvedUser = Depends(get_current_user),
+    ):
+        allowed = access_service.visible_employee_ids(current)
+        if employee_id:
+            if allowed is not None and employee_id not in allowed:
+                return []
+            allowed = {employee_id}
+        try:
+            return await analytics.trend(metric=metric, employee_ids=allowed)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    @router.get("/analytics/points", response_model=List[SalaryPointTotal])
+    async def salary_points(
+        month: Optional[str] = Query(None),
+        metric: str = Query("final_amount"),
+        current: ResolvedUser = Depends(get_current_user),
+    ):
+        if access_service.visible_employee_ids(current) is not None:
+            raise HTTPException(status_code=403, detail="forbidden")
+        try:
+            return await analytics.points(month=month, metric=metric)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
     return router
@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from app.schemas.message import MessageRequest, BroadcastRequest, SentMessage
 from app.services.telegram_service import (
     TelegramAPIError,
@@ -83,6 +84,7 @@ def create_telegram_router(repo: EmployeeRepository) -> APIRouter:
                 photo_url=data.photo_url,
                 filters=filters,
                 test_user_id=data.test_user_id,
+                batch_id=data.batch_id,
             )
             return result
         except TelegramNotConfiguredError as exc:
@@ -111,8 +113,29 @@ def create_telegram_router(repo: EmployeeRepository) -> APIRouter:
             ) from exc
 
     @router.get("/sent_messages", response_model=list[SentMessage])
-    async def sent_messages() -> list[SentMessage]:
-        return [SentMessage(**m) for m in service._load_log()]
+    async def sent_messages(
+        response: Response,
+        limit: int = Query(50, ge=1, le=500),
+        cursor: Optional[str] = Query(None),
+        user_id: Optional[str] = Query(None),
+        batch_id: Optional[str] = Query(None),
+        broadcast: Optional[bool] = Query(None),
+        accepted: Optional[bool] = Query(None),
+    ) -> list[SentMessage]:
+        try:
+            items, next_cursor = service.list_log(
+                limit,
+                cursor,
+                user_id=user_id,
+                batch_id=batch_id,
+                broadcast=broadcast,
+                accepted=accepted,
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="invalid_cursor")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return [SentMessage(**m) for m in items]
 
     @router.delete("/sent_messages/{entry_id}")
     async def delete_sent_message(entry_id: str):
@@ -81,3 +81,15 @@ DEFAULT_CARD_DISPATCH_CHAT_KEY = (
     CARD_DISPATCH_CHATS[0]["key"] if CARD_DISPATCH_CHATS else None
 )
 SECRET_KEY = settings.secret_key
+STORAGE_ENGINE = settings.storage_engine
+JOURNAL_COMPACT_THRESHOLD = settings.journal_compact_threshold
+DATABASE_URL = settings.database_url
+EXCEL_CACHE_MAX_MB = settings.excel_cache_max_mb
+EXCEL_SNAPSHOT_DIR = settings.excel_snapshot_dir
+AUTH_CACHE_TTL_SECONDS = settings.auth_cache_ttl_seconds
+AUTH_CACHE_SIZE = settings.auth_cache_size
+BROADCAST_CONCURRENCY = settings.broadcast_concurrency
+BROADCAST_RATE = settings.broadcast_rate
+BROADCAST_CHAT_RATE = settings.broadcast_chat_rate
+BROADCAST_MAX_RETRIES = settings.broadcast_max_retries
+BLOCKING_EXECUTOR_WORKERS = settings.blocking_executor_workers
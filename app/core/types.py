@@ -8,7 +8,7 @@ from .enums import EmployeeStatus
 from ..constants import PayoutStates as PayoutStates  # re-export for handlers
 
 
-@dataclass
+@dataclass(slots=True)
 class Employee:
     """Employee information."""
 
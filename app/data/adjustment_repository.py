@@ -4,11 +4,13 @@ from typing import List, Dict, Any, Optional
 
 from app.config import ADJUSTMENTS_FILE
 from app.utils.logger import log
+from .journal_storage import JournaledRecordsMixin, open_journal
 
 
-class AdjustmentRepository:
+class AdjustmentRepository(JournaledRecordsMixin):
     def __init__(self, file_path: Optional[str] = None) -> None:
         self._file = file_path or ADJUSTMENTS_FILE
+        self._journal = open_journal(self._file)
         self._data: List[Dict[str, Any]] = self._load()
         if not self._data:
             log("⚠️ AdjustmentRepository loaded no adjustments")
@@ -36,6 +38,8 @@ class AdjustmentRepository:
         try:
             with open(self._file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            if self._journal is not None:
+                data = self._journal.replay(data)
         except Exception:
             data = []
         if not data:
@@ -51,6 +55,9 @@ class AdjustmentRepository:
         return data
 
     def _save(self) -> None:
+        if self._journal is not None:
+            self._journal.compact(self._data)
+            return
         with open(self._file, 'w', encoding='utf-8') as f:
             json.dump(self._data, f, ensure_ascii=False, indent=2)
 
@@ -66,7 +73,7 @@ class AdjustmentRepository:
                 data['id']) for it in self._data):
             data['id'] = self._generate_id()
         self._data.append(data)
-        self._save()
+        self._save_record(data)
         return data
 
     def update(self, adj_id: str,
@@ -75,7 +82,7 @@ class AdjustmentRepository:
             if str(item.get('id')) == str(adj_id):
                 item.update(
                     {k: v for k, v in updates.items() if v is not None})
-                self._save()
+                self._save_record(item)
                 return item
         return None
 
@@ -83,4 +90,4 @@ class AdjustmentRepository:
         self._data = [
             it for it in self._data if str(
                 it.get('id')) != str(adj_id)]
-        self._save()
+        self._delete_record(adj_id)
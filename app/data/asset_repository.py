@@ -4,11 +4,13 @@ from typing import Any, Dict, List, Optional
 
 from app.config import ASSETS_FILE
 from app.utils.logger import log
+from .journal_storage import JournaledRecordsMixin, open_journal
 
 
-class AssetRepository:
+class AssetRepository(JournaledRecordsMixin):
     def __init__(self, file_path: Optional[str] = None) -> None:
         self._file = file_path or ASSETS_FILE
+        self._journal = open_journal(self._file)
         log(f"\U0001F4C2 Loading assets from {self._file}")
         self._data: List[Dict[str, Any]] = self._load()
         self._counter = max(
@@ -34,6 +36,8 @@ class AssetRepository:
         try:
             with open(self._file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            if self._journal is not None:
+                data = self._journal.replay(data)
         except Exception as e:
             log(f"\u274C Failed reading {self._file}: {e}")
             data = []
@@ -52,6 +56,9 @@ class AssetRepository:
         return data
 
     def _save(self) -> None:
+        if self._journal is not None:
+            self._journal.compact(self._data)
+            return
         with open(self._file, 'w', encoding='utf-8') as f:
             json.dump(self._data, f, ensure_ascii=False, indent=2)
 
@@ -72,17 +79,17 @@ class AssetRepository:
         if 'id' not in data or any(str(it.get('id')) == str(data['id']) for it in self._data):
             data['id'] = self._generate_id()
         self._data.append(data)
-        self._save()
+        self._save_record(data)
         return data
 
     def update(self, item_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         for item in self._data:
             if str(item.get('id')) == str(item_id):
                 item.update({k: v for k, v in updates.items() if v is not None})
-                self._save()
+                self._save_record(item)
                 return item
         return None
 
     def delete(self, item_id: str) -> None:
         self._data = [it for it in self._data if str(it.get('id')) != str(item_id)]
-        self._save()
+        self._delete_record(item_id)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Iterable
+
+# Filesystems keep mtimes with a coarse resolution (down to 2s on FAT), so a
+# same-size rewrite right after a check may keep the old stat signature.
+RACY_WINDOW = 2.0
+
+
+def _stat(path: Path) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _digest(path: Path) -> str | None:
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class FileChangeDetector:
+    """Tell whether a group of files changed on disk since they were last seen.
+
+    The cheap check compares ``(mtime, size, inode)`` of every file. The content
+    hash is only computed when the signature differs or is too recent to be
+    trusted, so a ``touch`` or a rewrite with identical content is not reported
+    as a change.
+    """
+
+    def __init__(self, paths: Iterable[str | Path], racy_window: float = RACY_WINDOW) -> None:
+        self.paths = [Path(p) for p in paths]
+        self.racy_window = racy_window
+        self._seen: dict[Path, tuple[tuple[int, int, int] | None, str | None]] = {}
+        self._seen_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _racy(self, stat: tuple[int, int, int] | None) -> bool:
+        return stat is not None and stat[0] / 1e9 >= self._seen_at - self.racy_window
+
+    def changed(self) -> bool:
+        """Return ``True`` when any file differs from the last seen state."""
+        if not self._seen:
+            self.misses += 1
+            return True
+        verified = False
+        for path in self.paths:
+            stat = _stat(path)
+            seen_stat, seen_digest = self._seen.get(path, (None, None))
+            if stat == seen_stat and not self._racy(stat):
+                continue
+            if stat is None or seen_stat is None or _digest(path) != seen_digest:
+                self.misses += 1
+                return True
+            verified = True
+        if verified:
+            self.mark_seen()
+        self.hits += 1
+        return False
+
+    def mark_seen(self) -> None:
+        """Remember the current state of the files as up to date."""
+        seen: dict[Path, tuple[tuple[int, int, int] | None, str | None]] = {}
+        for path in self.paths:
+            stat = _stat(path)
+            old_stat, old_digest = self._seen.get(path, (None, None))
+            if stat is None:
+                seen[path] = (None, None)
+            elif stat == old_stat and not self._racy(stat):
+                seen[path] = (stat, old_digest)
+            else:
+                seen[path] = (stat, _digest(path))
+        self._seen = seen
+        self._seen_at = time.time()
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
@@ -8,6 +8,7 @@ from typing import List
 from app.core.types import Employee, EmployeeStatus
 from app.utils.config import DATA_FILE
 from app.utils.logger import log
+from .journal_storage import create_storage
 from .json_storage import JsonStorage
 
 
@@ -23,20 +24,94 @@ def _serialize(obj):
     return obj
 
 
+# list filters answered from the secondary indexes, in evaluation order
+_INDEXED_FILTERS = ("status", "position", "work_place", "tags")
+
+
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
 class EmployeeRepository:
-    """Repository for employees."""
+    """Repository for employees.
+
+    ``Employee`` objects are materialized once per record and shared between
+    callers; a write through the repository re-materializes only the changed
+    record. Secondary indexes by archive flag, status, position, work place,
+    tag and birthday ``(month, day)`` answer the ``list_employees`` filters.
+    ``version`` is bumped on every write so callers can cache derived data.
+    """
 
     def __init__(self, storage: JsonStorage | None = None) -> None:
-        self._storage = storage or JsonStorage(DATA_FILE)
+        self._storage = storage or create_storage(DATA_FILE)
         log(f"📂 Loading employees from {self._storage.path}")
         self._data: dict[str, dict] = self._storage.load() or {}
         log(f"✅ Loaded employees: {len(self._data)}")
         if not self._data:
             log("⚠️ EmployeeRepository loaded no employees")
+        self.version = 0
+        self._reset_cache()
+
+    def _reset_cache(self) -> None:
+        self._objects: dict[str, Employee] = {}
+        self._keys: dict[str, list[tuple[str, object]]] = {}
+        self._index: dict[str, dict] = {
+            name: {} for name in ("archived", "birthday", *_INDEXED_FILTERS)
+        }
+        self._seq = {uid: i for i, uid in enumerate(self._data)}
+        self._next_seq = len(self._seq)
+        self._stale: set[str] = set(self._data)
 
     def _save(self) -> None:
         self._storage.save(self._data)
 
+    # ------------------------------------------------------------------
+    # object cache and indexes
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _index_keys(emp: Employee):
+        yield "archived", emp.archived
+        yield "status", emp.status.value
+        yield "position", emp.position
+        yield "work_place", emp.work_place
+        for tag in set(emp.tags or []):
+            yield "tags", tag
+        if emp.birthdate:
+            yield "birthday", (emp.birthdate.month, emp.birthdate.day)
+
+    def _invalidate(self, uid: str) -> None:
+        # callers may have changed the shared object already, so the index
+        # entries are dropped by the keys recorded at materialization
+        self._objects.pop(uid, None)
+        for name, key in self._keys.pop(uid, ()):
+            bucket = self._index[name][key]
+            bucket.discard(uid)
+            if not bucket:
+                del self._index[name][key]
+        if uid in self._data:
+            self._stale.add(uid)
+            if uid not in self._seq:
+                self._seq[uid] = self._next_seq
+                self._next_seq += 1
+        else:
+            self._stale.discard(uid)
+            self._seq.pop(uid, None)
+        self.version += 1
+
+    def _materialize(self, uid: str) -> None:
+        data = self._data.get(uid)
+        if isinstance(data, dict):
+            emp = self._create_employee(uid, data)
+            self._objects[uid] = emp
+            self._keys[uid] = list(self._index_keys(emp))
+            for name, key in self._keys[uid]:
+                self._index[name].setdefault(key, set()).add(uid)
+        self._stale.discard(uid)
+
+    def _refresh(self) -> None:
+        for uid in list(self._stale):
+            self._materialize(uid)
+
     def _create_employee(self, uid: str, data: dict) -> Employee:
         record = {
             "id": str(uid),
@@ -85,47 +160,48 @@ class EmployeeRepository:
             return None
 
     def list_employees(self, **filters) -> List[Employee]:
-        """Return employees optionally filtered by provided criteria."""
-        employees: List[Employee] = []
+        """Return employees optionally filtered by provided criteria.
+
+        The returned objects are shared; change them through
+        :meth:`update_employee`.
+        """
+        self._refresh()
         archived_filter = filters.get("archived") if "archived" in filters else False
-        for uid, data in self._data.items():
-            if not isinstance(data, dict):
-                continue
-            emp = self._create_employee(uid, data)
-            if archived_filter is not None and emp.archived != archived_filter:
+        candidates: set[str] | None = None
+        if archived_filter is not None:
+            candidates = set(self._index["archived"].get(bool(archived_filter), ()))
+        for name in _INDEXED_FILTERS:
+            wanted = filters.get(name)
+            if not wanted:
                 continue
-            if filters:
-                status = filters.get("status")
-                if status and emp.status.value not in (status if isinstance(status, list) else [status]):
-                    continue
-                position = filters.get("position")
-                if position and emp.position not in (position if isinstance(position, list) else [position]):
-                    continue
-                birthday_today = filters.get("birthday_today")
-                if birthday_today:
-                    if not emp.birthdate or emp.birthdate.timetuple()[1:3] != datetime.utcnow().date().timetuple()[1:3]:
-                        continue
-                tags = filters.get("tags")
-                if tags:
-                    if not set(tags).intersection(set(emp.tags)):
-                        continue
-            employees.append(emp)
-        return employees
+            matched: set[str] = set()
+            for value in _as_list(wanted):
+                matched |= self._index[name].get(value, set())
+            candidates = matched if candidates is None else candidates & matched
+        if filters.get("birthday_today"):
+            today = datetime.utcnow().date()
+            matched = self._index["birthday"].get((today.month, today.day), set())
+            candidates = set(matched) if candidates is None else candidates & matched
+        if candidates is None:
+            # ``_seq`` keeps the file order of the records
+            return [self._objects[uid] for uid in self._seq if uid in self._objects]
+        return [self._objects[uid] for uid in sorted(candidates, key=self._seq.__getitem__)]
 
     def get_employee(self, employee_id: str) -> Employee | None:
-        data = self._data.get(str(employee_id))
-        if not isinstance(data, dict):
-            return None
-        try:
-            return self._create_employee(str(employee_id), data)
-        except Exception as exc:
-            log(f"⚠️ Failed to parse employee {employee_id}: {exc}")
-            return None
+        uid = str(employee_id)
+        if uid in self._stale:
+            try:
+                self._materialize(uid)
+            except Exception as exc:
+                log(f"⚠️ Failed to parse employee {employee_id}: {exc}")
+                return None
+        return self._objects.get(uid)
 
     def add_employee(self, employee: Employee) -> None:
         data = _serialize(employee)
         data.pop("id", None)
         self._data[employee.id] = data
+        self._invalidate(employee.id)
         self._save()
 
     def update_employee(self, employee: Employee) -> None:
@@ -133,15 +209,19 @@ class EmployeeRepository:
             data = _serialize(employee)
             data.pop("id", None)
             self._data[employee.id].update(data)
+            self._invalidate(employee.id)
             self._save()
 
     def delete_employee_by_id(self, employee_id: str) -> None:
         if employee_id in self._data:
             self._data.pop(employee_id)
+            self._invalidate(employee_id)
             self._save()
 
     def save_employees(self, employees: List[Employee]) -> None:
         self._data = {e.id: _serialize(e) | {"id": e.id} for e in employees}
         for v in self._data.values():
             v.pop("id", None)
+        self._reset_cache()
+        self.version += 1
         self._save()
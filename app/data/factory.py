@@ -0,0 +1,73 @@
+"""Repository constructors honouring the ``STORAGE_ENGINE`` setting.
+
+``json`` and ``journal`` use the file repositories, ``sqlite`` uses the
+database at ``DATABASE_URL``.
+"""
+
+from __future__ import annotations
+
+from app.config import STORAGE_ENGINE
+
+
+def _use_sqlite() -> bool:
+    return STORAGE_ENGINE == "sqlite"
+
+
+def get_employee_repository():
+    if _use_sqlite():
+        from .sqlite_repositories import SqliteEmployeeRepository
+
+        return SqliteEmployeeRepository()
+    from .employee_repository import EmployeeRepository
+
+    return EmployeeRepository()
+
+
+def get_payout_repository():
+    if _use_sqlite():
+        from .sqlite_repositories import SqlitePayoutRepository
+
+        return SqlitePayoutRepository()
+    from .payout_repository import PayoutRepository
+
+    return PayoutRepository()
+
+
+def get_vacation_repository():
+    if _use_sqlite():
+        from .sqlite_repositories import SqliteVacationRepository
+
+        return SqliteVacationRepository()
+    from .vacation_repository import VacationRepository
+
+    return VacationRepository()
+
+
+def get_incentive_repository():
+    if _use_sqlite():
+        from .sqlite_repositories import SqliteIncentiveRepository
+
+        return SqliteIncentiveRepository()
+    from .incentive_repository import IncentiveRepository
+
+    return IncentiveRepository()
+
+
+def get_asset_repository():
+    if _use_sqlite():
+        from .sqlite_repositories import SqliteAssetRepository
+
+        return SqliteAssetRepository()
+    from .asset_repository import AssetRepository
+
+    return AssetRepository()
+
+
+def get_message_repository():
+    if _use_sqlite():
+        from .sqlite_repositories import SqliteMessageRepository
+
+        return SqliteMessageRepository()
+    from .message_repository import MessageRepository
+
+    return MessageRepository()
@@ -6,11 +6,14 @@ from app.config import BONUSES_PENALTIES_FILE
 
 DEFAULT_INCENTIVES_FILE = "bonuses_penalties.json"
 from app.utils.logger import log
+from .journal_storage import JournaledRecordsMixin, open_journal
+from .records import IncentiveRecord, as_records, json_default
 
 
-class IncentiveRepository:
+class IncentiveRepository(JournaledRecordsMixin):
     def __init__(self, file_path: Optional[str] = None) -> None:
         self._file = file_path or BONUSES_PENALTIES_FILE or DEFAULT_INCENTIVES_FILE
+        self._journal = open_journal(self._file)
         log(f"📂 Loading incentives from {self._file}")
         self._data: List[Dict[str, Any]] = self._load()
         log(f"✅ Loaded incentives: {len(self._data)}")
@@ -20,6 +23,9 @@ class IncentiveRepository:
         )
 
     def _load(self) -> List[Dict[str, Any]]:
+        return as_records(IncentiveRecord, self._read())
+
+    def _read(self) -> List[Dict[str, Any]]:
         if not self._file or not os.path.exists(self._file):
             example = (
                 self._file.replace('.json', '.example.json') if self._file else 'bonuses_penalties.example.json'
@@ -40,6 +46,8 @@ class IncentiveRepository:
         try:
             with open(self._file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            if self._journal is not None:
+                data = self._journal.replay(data)
         except Exception as e:
             log(f"❌ Failed reading {self._file}: {e}")
             data = []
@@ -60,8 +68,11 @@ class IncentiveRepository:
         return data
 
     def _save(self) -> None:
+        if self._journal is not None:
+            self._journal.compact(self._data)
+            return
         with open(self._file, 'w', encoding='utf-8') as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
+            json.dump(self._data, f, ensure_ascii=False, indent=2, default=json_default)
 
     def _generate_id(self) -> int:
         self._counter += 1
@@ -91,8 +102,9 @@ class IncentiveRepository:
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if 'id' not in data or any(str(it.get('id')) == str(data['id']) for it in self._data):
             data['id'] = self._generate_id()
+        data = IncentiveRecord(data)
         self._data.append(data)
-        self._save()
+        self._save_record(data)
         return data
 
     def update(self, item_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -101,7 +113,7 @@ class IncentiveRepository:
                 if item.get('locked'):
                     return None
                 item.update({k: v for k, v in updates.items() if v is not None})
-                self._save()
+                self._save_record(item)
                 return item
         return None
 
@@ -111,6 +123,6 @@ class IncentiveRepository:
                 if item.get('locked'):
                     return False
                 self._data.remove(item)
-                self._save()
+                self._delete_record(item_id)
                 return True
         return False
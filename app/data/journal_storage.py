@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+try:  # Windows desktop build
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+from app.config import JOURNAL_COMPACT_THRESHOLD, STORAGE_ENGINE
+from app.utils.logger import log
+from .json_storage import JsonStorage
+from .records import json_default
+
+
+def journal_path(path: str | Path) -> Path:
+    """Return the journal file that belongs to the snapshot ``path``."""
+    path = Path(path)
+    return path.with_name(path.name + ".journal")
+
+
+@contextmanager
+def file_lock(path: str | Path) -> Iterator[None]:
+    """Hold an exclusive lock on ``<path>.lock`` across threads and processes.
+
+    The bot and the API open the same files, each through several
+    repositories; the lock keeps their appends out of a running compaction.
+    """
+    lock_path = Path(path)
+    lock_path = lock_path.with_name(lock_path.name + ".lock")
+    with lock_path.open("a+b") as fh:
+        if msvcrt is not None:
+            while True:
+                try:
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10 seconds; keep waiting
+                    continue
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def _record_key(item: Any, index: int) -> str:
+    if isinstance(item, Mapping) and item.get("id") is not None:
+        return str(item["id"])
+    return f"#{index}"
+
+
+def _fingerprint(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _read_entries(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    entries: list[dict[str, Any]] = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # a torn last line after a crash; everything before it is valid
+                log(f"⚠️ Skipping damaged journal line in {path}")
+    return entries
+
+
+def _apply(data: Any, entries: list[dict[str, Any]]) -> Any:
+    if isinstance(data, dict):
+        for entry in entries:
+            if entry.get("op") == "put":
+                data[entry["key"]] = entry.get("value")
+            elif entry.get("op") == "delete":
+                data.pop(entry["key"], None)
+        return data
+    records = {_record_key(item, idx): item for idx, item in enumerate(data or [])}
+    for entry in entries:
+        if entry.get("op") == "put":
+            records[entry["key"]] = entry.get("value")
+        elif entry.get("op") == "delete":
+            records.pop(entry["key"], None)
+    return list(records.values())
+
+
+def apply_journal(path: str | Path, data: Any) -> Any:
+    """Return ``data`` read from ``path`` with its pending journal applied."""
+    entries = _read_entries(journal_path(path))
+    if not entries:
+        return data
+    return _apply(data, entries)
+
+
+class JournalStorage(JsonStorage):
+    """JSON snapshot plus an append-only journal of changes.
+
+    Every change is appended to ``<file>.journal`` as a single JSON line, so a
+    write costs the size of the changed record rather than the whole history.
+    When the journal grows past ``compact_threshold`` entries it is folded
+    back into the snapshot by a background thread. The snapshot keeps the
+    usual JSON layout and stays the import/export format.
+
+    Records of list snapshots are keyed by their ``id``; dict snapshots are
+    keyed by their top-level keys. A ``compact_threshold`` of ``0`` folds the
+    journal on every write, which is how a leftover journal is drained after
+    switching back to the plain JSON engine.
+    """
+
+    def __init__(
+        self, path: str | Path, compact_threshold: int | None = None
+    ) -> None:
+        super().__init__(path)
+        self.journal = journal_path(self.path)
+        self.compact_threshold = (
+            JOURNAL_COMPACT_THRESHOLD if compact_threshold is None else compact_threshold
+        )
+        self._lock = threading.RLock()
+        self._entries = len(_read_entries(self.journal))
+        self._fingerprints: dict[str, str] = {}
+        self._compactor: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # JsonStorage API
+    # ------------------------------------------------------------------
+    def load(self) -> dict[str, Any]:
+        data = self.replay(super().load())
+        if isinstance(data, dict):
+            self._fingerprints = {str(k): _fingerprint(v) for k, v in data.items()}
+        self.maybe_compact(data)
+        return data
+
+    def save(self, data: Any) -> None:
+        """Journal the top-level keys of ``data`` changed since the last save."""
+        if not isinstance(data, dict):
+            self.compact(data)
+            return
+        fingerprints = {str(k): _fingerprint(v) for k, v in data.items()}
+        entries: list[dict[str, Any]] = [
+            {"op": "put", "key": key, "value": data[key]}
+            for key in data
+            if self._fingerprints.get(str(key)) != fingerprints[str(key)]
+        ]
+        entries.extend(
+            {"op": "delete", "key": key}
+            for key in self._fingerprints
+            if key not in fingerprints
+        )
+        self._fingerprints = fingerprints
+        self._append(entries)
+        self.maybe_compact(data)
+
+    # ------------------------------------------------------------------
+    # record level API
+    # ------------------------------------------------------------------
+    def replay(self, data: Any) -> Any:
+        """Apply the journal on top of snapshot ``data``."""
+        with self._lock:
+            entries = _read_entries(self.journal)
+        self._entries = len(entries)
+        if not entries:
+            return data
+        return _apply(data, entries)
+
+    def put(self, key: str, value: Any, snapshot: Any = None) -> None:
+        self._append([{"op": "put", "key": str(key), "value": value}])
+        self.maybe_compact(snapshot)
+
+    def delete(self, key: str, snapshot: Any = None) -> None:
+        self._append([{"op": "delete", "key": str(key)}])
+        self.maybe_compact(snapshot)
+
+    def _append(self, entries: list[dict[str, Any]]) -> None:
+        if not entries:
+            return
+        lines = "".join(
+            json.dumps(entry, ensure_ascii=False, default=json_default) + "\n"
+            for entry in entries
+        )
+        with self._lock, file_lock(self.path):
+            with self.journal.open("a+b") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        # start after a line torn by a crash instead of extending it
+                        lines = "\n" + lines
+                f.write(lines.encode("utf-8"))
+                f.flush()
+            self._entries += len(entries)
+
+    # ------------------------------------------------------------------
+    # compaction
+    # ------------------------------------------------------------------
+    def maybe_compact(self, snapshot: Any) -> None:
+        """Fold the journal into the snapshot once it is long enough.
+
+        The folded snapshot is rebuilt from the files, not from ``snapshot``,
+        so entries appended by other instances and processes are kept.
+        ``snapshot`` only seeds a snapshot file that does not exist yet.
+        """
+        if snapshot is None:
+            return
+        if not self.path.exists():
+            # readers only replay journals of existing snapshots
+            self._fold(snapshot)
+            return
+        if self._entries < max(self.compact_threshold, 1):
+            return
+        if self.compact_threshold <= 0:
+            self._fold()
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(
+            target=self._fold,
+            name=f"compact-{self.path.name}",
+            daemon=True,
+        )
+        self._compactor.start()
+
+    def compact(self, snapshot: Any) -> None:
+        """Write ``snapshot`` to the JSON file and drop the folded journal.
+
+        Unlike :meth:`maybe_compact` this replaces the stored data with
+        ``snapshot``; it backs whole-file saves.
+        """
+        if self._compactor is not None and self._compactor.is_alive():
+            self._compactor.join()
+        with self._lock, file_lock(self.path):
+            offset = self.journal.stat().st_size if self.journal.exists() else 0
+            self._write_snapshot(snapshot, offset)
+
+    def _fold(self, base: Any = None) -> None:
+        """Replay the journal onto the stored snapshot and write the result."""
+        try:
+            with self._lock, file_lock(self.path):
+                if self.path.exists():
+                    with self.path.open("r", encoding="utf-8") as f:
+                        base = json.load(f)
+                offset = self.journal.stat().st_size if self.journal.exists() else 0
+                entries = _read_entries(self.journal)
+                self._write_snapshot(_apply(base, entries), offset)
+        except Exception as exc:
+            log(f"❌ Failed to compact {self.path}: {exc}")
+
+    def _write_snapshot(self, snapshot: Any, offset: int) -> None:
+        """Write ``snapshot`` and keep only the journal past ``offset``.
+
+        Callers hold :func:`file_lock`, so no entry is appended meanwhile.
+        """
+        text = json.dumps(snapshot, ensure_ascii=False, indent=2, default=json_default)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, self.path)
+        tail = b""
+        if self.journal.exists():
+            with self.journal.open("rb") as f:
+                f.seek(offset)
+                tail = f.read()
+        if tail:
+            tmp_journal = self.journal.with_name(self.journal.name + ".tmp")
+            tmp_journal.write_bytes(tail)
+            os.replace(tmp_journal, self.journal)
+        elif self.journal.exists():
+            self.journal.unlink()
+        self._entries = tail.count(b"\n")
+
+
+class JournaledRecordsMixin(ABC):
+    """Record-level writes for list repositories with an optional journal.
+
+    The repository sets ``_journal`` (from :func:`open_journal`) and
+    ``_data`` and implements ``_save``, which writes the whole list. With a
+    journal a change appends only the touched record; without one it falls
+    back to ``_save``.
+    """
+
+    _journal: JournalStorage | None
+    _data: list[Any]
+
+    @abstractmethod
+    def _save(self) -> None:
+        """Write the whole ``_data`` list."""
+
+    def load_all(self) -> list[Any]:
+        """Return every record in file order."""
+        return list(self._data)
+
+    def _record_written(self) -> None:
+        """Called after a record was appended to the journal."""
+
+    def _save_record(self, item: Mapping[str, Any]) -> None:
+        if self._journal is None:
+            self._save()
+            return
+        self._journal.put(str(item.get("id")), item, snapshot=self._data)
+        self._record_written()
+
+    def _delete_record(self, item_id: Any) -> None:
+        if self._journal is None:
+            self._save()
+            return
+        self._journal.delete(str(item_id), snapshot=self._data)
+        self._record_written()
+
+
+def open_journal(path: str | Path) -> JournalStorage | None:
+    """Return the journal for ``path`` or ``None`` for the plain JSON engine.
+
+    A journal left over from the journaled engine is still returned so that
+    its changes are replayed; it is folded into the snapshot on the next write.
+    """
+    if STORAGE_ENGINE == "journal":
+        return JournalStorage(path)
+    if journal_path(path).exists():
+        log(f"⚠️ Found journal for {path}; it will be folded into the snapshot")
+        return JournalStorage(path, compact_threshold=0)
+    return None
+
+
+def create_storage(path: str | Path) -> JsonStorage:
+    """Return the configured storage engine for a dict-shaped JSON file."""
+    if STORAGE_ENGINE == "journal" or journal_path(path).exists():
+        return open_journal(path)
+    return JsonStorage(path)
@@ -1,15 +1,25 @@
 import json
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 
 from app.utils.logger import log
+from .journal_storage import JournaledRecordsMixin, open_journal
+from .timeline_index import TimelineIndex, TimelineKey
 
 
-class MessageRepository:
+def _timeline_groups(item: Dict[str, Any]) -> List[Any]:
+    groups: List[Any] = [("accepted", bool(item.get("accepted")))]
+    if item.get("user_id") is not None:
+        groups.append(("user", str(item["user_id"])))
+    return groups
+
+
+class MessageRepository(JournaledRecordsMixin):
     def __init__(self, path: str | Path = "messages.json") -> None:
         self._file = Path(path)
+        self._journal = open_journal(self._file)
         self._data: List[Dict[str, Any]] = self._load()
         if not self._data:
             log("⚠️ MessageRepository loaded no messages")
@@ -22,11 +32,22 @@ class MessageRepository:
                     "id",
                     "")).isdigit()),
             default=0)
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._timeline = TimelineIndex()
+        for item in self._data:
+            self._index(item)
+
+    def _index(self, item: Dict[str, Any]) -> None:
+        key = str(item.get("id"))
+        self._by_id[key] = item
+        self._timeline.add(key, item.get("timestamp"), _timeline_groups(item))
 
     def _load(self) -> List[Dict[str, Any]]:
         if self._file.exists():
             try:
                 data = json.loads(self._file.read_text(encoding="utf-8"))
+                if self._journal is not None:
+                    data = self._journal.replay(data)
             except Exception:
                 data = []
             if not data:
@@ -56,6 +77,9 @@ class MessageRepository:
         return []
 
     def _save(self) -> None:
+        if self._journal is not None:
+            self._journal.compact(self._data)
+            return
         self._file.write_text(
             json.dumps(
                 self._data,
@@ -68,18 +92,32 @@ class MessageRepository:
         return str(self._counter)
 
     def list(self) -> List[Dict[str, Any]]:
-        return sorted(
-            self._data,
-            key=lambda x: x.get(
-                "timestamp",
-                ""),
-            reverse=True)
+        ids, _ = self._timeline.page(len(self._timeline))
+        return [self._by_id[i] for i in ids]
+
+    def page(
+        self,
+        limit: int = 50,
+        cursor: Optional[TimelineKey] = None,
+        *,
+        user_id: Optional[str] = None,
+        accepted: Optional[bool] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[TimelineKey]]:
+        """Return messages newest first below ``cursor`` and the next cursor."""
+        groups: List[Any] = []
+        if user_id is not None:
+            groups.append(("user", str(user_id)))
+        if accepted is not None:
+            groups.append(("accepted", accepted))
+        ids, next_key = self._timeline.page(limit, cursor, groups)
+        return [self._by_id[i] for i in ids], next_key
 
     def create(self, record: Dict[str, Any]) -> Dict[str, Any]:
         if "id" not in record:
             record["id"] = self._generate_id()
         self._data.append(record)
-        self._save()
+        self._index(record)
+        self._save_record(record)
         return record
 
     def accept(self, msg_id: str) -> Optional[Dict[str, Any]]:
@@ -88,7 +126,8 @@ class MessageRepository:
                 m["status"] = "Принято"
                 m["accepted"] = True
                 m["timestamp_accept"] = datetime.utcnow().isoformat()
-                self._save()
+                self._index(m)
+                self._save_record(m)
                 return m
         return None
 
@@ -100,6 +139,7 @@ class MessageRepository:
                 m["status"] = "Принято"
                 m["accepted"] = True
                 m["timestamp_accept"] = datetime.utcnow().isoformat()
-                self._save()
+                self._index(m)
+                self._save_record(m)
                 return m
         return None
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import calendar
+import math
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .records import field_reader
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+HASH_FIELDS = ("user_id", "payout_type", "status", "method")
+
+
+# every field the indexes look at, read once per record
+_read_indexed = field_reader(*HASH_FIELDS, "timestamp", "amount")
+
+
+def _amount(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _hashable(value: Any) -> Any:
+    try:
+        hash(value)
+    except TypeError:
+        return str(value)
+    return value
+
+
+def parse_epoch(value: Any) -> Optional[int]:
+    """Return epoch seconds of a naive ``%Y-%m-%d %H:%M:%S`` timestamp."""
+    if not value:
+        return None
+    try:
+        dt = datetime.strptime(value, TIMESTAMP_FORMAT)
+    except Exception:
+        return None
+    return calendar.timegm(dt.timetuple())
+
+
+def datetime_epoch(dt: datetime, round_up: bool = False) -> int:
+    """Return epoch seconds of naive ``dt``, rounding sub-seconds as asked."""
+    epoch = calendar.timegm(dt.timetuple())
+    return epoch + 1 if round_up and dt.microsecond else epoch
+
+
+def epoch_to_datetime(epoch: int) -> datetime:
+    """Inverse of :func:`parse_epoch`, returning a naive datetime."""
+    return datetime(1970, 1, 1) + timedelta(seconds=epoch)
+
+
+class PayoutIndex:
+    """Secondary indexes over the in-memory payout list.
+
+    Hash indexes map ``user_id``, ``payout_type``, ``status`` and ``method``
+    to record positions; a sorted list of ``(epoch, -position)`` keys answers
+    date ranges by bisection and yields records newest first. Positions follow
+    insertion order, so records with equal timestamps keep the order of the
+    file. Records whose timestamp does not parse pass every date filter and
+    come last.
+
+    It also keeps running amount totals per ``(user_id, "YYYY-MM")`` split by
+    ``(payout_type, status)`` for the monthly limit checks.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()) -> None:
+        self.rebuild(records)
+
+    def rebuild(self, records: Iterable[Dict[str, Any]]) -> None:
+        self._records: Dict[int, Dict[str, Any]] = {}
+        self._positions: Dict[int, int] = {}
+        self._keys: Dict[int, Optional[Tuple[int, int]]] = {}
+        self._hash: Dict[str, Dict[Any, Set[int]]] = {f: {} for f in HASH_FIELDS}
+        self._sorted: List[Tuple[int, int]] = []
+        self._undated: Set[int] = set()
+        self._monthly: Dict[Tuple[str, str], Dict[Tuple[Any, Any], List[float]]] = {}
+        self._next = 0
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @staticmethod
+    def _hash_keys(values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """Return the index keys of the :data:`HASH_FIELDS` in ``values``."""
+        user_id, payout_type, status, method = values[:4]
+        return str(user_id), _hashable(payout_type), _hashable(status), _hashable(method)
+
+    def add(self, record: Dict[str, Any], position: Optional[int] = None) -> None:
+        if position is None:
+            position = self._next
+            self._next += 1
+        self._records[position] = record
+        self._positions[id(record)] = position
+        values = _read_indexed(record)
+        keys = self._hash_keys(values)
+        for field, value in zip(HASH_FIELDS, keys):
+            self._hash[field].setdefault(value, set()).add(position)
+        epoch = parse_epoch(values[4])
+        if epoch is None:
+            self._keys[position] = None
+            self._undated.add(position)
+        else:
+            key = (epoch, -position)
+            self._keys[position] = key
+            insort(self._sorted, key)
+            self._add_to_month(keys, values[5], epoch, 1)
+
+    def remove(self, record: Dict[str, Any]) -> Optional[int]:
+        """Drop ``record`` from the indexes and return its position."""
+        position = self._positions.pop(id(record), None)
+        if position is None:
+            return None
+        del self._records[position]
+        values = _read_indexed(record)
+        keys = self._hash_keys(values)
+        for field, value in zip(HASH_FIELDS, keys):
+            bucket = self._hash[field].get(value)
+            if bucket is not None:
+                bucket.discard(position)
+                if not bucket:
+                    del self._hash[field][value]
+        key = self._keys.pop(position)
+        if key is None:
+            self._undated.discard(position)
+        else:
+            idx = bisect_left(self._sorted, key)
+            if idx < len(self._sorted) and self._sorted[idx] == key:
+                del self._sorted[idx]
+            self._add_to_month(keys, values[5], key[0], -1)
+        return position
+
+    def _add_to_month(
+        self, keys: Tuple[Any, ...], amount: Any, epoch: int, sign: int
+    ) -> None:
+        month = (keys[0], epoch_to_datetime(epoch).strftime("%Y-%m"))
+        bucket = (keys[1], keys[2])
+        totals = self._monthly.setdefault(month, {})
+        entry = totals.setdefault(bucket, [0.0, 0])
+        entry[0] += sign * _amount(amount)
+        entry[1] += sign
+        if entry[1] <= 0:
+            del totals[bucket]
+            if not totals:
+                del self._monthly[month]
+
+    def monthly_total(
+        self,
+        user_id: Any,
+        month: str,
+        payout_types: Optional[Iterable[Any]] = None,
+        statuses: Optional[Iterable[Any]] = None,
+    ) -> float:
+        """Return the amount requested by ``user_id`` in ``month`` (``YYYY-MM``).
+
+        ``payout_types`` and ``statuses`` restrict the buckets that are summed;
+        ``None`` sums all of them.
+        """
+        totals = self._monthly.get((str(user_id), month))
+        if not totals:
+            return 0.0
+        types = set(payout_types) if payout_types is not None else None
+        wanted = set(statuses) if statuses is not None else None
+        return sum(
+            total
+            for (payout_type, status), (total, _count) in totals.items()
+            if (types is None or payout_type in types)
+            and (wanted is None or status in wanted)
+        )
+
+    def timestamp_epoch(self, record: Dict[str, Any]) -> Optional[int]:
+        position = self._positions.get(id(record))
+        if position is None:
+            return parse_epoch(record.get("timestamp"))
+        key = self._keys.get(position)
+        return key[0] if key else None
+
+    def query(
+        self,
+        user_id: Optional[str] = None,
+        payout_type: Optional[str] = None,
+        status: Optional[str] = None,
+        method: Optional[str] = None,
+        from_epoch: Optional[int] = None,
+        to_epoch: Optional[int] = None,
+        user_ids: Optional[Iterable[Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return matching records, newest first.
+
+        ``user_ids`` keeps only the records of those users.
+        """
+        filters = {
+            "user_id": str(user_id) if user_id else None,
+            "payout_type": payout_type,
+            "status": status,
+            "method": method,
+        }
+        buckets = [
+            self._hash[field].get(_hashable(value), set())
+            for field, value in filters.items()
+            if value
+        ]
+        if user_ids is not None:
+            by_user = self._hash["user_id"]
+            buckets.append(set().union(*(by_user.get(str(u), ()) for u in user_ids)))
+        lo = 0
+        hi = len(self._sorted)
+        if from_epoch is not None:
+            lo = bisect_left(self._sorted, (from_epoch, -math.inf))
+        if to_epoch is not None:
+            hi = bisect_right(self._sorted, (to_epoch, math.inf))
+
+        if not buckets:
+            positions = [-neg for _, neg in reversed(self._sorted[lo:hi])]
+            positions.extend(sorted(self._undated))
+            return [self._records[p] for p in positions]
+
+        buckets.sort(key=len)
+        matched = set(buckets[0]).intersection(*buckets[1:])
+        dated: List[Tuple[int, int]] = []
+        undated: List[int] = []
+        lo_key = self._sorted[lo] if lo < len(self._sorted) else None
+        hi_key = self._sorted[hi - 1] if hi > 0 else None
+        for position in matched:
+            key = self._keys[position]
+            if key is None:
+                undated.append(position)
+            elif lo_key is not None and hi_key is not None and lo_key <= key <= hi_key:
+                dated.append(key)
+        dated.sort(reverse=True)
+        undated.sort()
+        return [self._records[-neg] for _, neg in dated] + [self._records[p] for p in undated]
@@ -1,11 +1,15 @@
 import json
 import os
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional
 import logging
 
 from app.config import ADVANCE_REQUESTS_FILE
 from app.utils.logger import log
+from .change_detector import FileChangeDetector
+from .journal_storage import apply_journal, journal_path, JournaledRecordsMixin, open_journal
+from .payout_index import PayoutIndex, datetime_epoch
+from .records import PayoutRecord, as_records, json_default
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +40,7 @@ def load_advance_requests(file_path: Optional[str] = None) -> List[Dict[str, Any
     except Exception as exc:
         log(f"❌ Failed reading {path}: {exc}")
         return []
+    data = apply_journal(path, data)
 
     for item in data:
         if "id" in item:
@@ -48,9 +53,11 @@ def load_advance_requests(file_path: Optional[str] = None) -> List[Dict[str, Any
     return data
 
 
-class PayoutRepository:
+class PayoutRepository(JournaledRecordsMixin):
     def __init__(self, file_path: Optional[str] = None) -> None:
         self._file = file_path or ADVANCE_REQUESTS_FILE or DEFAULT_ADVANCE_REQUESTS_FILE
+        self._journal = open_journal(self._file)
+        self._changes = FileChangeDetector([self._file, journal_path(self._file)])
         log(f"📂 Loading payouts from {self._file}")
         self._data: List[Dict[str, Any]] = self._load()
         log(f"✅ Loaded payouts: {len(self._data)}")
@@ -68,9 +75,14 @@ class PayoutRepository:
                 self._counter = max(self._counter, int(raw_id))
         if changed:
             self._save()
+        self._index = PayoutIndex(self._data)
+        self._changes.mark_seen()
 
-    def reload(self) -> None:
-        """Reload payouts from disk, replacing in-memory data."""
+    def reload(self, force: bool = False) -> None:
+        """Reload payouts from disk when the file changed since the last read."""
+        if not force and not self._changes.changed():
+            return
+        log(f"🔄 Reloading payouts from {self._file} ({self._changes.stats()})")
         self._data = self._load()
         self._counter = 0
         changed = False
@@ -84,8 +96,17 @@ class PayoutRepository:
                 self._counter = max(self._counter, int(raw_id))
         if changed:
             self._save()
+        self._index.rebuild(self._data)
+        self._changes.mark_seen()
+
+    def reload_stats(self) -> Dict[str, int]:
+        """Return how many reloads were skipped (hits) or performed (misses)."""
+        return self._changes.stats()
 
     def _load(self) -> List[Dict[str, Any]]:
+        return as_records(PayoutRecord, self._read())
+
+    def _read(self) -> List[Dict[str, Any]]:
         if not self._file or not os.path.exists(self._file):
             example = (
                 self._file.replace(".json", ".example.json")
@@ -108,6 +129,8 @@ class PayoutRepository:
         try:
             with open(self._file, "r", encoding="utf-8") as f:
                 data = json.load(f)
+            if self._journal is not None:
+                data = self._journal.replay(data)
             for payout in data:
                 payout["id"] = int(payout["id"])
             logger.debug(f"[DEBUG] Загруженные ID: {[p['id'] for p in data]}")
@@ -145,20 +168,46 @@ class PayoutRepository:
                 changed = True
         if changed:
             try:
-                with open(self._file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=2)
+                self._write(data)
             except Exception as exc:
                 log(f"❌ Failed to save normalized payouts: {exc}")
         return data
 
+    def _write(self, data: List[Dict[str, Any]]) -> None:
+        if self._journal is not None:
+            self._journal.compact(data)
+        else:
+            with open(self._file, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
+        self._changes.mark_seen()
+
     def _save(self) -> None:
-        with open(self._file, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        self._write(self._data)
+
+    def _record_written(self) -> None:
+        self._changes.mark_seen()
 
     def _generate_id(self) -> str:
         self._counter += 1
         return str(self._counter)
 
+    def timestamp_epoch(self, record: Dict[str, Any]) -> Optional[int]:
+        """Return the cached epoch of ``record['timestamp']`` or ``None``.
+
+        Timestamps are parsed once when a record is loaded or written.
+        """
+        return self._index.timestamp_epoch(record)
+
+    def monthly_total(
+        self,
+        user_id: Any,
+        month: str,
+        payout_types: Optional[List[Any]] = None,
+        statuses: Optional[List[Any]] = None,
+    ) -> float:
+        """Return the running total of ``user_id`` payouts in ``month`` (``YYYY-MM``)."""
+        return self._index.monthly_total(user_id, month, payout_types, statuses)
+
     def load_all(self) -> List[Dict[str, Any]]:
         """Return raw payout list without filtering."""
         return list(self._data)
@@ -171,39 +220,30 @@ class PayoutRepository:
         method: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
+        user_ids: Optional[Iterable[str]] = None,
     ) -> List[Dict[str, Any]]:
-        result = []
-        from_dt = datetime.fromisoformat(from_date) if from_date else None
-        to_dt = datetime.fromisoformat(to_date) if to_date else None
-        for item in self._data:
-            if employee_id and str(item.get("user_id")) != str(employee_id):
-                continue
-            if payout_type and item.get("payout_type") != payout_type:
-                continue
-            if status and item.get("status") != status:
-                continue
-            if method and item.get("method") != method:
-                continue
-            ts_str = item.get("timestamp")
-            created = None
-            if ts_str:
-                try:
-                    created = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    pass
-            if from_dt and created and created < from_dt:
-                continue
-            if to_dt and created and created > to_dt:
-                continue
-            result.append(item)
-        result.sort(key=lambda i: i.get("timestamp", ""), reverse=True)
-        return result
+        """Return payouts matching the filters, newest first.
+
+        Payouts with a missing or unparsable timestamp pass the date filters
+        and are listed last. ``user_ids`` restricts the result to those users.
+        """
+        from_epoch = (
+            datetime_epoch(datetime.fromisoformat(from_date), round_up=True)
+            if from_date
+            else None
+        )
+        to_epoch = datetime_epoch(datetime.fromisoformat(to_date)) if to_date else None
+        return self._index.query(
+            employee_id, payout_type, status, method, from_epoch, to_epoch, user_ids
+        )
 
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if "id" not in data or any(p.get("id") == data["id"] for p in self._data):
             data["id"] = self._generate_id()
+        data = PayoutRecord(data)
         self._data.append(data)
-        self._save()
+        self._index.add(data)
+        self._save_record(data)
         return data
 
     def update(
@@ -211,19 +251,30 @@ class PayoutRepository:
     ) -> Optional[Dict[str, Any]]:
         for item in self._data:
             if str(item.get("id")) == str(payout_id):
+                position = self._index.remove(item)
                 item.update({k: v for k, v in updates.items() if v is not None})
-                self._save()
+                self._index.add(item, position)
+                self._save_record(item)
                 return item
         return None
 
     def delete_many(self, ids: List[str]) -> None:
+        removed = [p for p in self._data if str(p.get("id")) in ids]
         self._data = [p for p in self._data if str(p.get("id")) not in ids]
-        self._save()
+        for item in removed:
+            self._index.remove(item)
+        if self._journal is None:
+            self._save()
+            return
+        for item in removed:
+            self._delete_record(item.get("id"))
 
     def delete(self, payout_id: str) -> bool:
-        before = len(self._data)
+        removed = [p for p in self._data if str(p.get("id")) == str(payout_id)]
+        if not removed:
+            return False
         self._data = [p for p in self._data if str(p.get("id")) != str(payout_id)]
-        if len(self._data) != before:
-            self._save()
-            return True
-        return False
+        for item in removed:
+            self._index.remove(item)
+        self._delete_record(payout_id)
+        return True
@@ -0,0 +1,329 @@
+"""Append-only log of messages sent through the bot.
+
+Every change is one JSON line in ``logs/sent_messages.jsonl``:
+
+* ``{"op": "put", "key": id, "value": entry}`` adds or replaces an entry;
+* ``{"op": "update", "key": id, "value": fields}`` changes some fields;
+* ``{"op": "delete", "key": id}`` is a tombstone.
+
+Sending a message therefore costs one appended line instead of rewriting the
+whole history. The ``(user_id, message_id)`` index used for ack updates is
+built once and then only fed the lines other processes appended since. The
+same pass keeps a :class:`TimelineIndex` that serves filtered,
+cursor-paginated pages of the history. The old ``sent_messages.json`` list is imported when
+the JSONL file does not exist yet.
+
+Entries are written complete, so reads do no lookups. Records from before
+that are filled in once with::
+
+    python -m app.data.sent_message_log
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.utils.logger import log
+from .records import json_default
+from .timeline_index import TimelineIndex, TimelineKey
+
+_instances: Dict[Path, "SentMessageLog"] = {}
+_instances_lock = threading.Lock()
+
+
+def _decode(line: bytes, path: Path) -> Optional[Dict[str, Any]]:
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        # a torn last line after a crash; everything before it is valid
+        log(f"⚠️ Skipping damaged line in {path}")
+        return None
+
+
+def _message_key(entry: Dict[str, Any]) -> Optional[Tuple[str, int]]:
+    if entry.get("user_id") is None or entry.get("message_id") is None:
+        return None
+    try:
+        return str(entry["user_id"]), int(entry["message_id"])
+    except (TypeError, ValueError):
+        return None
+
+
+def _timeline_groups(key: str, entry: Dict[str, Any]) -> List[Any]:
+    groups: List[Any] = [
+        ("broadcast", bool(entry.get("broadcast"))),
+        ("accepted", bool(entry.get("accepted"))),
+    ]
+    users = {entry.get("user_id")}
+    users.update(
+        r.get("user_id") for r in entry.get("recipients") or [] if isinstance(r, dict)
+    )
+    groups.extend(("user", str(user)) for user in users if user is not None)
+    batch = entry.get("batch_id") or (key if entry.get("broadcast") else None)
+    if batch:
+        groups.append(("batch", str(batch)))
+    return groups
+
+
+def enrich_entry(
+    entry: Dict[str, Any], resolve_name: Callable[[str], Optional[str]]
+) -> Dict[str, Any]:
+    """Return the fields missing from an old ``entry``: names and flags."""
+    fields: Dict[str, Any] = {}
+    if entry.get("user_id") and not entry.get("user_name"):
+        name = resolve_name(str(entry["user_id"]))
+        if name:
+            fields["user_name"] = name
+    if "broadcast" not in entry:
+        fields["broadcast"] = False
+    status = entry.get("status")
+    if isinstance(status, str) and "принят" in status.lower() and not entry.get("accepted"):
+        fields["accepted"] = True
+    recipients = entry.get("recipients") or []
+    named = []
+    for recipient in recipients:
+        if (
+            isinstance(recipient, dict)
+            and recipient.get("user_id")
+            and not recipient.get("name")
+        ):
+            name = resolve_name(str(recipient["user_id"]))
+            if name:
+                recipient = {**recipient, "name": name}
+        named.append(recipient)
+    if named != recipients:
+        fields["recipients"] = named
+    return fields
+
+
+def employee_name_lookup(repo: Any) -> Callable[[str], Optional[str]]:
+    """Return a memoized ``user_id -> name`` lookup backed by ``repo``."""
+
+    @lru_cache(maxsize=None)
+    def resolve(user_id: str) -> Optional[str]:
+        try:
+            employee = repo.get_employee(user_id)
+        except Exception as exc:
+            log(f"⚠️ Failed to resolve employee {user_id}: {exc}")
+            return None
+        if not employee:
+            return None
+        return getattr(employee, "full_name", None) or getattr(employee, "name", None)
+
+    return resolve
+
+
+class SentMessageLog:
+    """Sent messages stored as a JSON-Lines change log."""
+
+    def __init__(
+        self, path: str | Path, legacy_path: str | Path | None = None
+    ) -> None:
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        # state for the indexes below, built on first use
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._by_message: Dict[Tuple[str, int], str] = {}
+        self._timeline = TimelineIndex()
+        self._offset = 0
+        self._inode: Optional[int] = None
+        if not self.path.exists():
+            self._import_legacy(Path(legacy_path) if legacy_path else None)
+
+    def _import_legacy(self, legacy: Optional[Path]) -> None:
+        entries: List[Dict[str, Any]] = []
+        if legacy is not None and legacy.exists():
+            try:
+                data = json.loads(legacy.read_text(encoding="utf-8"))
+                entries = [e for e in data if isinstance(e, dict)]
+            except (OSError, ValueError) as exc:
+                log(f"⚠️ Ignoring unreadable message log {legacy}: {exc}")
+        # keep the file in chronological order, as appends would
+        entries.sort(key=lambda e: e.get("timestamp") or "")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            for entry in entries:
+                fh.write(self._line({"op": "put", "key": str(entry.get("id")), "value": entry}))
+        os.replace(tmp, self.path)
+        if entries:
+            log(f"📦 Imported {len(entries)} sent messages from {legacy}")
+
+    # ------------------------------------------------------------------
+    # writes
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _line(record: Dict[str, Any]) -> str:
+        return json.dumps(record, ensure_ascii=False, default=json_default) + "\n"
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            # O_APPEND keeps lines from the bot and API processes intact
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(self._line(record))
+            if self._entries is not None:
+                self._catch_up()
+
+    def put(self, entry: Dict[str, Any]) -> None:
+        """Add ``entry``, replacing an existing one with the same ``id``."""
+        self._append({"op": "put", "key": str(entry["id"]), "value": entry})
+
+    def update(self, entry_id: str, fields: Dict[str, Any]) -> None:
+        self._append({"op": "update", "key": str(entry_id), "value": fields})
+
+    def delete(self, entry_id: str) -> None:
+        self._append({"op": "delete", "key": str(entry_id)})
+
+    def update_by_message(
+        self, user_id: str | int, message_id: int, fields: Dict[str, Any]
+    ) -> bool:
+        """Update the entry of Telegram message ``message_id`` sent to ``user_id``."""
+        with self._lock:
+            self._catch_up()
+            entry_id = self._by_message.get((str(user_id), int(message_id)))
+            if entry_id is None:
+                return False
+            self.update(entry_id, fields)
+            return True
+
+    # ------------------------------------------------------------------
+    # reads
+    # ------------------------------------------------------------------
+    def _catch_up(self) -> None:
+        """Apply the lines appended since the last call to the index."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+        if (
+            self._entries is None
+            or stat.st_ino != self._inode
+            or stat.st_size < self._offset
+        ):
+            self._entries, self._by_message = {}, {}
+            self._timeline = TimelineIndex()
+            self._offset, self._inode = 0, stat.st_ino
+        if stat.st_size == self._offset:
+            return
+        with self.path.open("rb") as fh:
+            fh.seek(self._offset)
+            chunk = fh.read(stat.st_size - self._offset)
+        # leave a partially written last line for the next call
+        end = chunk.rfind(b"\n") + 1
+        self._offset += end
+        for line in chunk[:end].splitlines():
+            record = _decode(line, self.path)
+            if record is not None:
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        key = str(record.get("key"))
+        op = record.get("op")
+        old = self._entries.get(key)
+        if op == "put":
+            entry = dict(record.get("value") or {})
+        elif op == "update" and old is not None:
+            entry = {**old, **(record.get("value") or {})}
+        elif op == "delete":
+            entry = None
+        else:
+            return
+        if old is not None:
+            message = _message_key(old)
+            if message is not None and self._by_message.get(message) == key:
+                del self._by_message[message]
+        if entry is None:
+            self._entries.pop(key, None)
+            self._timeline.discard(key)
+            return
+        self._entries[key] = entry
+        self._timeline.add(key, entry.get("timestamp"), _timeline_groups(key, entry))
+        message = _message_key(entry)
+        if message is not None:
+            self._by_message[message] = key
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        """Return every live entry in the order they were added."""
+        with self._lock:
+            self._catch_up()
+            return [dict(entry) for entry in (self._entries or {}).values()]
+
+    def page(
+        self,
+        limit: int = 50,
+        cursor: Optional[TimelineKey] = None,
+        *,
+        user_id: str | int | None = None,
+        batch_id: Optional[str] = None,
+        broadcast: Optional[bool] = None,
+        accepted: Optional[bool] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[TimelineKey]]:
+        """Return entries newest first by ``(timestamp, id)`` below ``cursor``.
+
+        ``user_id`` also matches broadcasts the user received. The second
+        value is the cursor of the next page or ``None`` on the last one.
+        """
+        groups: List[Any] = []
+        if user_id is not None:
+            groups.append(("user", str(user_id)))
+        if batch_id is not None:
+            groups.append(("batch", str(batch_id)))
+        if broadcast is not None:
+            groups.append(("broadcast", broadcast))
+        if accepted is not None:
+            groups.append(("accepted", accepted))
+        with self._lock:
+            self._catch_up()
+            ids, next_key = self._timeline.page(limit, cursor, groups)
+            return [dict(self._entries[i]) for i in ids], next_key
+
+    def backfill(self, resolve_name: Callable[[str], Optional[str]]) -> int:
+        """Append the fields :func:`enrich_entry` finds missing; return the count."""
+        updated = 0
+        for entry in self.load_all():
+            fields = enrich_entry(entry, resolve_name)
+            if fields:
+                self.update(entry["id"], fields)
+                updated += 1
+        return updated
+
+
+def get_sent_message_log(
+    path: str | Path = "logs/sent_messages.jsonl",
+    legacy_path: str | Path | None = "logs/sent_messages.json",
+) -> SentMessageLog:
+    """Return the shared log for ``path`` so its index is built only once."""
+    resolved = Path(path).resolve()
+    with _instances_lock:
+        instance = _instances.get(resolved)
+        if instance is None or not resolved.exists():
+            instance = _instances[resolved] = SentMessageLog(resolved, legacy_path)
+        return instance
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Fill in names and flags missing from old sent-message records"
+    )
+    parser.add_argument("--path", default="logs/sent_messages.jsonl")
+    parser.add_argument("--legacy-path", default="logs/sent_messages.json")
+    args = parser.parse_args(argv)
+
+    from .factory import get_employee_repository
+
+    resolve = employee_name_lookup(get_employee_repository())
+    updated = get_sent_message_log(args.path, args.legacy_path).backfill(resolve)
+    log(f"✅ Enriched {updated} sent-message records")
+
+
+if __name__ == "__main__":
+    main()
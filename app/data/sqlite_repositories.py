@@ -0,0 +1,536 @@
+"""SQLite implementations of the JSON repositories.
+
+The classes mirror the public API of their JSON counterparts so services can
+use either one. Every record keeps its full JSON payload in a ``data`` column;
+the fields used for filtering and sorting are copied into indexed columns.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, cast, delete, func, literal_column, or_, select
+
+from app.core.types import Employee, EmployeeStatus
+from app.db.session import get_sessionmaker
+from app.models.employee import Employee as EmployeeRow
+from app.models.records import AssetRow, IncentiveRow, MessageRow, PayoutRow, VacationRow
+from app.utils.logger import log
+from .payout_index import parse_epoch
+from .timeline_index import TimelineKey
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+class _SqliteRecordRepository(ABC):
+    model: Any = None
+    id_type: type = int
+
+    def __init__(self, database_url: Optional[str] = None) -> None:
+        self._sessions = get_sessionmaker(database_url)
+
+    @abstractmethod
+    def _columns(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the indexed column values of ``item``."""
+
+    def _make_row(self, item: Dict[str, Any]) -> Any:
+        return self.model(id=str(item["id"]), data=dict(item), **self._columns(item))
+
+    def _to_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(data)
+
+    def _ordered(self, stmt):
+        return stmt.order_by(literal_column(f"{self.model.__tablename__}.rowid"))
+
+    def _fetch(self, stmt) -> List[Dict[str, Any]]:
+        with self._sessions() as session:
+            return [self._to_record(data) for data in session.scalars(stmt)]
+
+    def _next_id(self, session) -> Any:
+        current = session.scalar(select(func.max(cast(self.model.id, Integer))))
+        return self.id_type((current or 0) + 1)
+
+    def _insert(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self._sessions.begin() as session:
+            if "id" not in data or session.get(self.model, str(data["id"])) is not None:
+                data["id"] = self._next_id(session)
+            session.add(self._make_row(data))
+        return data
+
+    def _update(
+        self, item_id: Any, updates: Dict[str, Any], allow=None
+    ) -> Optional[Dict[str, Any]]:
+        with self._sessions.begin() as session:
+            row = session.get(self.model, str(item_id))
+            if row is None:
+                return None
+            item = dict(row.data)
+            if allow is not None and not allow(item):
+                return None
+            item.update({k: v for k, v in updates.items() if v is not None})
+            row.data = item
+            for column, value in self._columns(item).items():
+                setattr(row, column, value)
+        return self._to_record(item)
+
+    def _delete(self, item_id: Any) -> bool:
+        with self._sessions.begin() as session:
+            result = session.execute(delete(self.model).where(self.model.id == str(item_id)))
+        return bool(result.rowcount)
+
+    def load_all(self) -> List[Dict[str, Any]]:
+        return self._fetch(self._ordered(select(self.model.data)))
+
+    def import_records(self, records: List[Dict[str, Any]]) -> int:
+        """Insert or replace ``records`` keeping their ids."""
+        with self._sessions.begin() as session:
+            for item in records:
+                if item.get("id") is None:
+                    continue
+                session.merge(self._make_row(item))
+        return len(records)
+
+
+class SqlitePayoutRepository(_SqliteRecordRepository):
+    model = PayoutRow
+    id_type = str
+
+    def __init__(self, database_url: Optional[str] = None) -> None:
+        super().__init__(database_url)
+        self._file = database_url or "database"
+
+    def _columns(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        ts = item.get("timestamp")
+        created = None
+        if ts:
+            try:
+                created = datetime.strptime(ts, TIMESTAMP_FORMAT).strftime(TIMESTAMP_FORMAT)
+            except Exception:
+                pass
+        return {
+            "user_id": _text(item.get("user_id")),
+            "status": item.get("status"),
+            "payout_type": item.get("payout_type"),
+            "method": item.get("method"),
+            "timestamp": _text(ts),
+            "created_at": created,
+        }
+
+    def _to_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        item = dict(data)
+        if str(item.get("id", "")).isdigit():
+            item["id"] = int(item["id"])
+        return item
+
+    def reload(self, force: bool = False) -> None:
+        """Nothing to reload: every call reads the database."""
+
+    def timestamp_epoch(self, record: Dict[str, Any]) -> Optional[int]:
+        return parse_epoch(record.get("timestamp"))
+
+    def reload_stats(self) -> Dict[str, int]:
+        return {"hits": 0, "misses": 0}
+
+    def monthly_total(
+        self,
+        user_id: Any,
+        month: str,
+        payout_types: Optional[List[Any]] = None,
+        statuses: Optional[List[Any]] = None,
+    ) -> float:
+        year, mon = (int(part) for part in month.split("-"))
+        end = f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+        stmt = select(PayoutRow.data).where(
+            PayoutRow.user_id == str(user_id),
+            PayoutRow.created_at >= f"{month}-01 00:00:00",
+            PayoutRow.created_at < f"{end}-01 00:00:00",
+        )
+        if payout_types is not None:
+            types = [t for t in payout_types if t is not None]
+            condition = PayoutRow.payout_type.in_(types)
+            if len(types) != len(list(payout_types)):
+                condition = or_(condition, PayoutRow.payout_type.is_(None))
+            stmt = stmt.where(condition)
+        if statuses is not None:
+            stmt = stmt.where(PayoutRow.status.in_(list(statuses)))
+        total = 0.0
+        with self._sessions() as session:
+            for data in session.scalars(stmt):
+                try:
+                    total += float(data.get("amount") or 0)
+                except (TypeError, ValueError):
+                    pass
+        return total
+
+    def list(
+        self,
+        employee_id: Optional[str] = None,
+        payout_type: Optional[str] = None,
+        status: Optional[str] = None,
+        method: Optional[str] = None,
+        from_date: Optional[str] = None,
+        to_date: Optional[str] = None,
+        user_ids: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        stmt = select(PayoutRow.data)
+        if employee_id:
+            stmt = stmt.where(PayoutRow.user_id == str(employee_id))
+        if user_ids is not None:
+            stmt = stmt.where(PayoutRow.user_id.in_([str(u) for u in user_ids]))
+        if payout_type:
+            stmt = stmt.where(PayoutRow.payout_type == payout_type)
+        if status:
+            stmt = stmt.where(PayoutRow.status == status)
+        if method:
+            stmt = stmt.where(PayoutRow.method == method)
+        # records with unparsable timestamps pass date filters like in JSON mode
+        if from_date:
+            lo = datetime.fromisoformat(from_date).strftime(TIMESTAMP_FORMAT)
+            stmt = stmt.where(or_(PayoutRow.created_at.is_(None), PayoutRow.created_at >= lo))
+        if to_date:
+            hi = datetime.fromisoformat(to_date).strftime(TIMESTAMP_FORMAT)
+            stmt = stmt.where(or_(PayoutRow.created_at.is_(None), PayoutRow.created_at <= hi))
+        stmt = stmt.order_by(PayoutRow.timestamp.desc(), literal_column("payouts.rowid"))
+        return self._fetch(stmt)
+
+    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._insert(data)
+
+    def update(self, payout_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._update(payout_id, updates)
+
+    def delete_many(self, ids: List[str]) -> None:
+        with self._sessions.begin() as session:
+            session.execute(delete(PayoutRow).where(PayoutRow.id.in_([str(i) for i in ids])))
+
+    def delete(self, payout_id: str) -> bool:
+        return self._delete(payout_id)
+
+
+class SqliteVacationRepository(_SqliteRecordRepository):
+    model = VacationRow
+
+    def _columns(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "employee_id": _text(item.get("employee_id")),
+            "type": item.get("type"),
+            "start_date": _text(item.get("start_date")),
+            "end_date": _text(item.get("end_date")),
+        }
+
+    def list(
+        self,
+        employee_id: Optional[str] = None,
+        vac_type: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        stmt = select(VacationRow.data)
+        if employee_id:
+            stmt = stmt.where(VacationRow.employee_id == str(employee_id))
+        if vac_type:
+            stmt = stmt.where(VacationRow.type == vac_type)
+        if date_from:
+            stmt = stmt.where(VacationRow.start_date >= date_from)
+        if date_to:
+            stmt = stmt.where(VacationRow.end_date <= date_to)
+        return self._fetch(stmt.order_by(VacationRow.start_date))
+
+    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._insert(data)
+
+    def update(self, vac_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._update(vac_id, updates)
+
+    def delete(self, vac_id: str) -> None:
+        self._delete(vac_id)
+
+    def list_active(self) -> List[Dict[str, Any]]:
+        today = date.today().isoformat()
+        stmt = (
+            select(VacationRow.data)
+            .where(VacationRow.start_date <= today, VacationRow.end_date >= today)
+            .order_by(VacationRow.start_date)
+        )
+        return self._fetch(stmt)
+
+    def list_tomorrow(self) -> List[Dict[str, Any]]:
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        stmt = select(VacationRow.data).where(VacationRow.start_date == tomorrow)
+        return self._fetch(stmt)
+
+
+class SqliteIncentiveRepository(_SqliteRecordRepository):
+    model = IncentiveRow
+
+    def _columns(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "employee_id": _text(item.get("employee_id")),
+            "type": item.get("type"),
+            "date": _text(item.get("date")),
+            "locked": bool(item.get("locked")),
+        }
+
+    def list(
+        self,
+        employee_id: Optional[str] = None,
+        typ: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        stmt = select(IncentiveRow.data)
+        if employee_id:
+            stmt = stmt.where(IncentiveRow.employee_id == str(employee_id))
+        if typ:
+            stmt = stmt.where(IncentiveRow.type == typ)
+        if date_from:
+            stmt = stmt.where(IncentiveRow.date >= date_from)
+        if date_to:
+            stmt = stmt.where(IncentiveRow.date <= date_to)
+        return self._fetch(stmt.order_by(IncentiveRow.date.desc()))
+
+    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._insert(data)
+
+    def update(self, item_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._update(item_id, updates, allow=lambda item: not item.get("locked"))
+
+    def delete(self, item_id: str) -> bool:
+        with self._sessions.begin() as session:
+            result = session.execute(
+                delete(IncentiveRow).where(
+                    IncentiveRow.id == str(item_id), IncentiveRow.locked.is_(False)
+                )
+            )
+        return bool(result.rowcount)
+
+
+class SqliteAssetRepository(_SqliteRecordRepository):
+    model = AssetRow
+
+    def _columns(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "employee_id": _text(item.get("employee_id")),
+            "issue_date": _text(item.get("issue_date")),
+        }
+
+    def list(self, employee_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        stmt = select(AssetRow.data)
+        if employee_id:
+            stmt = stmt.where(AssetRow.employee_id == str(employee_id))
+        return self._fetch(stmt.order_by(AssetRow.issue_date))
+
+    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._insert(data)
+
+    def update(self, item_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._update(item_id, updates)
+
+    def delete(self, item_id: str) -> None:
+        self._delete(item_id)
+
+
+class SqliteMessageRepository(_SqliteRecordRepository):
+    model = MessageRow
+    id_type = str
+
+    def _columns(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        message_id = item.get("message_id")
+        return {
+            "user_id": _text(item.get("user_id")),
+            "message_id": message_id if isinstance(message_id, int) else None,
+            "timestamp": _text(item.get("timestamp")),
+        }
+
+    def list(self) -> List[Dict[str, Any]]:
+        stmt = select(MessageRow.data).order_by(
+            MessageRow.timestamp.desc(), literal_column("messages.rowid")
+        )
+        return self._fetch(stmt)
+
+    def page(
+        self,
+        limit: int = 50,
+        cursor: Optional[TimelineKey] = None,
+        *,
+        user_id: Optional[str] = None,
+        accepted: Optional[bool] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[TimelineKey]]:
+        timestamp = func.coalesce(MessageRow.timestamp, "")
+        stmt = select(timestamp, MessageRow.id, MessageRow.data)
+        if user_id is not None:
+            stmt = stmt.where(MessageRow.user_id == str(user_id))
+        if accepted is not None:
+            flag = func.coalesce(MessageRow.data["accepted"].as_boolean(), False)
+            stmt = stmt.where(flag == accepted)
+        if cursor is not None:
+            stmt = stmt.where(
+                or_(
+                    timestamp < cursor[0],
+                    and_(timestamp == cursor[0], MessageRow.id < cursor[1]),
+                )
+            )
+        stmt = stmt.order_by(timestamp.desc(), MessageRow.id.desc()).limit(limit + 1)
+        with self._sessions() as session:
+            rows = session.execute(stmt).all()
+        next_key = (rows[limit - 1][0], rows[limit - 1][1]) if len(rows) > limit else None
+        return [self._to_record(row[2]) for row in rows[:limit]], next_key
+
+    def create(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return self._insert(record)
+
+    def _accept(self, row: Optional[MessageRow]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        item = dict(row.data)
+        item["status"] = "Принято"
+        item["accepted"] = True
+        item["timestamp_accept"] = datetime.utcnow().isoformat()
+        row.data = item
+        return item
+
+    def accept(self, msg_id: str) -> Optional[Dict[str, Any]]:
+        with self._sessions.begin() as session:
+            return self._accept(session.get(MessageRow, str(msg_id)))
+
+    def accept_by_details(self, user_id: str, message_id: int) -> Optional[Dict[str, Any]]:
+        with self._sessions.begin() as session:
+            row = session.scalars(
+                select(MessageRow)
+                .where(MessageRow.user_id == str(user_id), MessageRow.message_id == message_id)
+                .order_by(literal_column("messages.rowid"))
+                .limit(1)
+            ).first()
+            return self._accept(row)
+
+
+_EMPLOYEE_FIELDS = (
+    "name",
+    "full_name",
+    "phone",
+    "position",
+    "is_admin",
+    "card_number",
+    "bank",
+    "work_place",
+    "clothing_size",
+    "birthdate",
+    "note",
+    "photo_url",
+    "created_at",
+    "payout_chat_key",
+    "archived",
+    "archived_at",
+)
+
+
+class SqliteEmployeeRepository:
+    """Employees stored in the ``employees`` table."""
+
+    def __init__(self, database_url: Optional[str] = None) -> None:
+        self._sessions = get_sessionmaker(database_url)
+
+    @staticmethod
+    def _to_employee(row: EmployeeRow) -> Employee:
+        return Employee(
+            id=row.id,
+            name=row.name or "",
+            full_name=row.full_name or "",
+            phone=row.phone or "",
+            position=row.position or "",
+            is_admin=bool(row.is_admin),
+            card_number=row.card_number or "",
+            bank=row.bank or "",
+            work_place=row.work_place or "",
+            clothing_size=row.clothing_size or "",
+            birthdate=row.birthdate,
+            note=row.note or "",
+            photo_url=row.photo_url or "",
+            status=EmployeeStatus(row.status or "active"),
+            created_at=row.created_at or datetime.utcnow(),
+            tags=list(row.tags or []),
+            payout_chat_key=row.payout_chat_key,
+            archived=bool(row.archived),
+            archived_at=row.archived_at,
+        )
+
+    @staticmethod
+    def _fill(row: EmployeeRow, employee: Employee) -> EmployeeRow:
+        for field in _EMPLOYEE_FIELDS:
+            setattr(row, field, getattr(employee, field))
+        status = employee.status
+        row.status = status.value if isinstance(status, EmployeeStatus) else str(status)
+        row.tags = list(employee.tags or [])
+        return row
+
+    def list_employees(self, **filters) -> List[Employee]:
+        """Return employees optionally filtered by provided criteria."""
+        stmt = select(EmployeeRow)
+        archived_filter = filters.get("archived") if "archived" in filters else False
+        if archived_filter is not None:
+            stmt = stmt.where(EmployeeRow.archived.is_(bool(archived_filter)))
+        status = filters.get("status")
+        if status:
+            stmt = stmt.where(
+                EmployeeRow.status.in_(status if isinstance(status, list) else [status])
+            )
+        position = filters.get("position")
+        if position:
+            stmt = stmt.where(
+                EmployeeRow.position.in_(position if isinstance(position, list) else [position])
+            )
+        work_place = filters.get("work_place")
+        if work_place:
+            stmt = stmt.where(
+                EmployeeRow.work_place.in_(
+                    work_place if isinstance(work_place, list) else [work_place]
+                )
+            )
+        if filters.get("birthday_today"):
+            today = datetime.utcnow().strftime("%m-%d")
+            stmt = stmt.where(func.strftime("%m-%d", EmployeeRow.birthdate) == today)
+        stmt = stmt.order_by(literal_column("employees.rowid"))
+        with self._sessions() as session:
+            employees = [self._to_employee(row) for row in session.scalars(stmt)]
+        tags = filters.get("tags")
+        if tags:
+            employees = [e for e in employees if set(tags).intersection(e.tags)]
+        return employees
+
+    def get_employee(self, employee_id: str) -> Employee | None:
+        with self._sessions() as session:
+            row = session.get(EmployeeRow, str(employee_id))
+            if row is None:
+                return None
+            try:
+                return self._to_employee(row)
+            except Exception as exc:
+                log(f"⚠️ Failed to parse employee {employee_id}: {exc}")
+                return None
+
+    def add_employee(self, employee: Employee) -> None:
+        with self._sessions.begin() as session:
+            row = session.get(EmployeeRow, str(employee.id)) or EmployeeRow(id=str(employee.id))
+            session.add(self._fill(row, employee))
+
+    def update_employee(self, employee: Employee) -> None:
+        with self._sessions.begin() as session:
+            row = session.get(EmployeeRow, str(employee.id))
+            if row is not None:
+                self._fill(row, employee)
+
+    def delete_employee_by_id(self, employee_id: str) -> None:
+        with self._sessions.begin() as session:
+            session.execute(delete(EmployeeRow).where(EmployeeRow.id == str(employee_id)))
+
+    def save_employees(self, employees: List[Employee]) -> None:
+        with self._sessions.begin() as session:
+            session.execute(delete(EmployeeRow))
+            for employee in employees:
+                session.add(self._fill(EmployeeRow(id=str(employee.id)), employee))
@@ -5,11 +5,14 @@ from typing import List, Dict, Any, Optional
 
 from app.config import VACATIONS_FILE
 from app.utils.logger import log
+from .journal_storage import JournaledRecordsMixin, open_journal
+from .records import VacationRecord, as_records, json_default
 
 
-class VacationRepository:
+class VacationRepository(JournaledRecordsMixin):
     def __init__(self, file_path: Optional[str] = None) -> None:
         self._file = file_path or VACATIONS_FILE
+        self._journal = open_journal(self._file)
         log(f"📂 Loading vacations from {self._file}")
         self._data: List[Dict[str, Any]] = self._load()
         log(f"✅ Loaded vacations: {len(self._data)}")
@@ -24,6 +27,9 @@ class VacationRepository:
             default=0)
 
     def _load(self) -> List[Dict[str, Any]]:
+        return as_records(VacationRecord, self._read())
+
+    def _read(self) -> List[Dict[str, Any]]:
         if not os.path.exists(self._file):
             example = self._file.replace('.json', '.example.json')
             if os.path.exists(example):
@@ -42,6 +48,8 @@ class VacationRepository:
         try:
             with open(self._file, "r", encoding="utf-8") as f:
                 data = json.load(f)
+            if self._journal is not None:
+                data = self._journal.replay(data)
         except Exception as e:
             log(f"❌ Failed reading {self._file}: {e}")
             data = []
@@ -60,8 +68,11 @@ class VacationRepository:
         return data
 
     def _save(self) -> None:
+        if self._journal is not None:
+            self._journal.compact(self._data)
+            return
         with open(self._file, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, ensure_ascii=False, indent=2)
+            json.dump(self._data, f, ensure_ascii=False, indent=2, default=json_default)
 
     def _generate_id(self) -> int:
         self._counter += 1
@@ -92,8 +103,9 @@ class VacationRepository:
         if "id" not in data or any(
                 str(v.get("id")) == str(data["id"]) for v in self._data):
             data["id"] = self._generate_id()
+        data = VacationRecord(data)
         self._data.append(data)
-        self._save()
+        self._save_record(data)
         return data
 
     def update(self, vac_id: str,
@@ -102,13 +114,13 @@ class VacationRepository:
             if str(item.get("id")) == str(vac_id):
                 item.update(
                     {k: v for k, v in updates.items() if v is not None})
-                self._save()
+                self._save_record(item)
                 return item
         return None
 
     def delete(self, vac_id: str) -> None:
         self._data = [v for v in self._data if str(v.get("id")) != str(vac_id)]
-        self._save()
+        self._delete_record(vac_id)
 
     def list_active(self) -> List[Dict[str, Any]]:
         today = date.today().isoformat()
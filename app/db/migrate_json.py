@@ -0,0 +1,82 @@
+"""Copy the JSON data files into the SQLite database.
+
+Run once before switching ``STORAGE_ENGINE`` to ``sqlite``::
+
+    python -m app.db.migrate_json --database-url sqlite:///bot.db
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict
+
+from sqlalchemy import func, select
+
+from app.data.asset_repository import AssetRepository
+from app.data.employee_repository import EmployeeRepository
+from app.data.incentive_repository import IncentiveRepository
+from app.data.journal_storage import create_storage
+from app.data.message_repository import MessageRepository
+from app.data.payout_repository import PayoutRepository
+from app.data.sqlite_repositories import (
+    SqliteAssetRepository,
+    SqliteEmployeeRepository,
+    SqliteIncentiveRepository,
+    SqliteMessageRepository,
+    SqlitePayoutRepository,
+    SqliteVacationRepository,
+)
+from app.data.vacation_repository import VacationRepository
+from app.db.base_class import Base
+from app.db.session import get_sessionmaker
+from app.utils.config import DATA_FILE
+from app.utils.logger import log
+
+
+def _database_is_empty(database_url: str | None) -> bool:
+    with get_sessionmaker(database_url)() as session:
+        return all(
+            not session.scalar(select(func.count()).select_from(table))
+            for table in Base.metadata.sorted_tables
+        )
+
+
+def migrate(
+    database_url: str | None = None,
+    force: bool = False,
+    messages_file: str = "messages.json",
+) -> Dict[str, int]:
+    """Import every JSON repository into the database and return the counts."""
+    if not force and not _database_is_empty(database_url):
+        raise RuntimeError("database already contains data, use --force to import anyway")
+
+    employees = EmployeeRepository(create_storage(DATA_FILE)).list_employees(archived=None)
+    SqliteEmployeeRepository(database_url).save_employees(employees)
+
+    counts = {"employees": len(employees)}
+    sources = {
+        "payouts": (PayoutRepository(), SqlitePayoutRepository),
+        "vacations": (VacationRepository(), SqliteVacationRepository),
+        "incentives": (IncentiveRepository(), SqliteIncentiveRepository),
+        "assets": (AssetRepository(), SqliteAssetRepository),
+        "messages": (MessageRepository(messages_file), SqliteMessageRepository),
+    }
+    for name, (source, target) in sources.items():
+        # ``load_all`` keeps the file order, which becomes the row order
+        counts[name] = target(database_url).import_records(source.load_all())
+    for name, count in counts.items():
+        log(f"✅ Migrated {name}: {count}")
+    return counts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="target database, defaults to DATABASE_URL")
+    parser.add_argument("--force", action="store_true", help="replace rows with the same ids")
+    parser.add_argument("--messages-file", default="messages.json")
+    args = parser.parse_args(argv)
+    migrate(args.database_url, force=args.force, messages_file=args.messages_file)
+
+
+if __name__ == "__main__":
+    main()
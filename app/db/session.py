@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import DATABASE_URL
+from app.utils.logger import log
+from .base_class import Base
+
+_engines: dict[str, Engine] = {}
+_sessions: dict[str, sessionmaker[Session]] = {}
+
+
+def _enable_wal(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def get_engine(url: str | None = None) -> Engine:
+    """Return a shared engine for ``url`` with the tables created."""
+    url = url or DATABASE_URL
+    engine = _engines.get(url)
+    if engine is None:
+        log(f"🗄️ Opening database {url}")
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", _enable_wal)
+        # make sure every model is registered on the metadata
+        from app.models import employee, records  # noqa: F401
+
+        Base.metadata.create_all(engine)
+        _engines[url] = engine
+    return engine
+
+
+def get_sessionmaker(url: str | None = None) -> sessionmaker[Session]:
+    url = url or DATABASE_URL
+    factory = _sessions.get(url)
+    if factory is None:
+        factory = sessionmaker(bind=get_engine(url), expire_on_commit=False)
+        _sessions[url] = factory
+    return factory
@@ -1,6 +1,5 @@
 """Функции для рассылки сообщений администраторами."""
 
-import asyncio
 from telegram import (
     Message,
     Update,
@@ -13,6 +12,7 @@ from telegram.error import BadRequest
 from ...utils import is_valid_user_id
 
 from ...config import ADMIN_ID
+from ...services.broadcast_engine import SENT, BroadcastEngine
 from ...services.users import load_users_map
 from ...utils.logger import log
 from ...constants import UserStates
@@ -22,43 +22,56 @@ from ...keyboards.reply_admin import get_home_button, get_admin_menu
 async def send_message(
     app: Application, user_id: int, message: Message
 ) -> None:
-    """Отправляет сообщение конкретному пользователю."""
-    log(
-        f"[Telegram] broadcasting message to {user_id} — text: '{(message.text or message.caption or '')[:50]}'"
-    )
+    """Отправляет сообщение конкретному пользователю.
+
+    Ошибки Telegram пробрасываются вызывающему; сообщение без текста и фото
+    или неверный ``user_id`` дают ``ValueError``.
+    """
     if not is_valid_user_id(user_id):
-        log(f"⚠️ Skipping message — invalid or fake user_id: {user_id}")
-        return
-    try:
-        if message.text:
-            await app.bot.send_message(
-                chat_id=user_id,
-                text=message.text,
-                parse_mode="HTML",
-            )
-        elif message.photo:
-            await app.bot.send_photo(
-                chat_id=user_id,
-                photo=message.photo[-1].file_id,
-                caption=message.caption or "",
-                parse_mode="HTML",
-            )
-        log(f"✅ [send_message] Сообщение отправлено пользователю {user_id}")
-    except BadRequest as e:
-        log(f"❌ Failed to send message to chat {user_id} — {e}")
-        raise
-    except Exception as e:
-        log(f"❌ [send_message] Ошибка отправки пользователю {user_id}: {e}")
+        raise ValueError(f"invalid user_id: {user_id}")
+    if message.text:
+        await app.bot.send_message(
+            chat_id=user_id,
+            text=message.text,
+            parse_mode="HTML",
+        )
+    elif message.photo:
+        await app.bot.send_photo(
+            chat_id=user_id,
+            photo=message.photo[-1].file_id,
+            caption=message.caption or "",
+            parse_mode="HTML",
+        )
+    else:
+        raise ValueError("message has neither text nor photo")
 
 
 async def send_broadcast_message(
     app: Application, message: Message, user_list: list[int]
-) -> None:
-    """Отправляет сообщение всем пользователям из списка."""
-    for i, user_id in enumerate(user_list, start=1):
-        await send_message(app, user_id, message)
-        if i % 15 == 0:
-            await asyncio.sleep(1)
+) -> int:
+    """Отправляет сообщение всем пользователям из списка.
+
+    Темп и повторы при ``RetryAfter`` задаёт :class:`BroadcastEngine`.
+    Возвращает число доставленных сообщений.
+    """
+    valid = []
+    for user_id in user_list:
+        if is_valid_user_id(user_id):
+            valid.append(user_id)
+        else:
+            log(f"⚠️ Skipping message — invalid or fake user_id: {user_id}")
+
+    async def deliver(chat_id: str) -> None:
+        await send_message(app, int(chat_id), message)
+
+    results = await BroadcastEngine().run(valid, deliver)
+    for result in results:
+        if result.status != SENT:
+            log(
+                f"❌ [send_broadcast_message] Ошибка отправки пользователю "
+                f"{result.chat_id}: {result.error}"
+            )
+    return sum(1 for result in results if result.status == SENT)
 
 
 async def handle_broadcast_start(
@@ -202,12 +215,12 @@ async def handle_broadcast_send(
     message = update.message
     message.text = message_text
 
-    await send_broadcast_message(context.application, message, user_ids)
+    sent = await send_broadcast_message(context.application, message, user_ids)
 
     context.user_data.pop("broadcast_in_progress", None)
     context.user_data.pop("broadcast_text", None)
     await update.message.reply_text(
-        f"✅ Рассылка успешно отправлена {len(user_ids)} пользователям!",
+        f"✅ Рассылка отправлена {sent} из {len(user_ids)} пользователей!",
         reply_markup=get_admin_menu(),
     )
     log(
@@ -1,5 +1,4 @@
 import os
-import pandas as pd
 from telegram import Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 from ...constants import UserStates
@@ -7,6 +6,7 @@ from ...config import EXCEL_FILE
 from ...services.users import load_users_map
 from ...keyboards.reply_admin import get_admin_menu, get_month_keyboard, get_home_button
 from ...services.excel import load_data
+from ...services.workbook_cache import get_workbook_cache
 from ...services.report import generate_employee_report
 from ...utils.image import create_combined_table_image, create_schedule_image
 from ...utils.logger import log
@@ -209,7 +209,7 @@ async def handle_schedule_admin(
         chat_id=update.message.chat_id, action="typing"
     )
     try:
-        data = pd.read_excel(EXCEL_FILE, sheet_name=month, header=None)
+        data = get_workbook_cache().dataframe(EXCEL_FILE, month, header=None)
         if data.shape[0] < 2 or data.shape[1] < 3:
             log(
                 f"❌ [handle_schedule_admin] Неверная структура данных для {month}: {data.shape}"
@@ -25,7 +25,7 @@ from ...config import (
     CARD_DISPATCH_CHATS,
     DEFAULT_CARD_DISPATCH_CHAT_KEY,
 )
-from ...services.users import load_users_map
+from ...services.users import get_user, load_users_map
 from ...keyboards.reply_admin import get_admin_menu
 from ...services.advance_requests import (
     load_advance_requests,
@@ -51,10 +51,9 @@ PENDING_STATUSES = {PAYOUT_STATUSES[0]}
 
 
 def _resolve_cashier_chat(
-    user_id: str, users: dict[str, dict] | None
+    user_info: dict | None,
 ) -> tuple[int | None, str, str | None]:
     """Return target cashier chat id, display name and key for the user."""
-    user_info = users.get(str(user_id), {}) if isinstance(users, dict) else {}
     key = user_info.get("payout_chat_key") if isinstance(user_info, dict) else None
 
     if key:
@@ -137,9 +136,8 @@ async def allow_payout(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     cashier_chat_name = ""
     cashier_chat_key: str | None = None
     if should_notify_cashier:
-        users_map = load_users_map()
         cashier_chat_id, cashier_chat_name, cashier_chat_key = _resolve_cashier_chat(
-            user_id, users_map
+            get_user(user_id)
         )
 
     user_message = (
@@ -9,7 +9,7 @@ from ...config import (
     USERS_FILE,
     MAX_ADVANCE_AMOUNT_PER_MONTH,
 )
-from ...services.users import load_users_map, save_users, add_user, update_user, delete_user
+from ...services.users import get_user, load_users_map, save_users, add_user, update_user, delete_user
 from ...services.advance_requests import load_advance_requests
 from ...keyboards.reply_user import get_cabinet_menu, get_main_menu
 from ...utils.logger import log
@@ -22,8 +22,7 @@ async def personal_cabinet(
     state = context.application.chat_data.get(chat_id, {}).get("conversation")
     log(f"[FSM] state before entry: {state}")
     user_id = str(update.effective_user.id)
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         await update.message.reply_text(
             "❌ Ваши данные не найдены. Обратитесь к администратору.",
@@ -42,8 +41,7 @@ async def view_user_info(
         update: Update,
         context: ContextTypes.DEFAULT_TYPE) -> None:
     user_id = str(update.effective_user.id)
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         await update.message.reply_text(
             "❌ Ваши данные не найдены.", reply_markup=get_main_menu(user_id)
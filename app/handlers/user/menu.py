@@ -1,13 +1,13 @@
 import os
-import pandas as pd
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
 
 from ...config import EXCEL_FILE
-from ...services.users import load_users_map
+from ...services.users import get_user
 from ...keyboards.reply_user import get_month_keyboard_user, get_main_menu
 from ...utils.image import create_schedule_image, create_combined_table_image
 from ...services.excel import load_data
+from ...services.workbook_cache import get_workbook_cache
 from ...services.report import generate_employee_report
 from ...utils.logger import log
 
@@ -77,8 +77,7 @@ async def handle_selected_month_user(
     loading_message = await update.message.reply_text("⏳ Загружаю данные...")
     await context.bot.send_chat_action(chat_id=update.message.chat_id, action="typing")
 
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         await loading_message.edit_text(
             "❌ Информация о пользователе не найдена. Обратитесь к администратору.",
@@ -141,7 +140,7 @@ async def handle_selected_month_user(
             )
     elif requested_data == "schedule":
         try:
-            raw_data = pd.read_excel(EXCEL_FILE, sheet_name=month, header=None)
+            raw_data = get_workbook_cache().dataframe(EXCEL_FILE, month, header=None)
             if raw_data.shape[0] < 2 or raw_data.shape[1] < 3:
                 await loading_message.edit_text(
                     f"❌ Неверная структура данных в Excel для {month}.",
@@ -198,8 +197,7 @@ async def handle_schedule_request(
         context: ContextTypes.DEFAULT_TYPE):
     """Отправляет расписание на текущий выбранный месяц."""
     user_id = update.effective_user.id
-    users = load_users_map()
-    user_info = users.get(str(user_id))
+    user_info = get_user(user_id)
     if not user_info or not user_info.get("name"):
         await update.message.reply_text(
             "❌ Ваши данные не найдены. Обратитесь к администратору."
@@ -213,7 +211,7 @@ async def handle_schedule_request(
     loading_message = await update.message.reply_text("⏳ Загружаю расписание...")
     await context.bot.send_chat_action(chat_id=update.message.chat_id, action="typing")
     try:
-        data = pd.read_excel(EXCEL_FILE, sheet_name=month, header=None)
+        data = get_workbook_cache().dataframe(EXCEL_FILE, month, header=None)
         if data.shape[0] < 2 or data.shape[1] < 3:
             await loading_message.edit_text("❌ Неверная структура данных в Excel.")
             return
@@ -1,19 +1,18 @@
 from __future__ import annotations
 
-import datetime
 from telegram import Update, ReplyKeyboardMarkup, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes, ConversationHandler
 
 from ...constants import PAYMENT_REQUEST_PATTERN, PayoutStates
 from ...config import MAX_ADVANCE_AMOUNT_PER_MONTH
-from ...services.users import load_users_map
+from ...services.users import get_user
 from ...services.advance_requests import (
     check_pending_request,
-    load_advance_requests,
     log_new_request,
+    monthly_advance_total,
 )
 from ...services.telegram_service import TelegramService
-from app.data.employee_repository import EmployeeRepository
+from app.data.factory import get_employee_repository
 from ...utils.logger import log
 
 
@@ -32,8 +31,7 @@ async def request_payout_start(update: Update, context: ContextTypes.DEFAULT_TYP
         )
         return ConversationHandler.END
 
-    users = load_users_map()
-    user = users.get(user_id)
+    user = get_user(user_id)
     if not user:
         await update.message.reply_text(
             "❌ Ваши данные не найдены. Обратитесь к администратору.",
@@ -90,16 +88,7 @@ async def enter_amount(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Pa
 
     # check monthly limit for advances
     if data.get("payout_type") == "Аванс":
-        now_month = datetime.datetime.now().strftime("%Y-%m")
-        requests = load_advance_requests()
-        total = sum(
-            int(r.get("amount", 0))
-            for r in requests
-            if r.get("user_id") == user_id
-            and r.get("timestamp", "").startswith(now_month)
-            and r.get("status") in {"Одобрено", "Ожидает"}
-            and (r.get("payout_type") in ["Аванс", None] or "payout_type" not in r)
-        )
+        total = monthly_advance_total(user_id)
         if total + amount > MAX_ADVANCE_AMOUNT_PER_MONTH:
             await update.message.reply_text(
                 "❌ Превышен месячный лимит авансов.",
@@ -173,7 +162,7 @@ async def confirm_card(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
         data.get("payout_type"),
     )
 
-    telegram_service = TelegramService(EmployeeRepository())
+    telegram_service = TelegramService(get_employee_repository())
     try:
         await telegram_service.send_payout_request_to_admin(record)
     except Exception as exc:
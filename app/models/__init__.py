@@ -1,5 +1,15 @@
 from .employee import Employee
 from .user import User
 from .payout import PayoutRequest
+from .records import AssetRow, IncentiveRow, MessageRow, PayoutRow, VacationRow
 
-__all__ = ["User", "PayoutRequest", "Employee"]
+__all__ = [
+    "User",
+    "PayoutRequest",
+    "Employee",
+    "PayoutRow",
+    "VacationRow",
+    "IncentiveRow",
+    "AssetRow",
+    "MessageRow",
+]
@@ -1,20 +1,28 @@
-from sqlalchemy import Column, Integer, String, Date, Text, DateTime, Boolean
+from sqlalchemy import JSON, Column, String, Date, Text, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
 
 class Employee(Base):
     __tablename__ = "employees"
+    __table_args__ = (Index("ix_employees_archived_status", "archived", "status"),)
 
-    id = Column(Integer, primary_key=True, index=True)
-    full_name = Column(String, nullable=False)
-    phone = Column(String, nullable=False)
-    card_number = Column(String, nullable=False)
-    bank = Column(String, nullable=False)
+    id = Column(String, primary_key=True, index=True)
+    name = Column(String, nullable=False, default="")
+    full_name = Column(String, nullable=False, default="")
+    phone = Column(String, nullable=False, default="")
+    position = Column(String, nullable=False, default="", index=True)
+    is_admin = Column(Boolean, nullable=False, default=False)
+    card_number = Column(String, nullable=False, default="")
+    bank = Column(String, nullable=False, default="")
+    work_place = Column(String, nullable=False, default="", index=True)
+    clothing_size = Column(String, nullable=False, default="")
     birthdate = Column(Date, nullable=True)
     note = Column(Text, nullable=True)
     photo_url = Column(String, nullable=True)
     status = Column(String, nullable=False, default="active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    tags = Column(JSON, nullable=False, default=list)
+    payout_chat_key = Column(String, nullable=True)
     archived = Column(Boolean, nullable=False, default=False)
     archived_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,62 @@
+from sqlalchemy import JSON, Boolean, Column, Index, Integer, String
+
+from app.db.base_class import Base
+
+
+class PayoutRow(Base):
+    """Payout request; ``data`` keeps the full record as stored in JSON."""
+
+    __tablename__ = "payouts"
+    __table_args__ = (Index("ix_payouts_user_timestamp", "user_id", "timestamp"),)
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=True, index=True)
+    status = Column(String, nullable=True, index=True)
+    payout_type = Column(String, nullable=True, index=True)
+    method = Column(String, nullable=True, index=True)
+    timestamp = Column(String, nullable=True, index=True)
+    # ``timestamp`` when it parses as ``%Y-%m-%d %H:%M:%S``, otherwise NULL
+    created_at = Column(String, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
+
+
+class VacationRow(Base):
+    __tablename__ = "vacations"
+
+    id = Column(String, primary_key=True)
+    employee_id = Column(String, nullable=True, index=True)
+    type = Column(String, nullable=True, index=True)
+    start_date = Column(String, nullable=True, index=True)
+    end_date = Column(String, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
+
+
+class IncentiveRow(Base):
+    __tablename__ = "incentives"
+
+    id = Column(String, primary_key=True)
+    employee_id = Column(String, nullable=True, index=True)
+    type = Column(String, nullable=True, index=True)
+    date = Column(String, nullable=True, index=True)
+    locked = Column(Boolean, nullable=False, default=False)
+    data = Column(JSON, nullable=False)
+
+
+class AssetRow(Base):
+    __tablename__ = "assets"
+
+    id = Column(String, primary_key=True)
+    employee_id = Column(String, nullable=True, index=True)
+    issue_date = Column(String, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
+
+
+class MessageRow(Base):
+    __tablename__ = "messages"
+    __table_args__ = (Index("ix_messages_user_message", "user_id", "message_id"),)
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=True, index=True)
+    message_id = Column(Integer, nullable=True)
+    timestamp = Column(String, nullable=True, index=True)
+    data = Column(JSON, nullable=False)
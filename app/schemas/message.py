@@ -1,5 +1,5 @@
 from typing import Optional, List, Union
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class MessageRequest(BaseModel):
@@ -33,6 +33,7 @@ class BroadcastRequest(BaseModel):
     birthday_today: bool = False
     tags: Optional[list[str]] = None
     test_user_id: Optional[str] = None
+    batch_id: Optional[str] = Field(None, pattern=r"^[A-Za-z0-9_-]{1,64}$")
 
 
 class SentMessage(BaseModel):
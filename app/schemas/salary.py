@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -24,3 +24,28 @@ class SalaryRow(BaseModel):
     advance: float = 0.0
     final_amount: float = 0.0
     comment: Optional[str] = None
+
+
+class SalaryTotals(BaseModel):
+    employee_id: str
+    name: str
+    months: List[str]
+    totals: Dict[str, float]
+
+
+class SalaryTrendPoint(BaseModel):
+    month: str
+    value: float
+
+
+class SalaryTrend(BaseModel):
+    employee_id: str
+    name: str
+    metric: str
+    points: List[SalaryTrendPoint]
+
+
+class SalaryPointTotal(BaseModel):
+    work_place: str
+    employees: int
+    total: float
@@ -4,14 +4,17 @@ import base64
 import hashlib
 import hmac
 import secrets
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
 
-from app.config import SECRET_KEY
+from app.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS, SECRET_KEY
 from app.data.employee_repository import EmployeeRepository
-from app.data.json_storage import JsonStorage
+from app.data.factory import get_employee_repository
+from app.data.journal_storage import create_storage
 
 
 AVAILABLE_PERMISSIONS: list[dict[str, str]] = [
@@ -78,6 +81,16 @@ DEFAULT_USER_BUTTON_IDS: list[str] = [
 
 TOKEN_TTL_SECONDS = 60 * 60 * 12
 
+# lookup tables over the static catalogs above
+_PERMISSION_IDS = [perm["id"] for perm in AVAILABLE_PERMISSIONS]
+_VALID_PERMISSIONS = frozenset(_PERMISSION_IDS)
+_VALID_BUTTONS = frozenset(btn["id"] for btn in BOT_BUTTON_CATALOG)
+_ALL_USER_BUTTONS = [
+    btn["id"] for btn in BOT_BUTTON_CATALOG if btn.get("scope") != "common"
+]
+_BUTTON_LABELS = {btn["id"]: btn["label"] for btn in BOT_BUTTON_CATALOG}
+_BUTTON_TEXTS = {btn["id"]: btn["text"] for btn in BOT_BUTTON_CATALOG}
+
 
 @dataclass
 class ResolvedUser:
@@ -92,19 +105,68 @@ class ResolvedUser:
     allowed_departments: list[str] | None
 
 
+@dataclass(frozen=True)
+class EmployeeVisibility:
+    """Materialized employee scope of a user.
+
+    ``employee_ids`` and ``departments`` are the configured scopes (``None``
+    means unrestricted), ``department_members`` holds every employee of
+    ``departments`` and ``visible_ids`` is the answer of
+    :meth:`AccessControlService.visible_employee_ids`.
+    """
+
+    employee_ids: frozenset[str] | None
+    departments: frozenset[str] | None
+    department_members: frozenset[str]
+    visible_ids: frozenset[str] | None
+
+    def contains(self, employee_id: str | None, department: str | None = None) -> bool:
+        if self.employee_ids is not None:
+            return bool(employee_id) and str(employee_id) in self.employee_ids
+        if self.departments is not None:
+            if department and department in self.departments:
+                return True
+            return bool(employee_id) and str(employee_id) in self.department_members
+        return True
+
+
 class AccessControlService:
-    """Manage access control configuration stored in JSON."""
+    """Manage access control configuration stored in JSON.
+
+    :meth:`verify_token` keeps the users it resolved in a bounded LRU cache
+    keyed by token. Entries live for ``cache_ttl`` seconds at most and are
+    dropped when roles or users are saved or the employee repository
+    ``version`` moves. Repositories without a ``version`` are not cached.
+    Cached :class:`ResolvedUser` objects are shared between requests.
+
+    Users are looked up through id and login indexes and roles through an id
+    index; the indexes are rebuilt whenever the configuration is saved.
+
+    The employee scope of each user is materialized once into an
+    :class:`EmployeeVisibility` and invalidated the same way, so row level
+    checks are set lookups.
+    """
 
     def __init__(
         self,
         path: str | Path = "access_control.json",
         secret_key: str | None = None,
         employee_repo: EmployeeRepository | None = None,
+        cache_ttl: float | None = None,
+        cache_size: int | None = None,
     ) -> None:
-        self.storage = JsonStorage(path)
+        self.storage = create_storage(path)
         self.secret_key = (secret_key or SECRET_KEY or "change_me").encode("utf-8")
-        self.employee_repo = employee_repo or EmployeeRepository()
+        self.employee_repo = employee_repo or get_employee_repository()
+        self.cache_ttl = AUTH_CACHE_TTL_SECONDS if cache_ttl is None else cache_ttl
+        self.cache_size = AUTH_CACHE_SIZE if cache_size is None else cache_size
+        self._tokens: OrderedDict[str, tuple[Any, float, ResolvedUser]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._scopes: dict[tuple, EmployeeVisibility] = {}
+        self._scopes_version: Any = None
+        self._known: tuple[Any, frozenset[str], frozenset[str]] | None = None
         self._data: dict[str, Any] = self.storage.load() or {}
+        self._reindex()
         self._ensure_defaults()
 
     # ------------------------------------------------------------------
@@ -131,7 +193,7 @@ class AccessControlService:
         if "users" not in self._data:
             self._data["users"] = []
             changed = True
-        if not any(u.get("login") == "admin" for u in self._data["users"]):
+        if self._get_user_by_login("admin") is None:
             salt, password_hash = self._hash_password("admin")
             self._data["users"].append(
                 {
@@ -150,8 +212,49 @@ class AccessControlService:
         if changed:
             self._persist()
 
+    def _reindex(self) -> None:
+        # the first record wins for duplicate keys, like the former scans
+        self._users_by_id: dict[Any, dict[str, Any]] = {}
+        self._users_by_login: dict[Any, dict[str, Any]] = {}
+        self._roles_by_id: dict[Any, dict[str, Any]] = {}
+        for user in self._data.get("users", []):
+            self._users_by_id.setdefault(user.get("id"), user)
+            self._users_by_login.setdefault(user.get("login"), user)
+        for role in self._data.get("roles", []):
+            self._roles_by_id.setdefault(role.get("id"), role)
+
     def _persist(self) -> None:
+        self._reindex()
         self.storage.save(self._data)
+        with self._cache_lock:
+            self._tokens.clear()
+            self._scopes.clear()
+
+    def _cache_version(self) -> Any:
+        return getattr(self.employee_repo, "version", None)
+
+    def _cached_token(self, token: str, version: Any) -> ResolvedUser | None:
+        with self._cache_lock:
+            entry = self._tokens.get(token)
+            if entry is None:
+                return None
+            cached_version, expires_at, resolved = entry
+            if cached_version != version or time.time() >= expires_at:
+                del self._tokens[token]
+                return None
+            self._tokens.move_to_end(token)
+            return resolved
+
+    def _cache_token(
+        self, token: str, version: Any, issued_at: int, resolved: ResolvedUser
+    ) -> None:
+        # never outlive the token itself
+        expires_at = min(time.time() + self.cache_ttl, issued_at + TOKEN_TTL_SECONDS)
+        with self._cache_lock:
+            self._tokens[token] = (version, expires_at, resolved)
+            self._tokens.move_to_end(token)
+            while len(self._tokens) > self.cache_size:
+                self._tokens.popitem(last=False)
 
     def _hash_password(self, password: str, salt: str | None = None) -> tuple[str, str]:
         salt = salt or secrets.token_hex(16)
@@ -161,19 +264,17 @@ class AccessControlService:
     def _validate_permissions(self, permissions: Iterable[str] | None) -> list[str] | None:
         if permissions is None:
             return None
-        valid_ids = {p["id"] for p in AVAILABLE_PERMISSIONS}
         if "*" in permissions:
             return ["*"]
-        filtered = [perm for perm in permissions if perm in valid_ids]
+        filtered = [perm for perm in permissions if perm in _VALID_PERMISSIONS]
         return filtered
 
     def _validate_buttons(self, button_ids: Iterable[str] | None) -> list[str] | None:
         if button_ids is None:
             return None
-        valid_ids = {btn["id"] for btn in BOT_BUTTON_CATALOG}
         if "*" in button_ids:
             return ["*"]
-        filtered = [btn_id for btn_id in button_ids if btn_id in valid_ids]
+        filtered = [btn_id for btn_id in button_ids if btn_id in _VALID_BUTTONS]
         return filtered
 
     def _validate_employee_ids(
@@ -181,9 +282,7 @@ class AccessControlService:
     ) -> list[str] | None:
         if employee_ids is None:
             return None
-        known_ids = {
-            emp.id for emp in self.employee_repo.list_employees(archived=False)
-        }
+        known_ids = self._known_employees()[0]
         result = []
         for value in employee_ids:
             if value is None:
@@ -198,11 +297,7 @@ class AccessControlService:
     ) -> list[str] | None:
         if departments is None:
             return None
-        known_departments = {
-            emp.work_place.strip()
-            for emp in self.employee_repo.list_employees(archived=False)
-            if emp.work_place
-        }
+        known_departments = self._known_employees()[1]
         result: list[str] = []
         for raw in departments:
             if not raw:
@@ -216,25 +311,31 @@ class AccessControlService:
                 result.append(department)
         return result
 
+    def _known_employees(self) -> tuple[frozenset[str], frozenset[str]]:
+        """Return the ids and departments of active employees."""
+        version = self._cache_version()
+        known = self._known
+        if version is not None and known is not None and known[0] == version:
+            return known[1], known[2]
+        employees = self.employee_repo.list_employees(archived=False)
+        ids = frozenset(emp.id for emp in employees)
+        departments = frozenset(
+            emp.work_place.strip() for emp in employees if emp.work_place
+        )
+        if version is not None:
+            self._known = (version, ids, departments)
+        return ids, departments
+
     def _get_role(self, role_id: str | None) -> dict[str, Any] | None:
         if not role_id:
             return None
-        for role in self._data.get("roles", []):
-            if role.get("id") == role_id:
-                return role
-        return None
+        return self._roles_by_id.get(role_id)
 
     def _get_user(self, user_id: str) -> dict[str, Any] | None:
-        for user in self._data.get("users", []):
-            if user.get("id") == user_id:
-                return user
-        return None
+        return self._users_by_id.get(user_id)
 
     def _get_user_by_login(self, login: str) -> dict[str, Any] | None:
-        for user in self._data.get("users", []):
-            if user.get("login") == login:
-                return user
-        return None
+        return self._users_by_login.get(login)
 
     # ------------------------------------------------------------------
     # public API
@@ -281,10 +382,9 @@ class AccessControlService:
         return result
 
     def button_labels(self, button_ids: Iterable[str]) -> list[str]:
-        catalog_map = {btn["id"]: btn["label"] for btn in BOT_BUTTON_CATALOG}
         labels: list[str] = []
         for btn_id in button_ids:
-            label = catalog_map.get(btn_id)
+            label = _BUTTON_LABELS.get(btn_id)
             if label and label not in labels:
                 labels.append(label)
         return labels
@@ -424,6 +524,12 @@ class AccessControlService:
         return token
 
     def verify_token(self, token: str) -> ResolvedUser:
+        version = self._cache_version()
+        caching = version is not None and self.cache_size > 0 and self.cache_ttl > 0
+        if caching:
+            cached = self._cached_token(token, version)
+            if cached is not None:
+                return cached
         try:
             decoded = base64.urlsafe_b64decode(token.encode("utf-8")).decode("utf-8")
             user_id, issued_at_str, signature = decoded.split(":", 2)
@@ -440,6 +546,8 @@ class AccessControlService:
         resolved = self.resolve_user(user_id)
         if not resolved:
             raise ValueError("user_not_found")
+        if caching:
+            self._cache_token(token, version, issued_at, resolved)
         return resolved
 
     # ------------------------------------------------------------------
@@ -480,9 +588,8 @@ class AccessControlService:
         if not user_permissions:
             return []
         if "*" in user_permissions:
-            return [perm["id"] for perm in AVAILABLE_PERMISSIONS]
-        valid = {perm["id"] for perm in AVAILABLE_PERMISSIONS}
-        return [perm for perm in user_permissions if perm in valid]
+            return list(_PERMISSION_IDS)
+        return [perm for perm in user_permissions if perm in _VALID_PERMISSIONS]
 
     def _resolve_buttons(
         self, record: dict[str, Any], role: dict[str, Any] | None
@@ -493,10 +600,9 @@ class AccessControlService:
         if button_ids is None:
             resolved = DEFAULT_USER_BUTTON_IDS.copy()
         elif button_ids and "*" in button_ids:
-            resolved = [btn["id"] for btn in BOT_BUTTON_CATALOG if btn.get("scope") != "common"]
+            resolved = list(_ALL_USER_BUTTONS)
         else:
-            valid_ids = {btn["id"] for btn in BOT_BUTTON_CATALOG}
-            resolved = [btn_id for btn_id in button_ids if btn_id in valid_ids]
+            resolved = [btn_id for btn_id in button_ids if btn_id in _VALID_BUTTONS]
         if "common.home" not in resolved:
             resolved.append("common.home")
         return resolved
@@ -561,39 +667,61 @@ class AccessControlService:
             return None
         return set(user.allowed_departments)
 
+    def visibility(self, user: ResolvedUser) -> EmployeeVisibility:
+        """Return the materialized employee scope of ``user``."""
+        key = (
+            user.id,
+            None if user.allowed_employee_ids is None else tuple(user.allowed_employee_ids),
+            None if user.allowed_departments is None else tuple(user.allowed_departments),
+        )
+        version = self._cache_version()
+        if version is not None:
+            with self._cache_lock:
+                if version != self._scopes_version:
+                    self._scopes.clear()
+                    self._scopes_version = version
+                cached = self._scopes.get(key)
+            if cached is not None:
+                return cached
+        visibility = self._build_visibility(user)
+        if version is not None:
+            with self._cache_lock:
+                if version == self._scopes_version:
+                    self._scopes[key] = visibility
+        return visibility
+
+    def _build_visibility(self, user: ResolvedUser) -> EmployeeVisibility:
+        employee_scope = self.user_employee_scope(user)
+        department_scope = self.user_department_scope(user)
+        members: frozenset[str] = frozenset()
+        active: frozenset[str] = frozenset()
+        if department_scope:
+            employees = self.employee_repo.list_employees(
+                archived=None, work_place=sorted(department_scope)
+            )
+            members = frozenset(e.id for e in employees)
+            active = frozenset(e.id for e in employees if not e.archived)
+        visible_ids = None
+        if employee_scope or department_scope:
+            visible_ids = frozenset(employee_scope or ()) | active
+        return EmployeeVisibility(
+            employee_ids=None if employee_scope is None else frozenset(employee_scope),
+            departments=None if department_scope is None else frozenset(department_scope),
+            department_members=members,
+            visible_ids=visible_ids,
+        )
+
     def is_employee_visible(
         self,
         user: ResolvedUser,
         employee_id: str | None,
         department: str | None = None,
     ) -> bool:
-        employee_scope = self.user_employee_scope(user)
-        department_scope = self.user_department_scope(user)
-        if employee_scope is not None:
-            if not employee_id or str(employee_id) not in employee_scope:
-                return False
-            return True
-        if department_scope is not None:
-            if department and department in department_scope:
-                return True
-            if employee_id:
-                employee = self.employee_repo.get_employee(str(employee_id))
-                if employee and employee.work_place in department_scope:
-                    return True
-            return False
-        return True
+        return self.visibility(user).contains(employee_id, department)
 
-    def visible_employee_ids(self, user: ResolvedUser) -> set[str] | None:
-        employee_scope = self.user_employee_scope(user)
-        department_scope = self.user_department_scope(user)
-        if not employee_scope and not department_scope:
-            return None
-        visible: set[str] = set(employee_scope or [])
-        if department_scope:
-            for employee in self.employee_repo.list_employees(archived=False):
-                if employee.work_place in department_scope:
-                    visible.add(employee.id)
-        return visible
+    def visible_employee_ids(self, user: ResolvedUser) -> frozenset[str] | None:
+        """Return the ids ``user`` may see, or ``None`` when unrestricted."""
+        return self.visibility(user).visible_ids
 
     # ------------------------------------------------------------------
     # bot integration helpers
@@ -607,10 +735,9 @@ class AccessControlService:
         return self._buttons_to_text(user.bot_buttons)
 
     def _buttons_to_text(self, button_ids: Iterable[str]) -> list[str]:
-        catalog_map = {btn["id"]: btn["text"] for btn in BOT_BUTTON_CATALOG}
         texts: list[str] = []
         for btn_id in button_ids:
-            text = catalog_map.get(btn_id)
+            text = _BUTTON_TEXTS.get(btn_id)
             if text and text not in texts:
                 texts.append(text)
         return texts
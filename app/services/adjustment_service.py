@@ -1,24 +1,29 @@
+import asyncio
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 from app.data.adjustment_repository import AdjustmentRepository
+from app.utils.executor import run_blocking
 
 
 class AdjustmentService:
     def __init__(self) -> None:
         self._repo = AdjustmentRepository()
+        self._repo_lock = asyncio.Lock()
 
-    def list(self) -> List[Dict[str, Any]]:
-        return self._repo.list()
+    async def list(self) -> List[Dict[str, Any]]:
+        return await run_blocking(self._repo.list, lock=self._repo_lock)
 
-    def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         if 'date' not in data or not data['date']:
             data['date'] = datetime.today().date().isoformat()
-        return self._repo.create(data)
+        return await run_blocking(self._repo.create, data, lock=self._repo_lock)
 
-    def update(self, adj_id: str,
-               updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        return self._repo.update(adj_id, updates)
+    async def update(self, adj_id: str,
+                     updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await run_blocking(
+            self._repo.update, adj_id, updates, lock=self._repo_lock
+        )
 
-    def delete(self, adj_id: str) -> None:
-        self._repo.delete(adj_id)
+    async def delete(self, adj_id: str) -> None:
+        await run_blocking(self._repo.delete, adj_id, lock=self._repo_lock)
@@ -4,7 +4,8 @@ from typing import Iterable, Optional
 import pandas as pd
 
 
-from .advance_requests import load_advance_requests
+from ..data.payout_index import epoch_to_datetime
+from .advance_requests import load_advance_requests, timestamp_epoch
 
 
 def dataframe_to_markdown(df: pd.DataFrame) -> str:
@@ -60,13 +61,10 @@ def generate_advance_report(
     for req in requests:
         if req.get("payout_type") != "Аванс":
             continue
-        ts = req.get("timestamp")
-        if not ts:
-            continue
-        try:
-            dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S").date()
-        except Exception:
+        epoch = timestamp_epoch(req)
+        if epoch is None:
             continue
+        dt = epoch_to_datetime(epoch).date()
         if start_date <= dt <= end_date:
             if statuses and req.get("status") not in statuses:
                 continue
@@ -4,13 +4,14 @@ from typing import Any, Dict, List
 from datetime import datetime
 import logging
 
+from app.data.factory import get_payout_repository
 from app.data.payout_repository import PayoutRepository
 from ..utils.logger import log
 from ..core.enums import PAYOUT_STATUSES
 
 logger = logging.getLogger(__name__)
 
-_repo = PayoutRepository()
+_repo = get_payout_repository()
 
 
 def _sync_repo() -> PayoutRepository:
@@ -23,6 +24,9 @@ def _sync_repo() -> PayoutRepository:
 
 # statuses considered pending (awaiting admin decision)
 PENDING_STATUSES = {PAYOUT_STATUSES[0]}
+# requests counted against MAX_ADVANCE_AMOUNT_PER_MONTH
+ADVANCE_LIMIT_STATUSES = (PAYOUT_STATUSES[1], PAYOUT_STATUSES[0])
+ADVANCE_LIMIT_TYPES = ("Аванс", None)
 
 STATUS_TRANSLATIONS = {
     "approved": "Одобрено",
@@ -41,6 +45,23 @@ def load_advance_requests() -> List[Dict[str, Any]]:
     return data
 
 
+def timestamp_epoch(record: Dict[str, Any]) -> int | None:
+    """Return the epoch of a record's timestamp as cached by the repository."""
+    return _repo.timestamp_epoch(record)
+
+
+def monthly_advance_total(user_id: Any, month: str | None = None) -> float:
+    """Return approved and pending advances of ``user_id`` for ``month``."""
+    repo = _sync_repo()
+    month = month or datetime.now().strftime("%Y-%m")
+    return repo.monthly_total(
+        user_id,
+        month,
+        payout_types=ADVANCE_LIMIT_TYPES,
+        statuses=ADVANCE_LIMIT_STATUSES,
+    )
+
+
 def save_advance_requests(_requests_list: List[Dict[str, Any]]) -> None:
     log("⚠️ save_advance_requests is deprecated when using repository")
 
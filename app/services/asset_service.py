@@ -1,27 +1,37 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, Callable, List, Optional
 
 from app.schemas.asset import Asset, AssetCreate, AssetUpdate
 from app.data.asset_repository import AssetRepository
+from app.data.factory import get_asset_repository
+from app.utils.executor import run_blocking
 
 
 class AssetService:
     def __init__(self, repo: Optional[AssetRepository] = None) -> None:
-        self._repo = repo or AssetRepository()
+        self._repo = repo or get_asset_repository()
+        self._repo_lock = asyncio.Lock()
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run repository work in the executor, one call at a time."""
+        return await run_blocking(func, *args, lock=self._repo_lock)
 
     async def list_assets(self, employee_id: Optional[str] = None) -> List[Asset]:
-        rows = self._repo.list(employee_id)
+        rows = await self._run(self._repo.list, employee_id)
         return [Asset(**r) for r in rows]
 
     async def create_asset(self, data: AssetCreate) -> Asset:
-        created = self._repo.create(data.model_dump())
+        created = await self._run(self._repo.create, data.model_dump())
         return Asset(**created)
 
     async def update_asset(self, item_id: str, data: AssetUpdate) -> Optional[Asset]:
-        updated = self._repo.update(item_id, data.model_dump(exclude_none=True))
+        updated = await self._run(
+            self._repo.update, item_id, data.model_dump(exclude_none=True)
+        )
         return Asset(**updated) if updated else None
 
     async def delete_asset(self, item_id: str) -> None:
-        self._repo.delete(item_id)
+        await self._run(self._repo.delete, item_id)
 
     def get_asset_employee(self, item_id: str) -> Optional[str]:
         for item in self._repo.list():
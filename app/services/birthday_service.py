@@ -3,10 +3,10 @@ from __future__ import annotations
 from datetime import date, timedelta
 from typing import List, Dict
 
-from app.data.employee_repository import EmployeeRepository
+from app.data.factory import get_employee_repository
 from app.core.enums import EmployeeStatus
 
-_repo = EmployeeRepository()
+_repo = get_employee_repository()
 
 
 def get_upcoming_birthdays(days_ahead: int = 1) -> List[Dict[str, str]]:
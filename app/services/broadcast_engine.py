@@ -0,0 +1,246 @@
+"""Concurrent, rate-limited delivery of broadcast messages.
+
+Telegram allows about 30 messages per second per bot and one message per
+second to the same chat; going faster returns ``RetryAfter`` (flood
+control). :class:`BroadcastEngine` sends to several chats at once while a
+global and a per-chat :class:`TokenBucket` keep the pace under those limits.
+A ``RetryAfter`` pauses every worker for the requested time, network errors
+are retried with exponential backoff and other errors fail the chat. A
+``TimedOut`` is not retried: Telegram may have delivered the message before
+the answer was lost, so the chat is marked ``unknown`` instead of risking a
+duplicate.
+
+With a :class:`BroadcastProgress` every finished chat is appended to a file,
+so running the same broadcast again only sends to the chats that were not
+reached yet; chats with an ``unknown`` result are not sent to again either.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from telegram.error import BadRequest, NetworkError, TimedOut
+
+from app.config import (
+    BROADCAST_CHAT_RATE,
+    BROADCAST_CONCURRENCY,
+    BROADCAST_MAX_RETRIES,
+    BROADCAST_RATE,
+)
+from app.utils.logger import log
+
+SENT = "sent"
+FAILED = "failed"
+UNKNOWN = "unknown"
+
+
+class MonotonicClock:
+    """Real time source; tests inject a fake with the same two methods."""
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    :meth:`reserve` always takes a token and returns how long the caller has
+    to wait for it, so concurrent callers queue up in call order.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: MonotonicClock) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock.monotonic()
+
+    def reserve(self) -> float:
+        now = self.clock.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            await self.clock.sleep(wait)
+
+
+@dataclass
+class DeliveryResult:
+    chat_id: str
+    status: str
+    error: Optional[str] = None
+    attempts: int = 0
+    resumed: bool = False
+
+
+class BroadcastProgress:
+    """Results of a broadcast appended to ``path`` as JSON lines.
+
+    Each finished chat adds one line; a later line for the same chat wins.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._results: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            try:
+                lines = self.path.read_text(encoding="utf-8").splitlines()
+            except OSError as exc:
+                log(f"⚠️ Ignoring unreadable broadcast progress {self.path}: {exc}")
+                lines = []
+            for line in lines:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    # a torn last line after a crash; that chat is sent again
+                    continue
+                if isinstance(result, dict) and result.get("chat_id") is not None:
+                    self._results[str(result["chat_id"])] = result
+
+    def status(self, chat_id: str) -> Optional[str]:
+        return self._results.get(chat_id, {}).get("status")
+
+    def record(self, result: DeliveryResult) -> None:
+        self._results[result.chat_id] = asdict(result)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+
+    def discard(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    # duck-typed so the telegram test stub can raise its own RetryAfter
+    value = getattr(exc, "retry_after", None)
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+class BroadcastEngine:
+    """Deliver one message per chat with bounded concurrency."""
+
+    def __init__(
+        self,
+        concurrency: int = BROADCAST_CONCURRENCY,
+        rate: float = BROADCAST_RATE,
+        chat_rate: float = BROADCAST_CHAT_RATE,
+        max_retries: int = BROADCAST_MAX_RETRIES,
+        backoff: float = 1.0,
+        clock: Optional[MonotonicClock] = None,
+        progress: Optional[BroadcastProgress] = None,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.chat_rate = chat_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.clock = clock or MonotonicClock()
+        self.progress = progress
+        # no burst: a full bucket plus a second of refill would exceed the limit
+        self._bucket = TokenBucket(rate, 1, self.clock)
+        self._chat_buckets: dict[str, TokenBucket] = {}
+        self._paused_until = 0.0
+
+    async def _wait_for_turn(self, chat_id: str) -> None:
+        while True:
+            pause = self._paused_until - self.clock.monotonic()
+            if pause <= 0:
+                break
+            await self.clock.sleep(pause)
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = self._chat_buckets[chat_id] = TokenBucket(
+                self.chat_rate, 1, self.clock
+            )
+        await bucket.acquire()
+        await self._bucket.acquire()
+
+    async def _deliver(
+        self, chat_id: str, send: Callable[[str], Awaitable[Any]]
+    ) -> DeliveryResult:
+        attempts = 0
+        while True:
+            await self._wait_for_turn(chat_id)
+            attempts += 1
+            try:
+                await send(chat_id)
+                return DeliveryResult(chat_id, SENT, attempts=attempts)
+            except Exception as exc:
+                retry_after = _retry_after(exc)
+                if isinstance(exc, TimedOut):
+                    # the message may have gone out; resending could duplicate it
+                    return DeliveryResult(chat_id, UNKNOWN, str(exc), attempts)
+                if attempts > self.max_retries:
+                    return DeliveryResult(chat_id, FAILED, str(exc), attempts)
+                if retry_after is not None:
+                    log(f"⏳ Flood control, pausing broadcast for {retry_after:.0f} s")
+                    self._paused_until = max(
+                        self._paused_until, self.clock.monotonic() + retry_after
+                    )
+                elif isinstance(exc, NetworkError) and not isinstance(exc, BadRequest):
+                    await self.clock.sleep(self.backoff * 2 ** (attempts - 1))
+                else:
+                    return DeliveryResult(chat_id, FAILED, str(exc), attempts)
+
+    async def run(
+        self,
+        chat_ids: Iterable[Any],
+        send: Callable[[str], Awaitable[Any]],
+        lead: bool = False,
+    ) -> list[DeliveryResult]:
+        """Call ``send(chat_id)`` for every chat and return results in order.
+
+        Chats already marked as sent or unknown in the progress file are
+        skipped. With
+        ``lead`` the first chat is served alone until a delivery succeeds,
+        so the others can reuse what it produced (e.g. an uploaded photo).
+        """
+        ordered = list(dict.fromkeys(str(c) for c in chat_ids))
+        results: dict[str, DeliveryResult] = {}
+        queue: asyncio.Queue[str] = asyncio.Queue()
+        for chat_id in ordered:
+            done = self.progress.status(chat_id) if self.progress is not None else None
+            if done in (SENT, UNKNOWN):
+                results[chat_id] = DeliveryResult(chat_id, done, resumed=True)
+            else:
+                queue.put_nowait(chat_id)
+
+        async def deliver(chat_id: str) -> DeliveryResult:
+            result = await self._deliver(chat_id, send)
+            results[chat_id] = result
+            if self.progress is not None:
+                self.progress.record(result)
+            return result
+
+        async def worker() -> None:
+            while True:
+                try:
+                    chat_id = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await deliver(chat_id)
+
+        while lead and not queue.empty():
+            if (await deliver(queue.get_nowait())).status == SENT:
+                break
+        workers = min(self.concurrency, queue.qsize())
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        sent = sum(1 for r in results.values() if r.status == SENT)
+        log(f"📨 Broadcast delivered to {sent} of {len(ordered)} chats")
+        return [results[chat_id] for chat_id in ordered]
@@ -2,11 +2,13 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List
 
-from app.data.employee_repository import EmployeeRepository
-from app.data.payout_repository import PayoutRepository
-from app.data.vacation_repository import VacationRepository
-from app.data.incentive_repository import IncentiveRepository
-from app.data.asset_repository import AssetRepository
+from app.data.factory import (
+    get_asset_repository,
+    get_employee_repository,
+    get_incentive_repository,
+    get_payout_repository,
+    get_vacation_repository,
+)
 from app.core.enums import EmployeeStatus, PAYOUT_STATUSES
 from app.core.constants import PAYOUT_METHODS, PAYOUT_TYPES
 
@@ -31,14 +33,14 @@ class DictionaryService:
         """Gather unique values from existing system records."""
         dynamic: Dict[str, List[str]] = {}
 
-        employees = EmployeeRepository().list_employees(archived=False)
+        employees = get_employee_repository().list_employees(archived=False)
         dynamic["positions"] = [e.position for e in employees if e.position]
         dynamic["work_places"] = [
             getattr(e, "work_place", "") for e in employees if getattr(e, "work_place", "")
         ]
         dynamic["employee_statuses"] = [e.status.value for e in employees]
 
-        payouts = PayoutRepository().load_all()
+        payouts = get_payout_repository().load_all()
         dynamic["payout_types"] = [
             p.get("payout_type") for p in payouts if p.get("payout_type")
         ]
@@ -49,15 +51,15 @@ class DictionaryService:
             p.get("status") for p in payouts if p.get("status")
         ]
 
-        vacations = VacationRepository().list()
+        vacations = get_vacation_repository().list()
         dynamic["vacation_types"] = [v.get("type") for v in vacations if v.get("type")]
 
-        incentives = IncentiveRepository().list()
+        incentives = get_incentive_repository().list()
         dynamic["incentive_types"] = [
             i.get("type") for i in incentives if i.get("type")
         ]
 
-        assets = AssetRepository().list()
+        assets = get_asset_repository().list()
         dynamic["asset_items"] = [
             a.get("item_name") for a in assets if a.get("item_name")
         ]
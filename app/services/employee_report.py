@@ -12,6 +12,7 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 import os
 
+from app.data.payout_index import datetime_epoch
 from app.utils.logger import log
 
 from typing import TYPE_CHECKING
@@ -33,24 +34,18 @@ class EmployeeReportService:
         self.payout_repo = payout_repo
         self.vacation_repo = vacation_repo
 
-    def _parse_ts(self, ts: str) -> datetime | None:
-        try:
-            return datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-        except Exception:
-            return None
-
     def generate_profile_pdf(self, employee_id: str) -> bytes:
         employees = self.employee_repo.list_employees(archived=None)
         employee = next((e for e in employees if str(e.id) == str(employee_id)), None)
         if not employee:
             raise HTTPException(status_code=404, detail="Employee not found")
 
-        cutoff = datetime.now() - relativedelta(months=3)
-        payouts = [
-            p
-            for p in self.payout_repo.list(employee_id=str(employee_id))
-            if (self._parse_ts(p.get("timestamp")) or datetime.min) >= cutoff
-        ]
+        cutoff = datetime_epoch(datetime.now() - relativedelta(months=3))
+        payouts = []
+        for p in self.payout_repo.list(employee_id=str(employee_id)):
+            epoch = self.payout_repo.timestamp_epoch(p)
+            if epoch is not None and epoch >= cutoff:
+                payouts.append(p)
         vacations = [
             v
             for v in self.vacation_repo.list()
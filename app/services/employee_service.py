@@ -1,23 +1,27 @@
 from __future__ import annotations
 
+import asyncio
 import shutil
+from dataclasses import asdict, replace
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
 from fastapi import HTTPException, UploadFile
 
 from app.core.enums import EmployeeStatus
 from app.core.types import Employee
 from app.data.employee_repository import EmployeeRepository
+from app.data.factory import get_employee_repository
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeOut
+from app.utils.executor import run_blocking
 
 
 class EmployeeService:
     """Service to manage employee data."""
 
     def __init__(self, repo: EmployeeRepository | None = None) -> None:
-        self._repo = repo or EmployeeRepository()
+        self._repo = repo or get_employee_repository()
         self._employees: List[Employee] = self._repo.list_employees(archived=None)
         self._counter = max(
             (int(
@@ -62,9 +66,11 @@ class EmployeeService:
             self,
             employee_id: str,
             **updates) -> Optional[Employee]:
-        emp = self.get_employee(employee_id)
-        if not emp:
+        current = self.get_employee(employee_id)
+        if not current:
             return None
+        # the repository caches employees; change a copy until it is saved
+        emp = replace(current)
         new_id = updates.pop("id", None)
         emp.status = self._normalize_status(getattr(emp, "status", None))
 
@@ -83,34 +89,40 @@ class EmployeeService:
             self._repo.add_employee(emp)
         else:
             self._repo.update_employee(emp)
+        self._replace(current, emp)
         return emp
 
     def archive_employee(self, employee_id: str) -> Optional[Employee]:
-        emp = self.get_employee(employee_id)
-        if not emp:
+        current = self.get_employee(employee_id)
+        if not current:
             return None
+        emp = replace(current)
         emp.status = self._normalize_status(getattr(emp, "status", None))
 
         if emp.status != EmployeeStatus.INACTIVE:
             raise ValueError("employee_not_inactive")
         if getattr(emp, "archived", False):
-            return emp
+            return current
         emp.archived = True
         emp.archived_at = datetime.utcnow()
         self._repo.update_employee(emp)
+        self._replace(current, emp)
         return emp
 
     def restore_employee(self, employee_id: str) -> Optional[Employee]:
-        emp = self.get_employee(employee_id)
-        if not emp:
+        current = self.get_employee(employee_id)
+        if not current:
             return None
-        if not getattr(emp, "archived", False):
-            return emp
-        emp.archived = False
-        emp.archived_at = None
+        if not getattr(current, "archived", False):
+            return current
+        emp = replace(current, archived=False, archived_at=None)
         self._repo.update_employee(emp)
+        self._replace(current, emp)
         return emp
 
+    def _replace(self, old: Employee, new: Employee) -> None:
+        self._employees = [new if e is old else e for e in self._employees]
+
     def remove_employee(self, employee_id: str) -> None:
         self._employees = [e for e in self._employees if e.id != employee_id]
         self._repo.delete_employee_by_id(employee_id)
@@ -127,10 +139,15 @@ class EmployeeAPIService:
 
     def __init__(self, service: EmployeeService) -> None:
         self.service = service
+        # writes go to the repository from executor threads, one at a time
+        self._write_lock = asyncio.Lock()
+
+    async def _write(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await run_blocking(func, *args, lock=self._write_lock, **kwargs)
 
     async def list_employees(self, archived: bool | None = False) -> list[EmployeeOut]:
         employees = self.service.list_employees(archived=archived)
-        return [EmployeeOut(**e.__dict__) for e in employees]
+        return [EmployeeOut(**asdict(e)) for e in employees]
 
     async def create_employee(self, data: EmployeeCreate) -> EmployeeOut:
         employee = Employee(
@@ -153,41 +170,43 @@ class EmployeeAPIService:
             archived_at=data.archived_at,
         )
         try:
-            created = self.service.add_employee(employee)
+            created = await self._write(self.service.add_employee, employee)
         except ValueError:
             raise HTTPException(status_code=400, detail="Employee already exists")
-        return EmployeeOut(**created.__dict__)
+        return EmployeeOut(**asdict(created))
 
     async def update_employee(
             self,
             employee_id: str,
             data: EmployeeUpdate) -> EmployeeOut:
         try:
-            emp = self.service.update_employee(
-                employee_id, **data.dict(exclude_unset=True)
+            emp = await self._write(
+                self.service.update_employee,
+                employee_id,
+                **data.dict(exclude_unset=True),
             )
         except ValueError:
             raise HTTPException(status_code=400, detail="Employee already exists")
         if not emp:
             raise HTTPException(status_code=404, detail="Employee not found")
-        return EmployeeOut(**emp.__dict__)
+        return EmployeeOut(**asdict(emp))
 
     async def archive_employee(self, employee_id: str) -> EmployeeOut:
         try:
-            emp = self.service.archive_employee(employee_id)
+            emp = await self._write(self.service.archive_employee, employee_id)
         except ValueError as exc:
             if str(exc) == "employee_not_inactive":
                 raise HTTPException(status_code=400, detail="only_inactive_can_be_archived")
             raise
         if not emp:
             raise HTTPException(status_code=404, detail="Employee not found")
-        return EmployeeOut(**emp.__dict__)
+        return EmployeeOut(**asdict(emp))
 
     async def restore_employee(self, employee_id: str) -> EmployeeOut:
-        emp = self.service.restore_employee(employee_id)
+        emp = await self._write(self.service.restore_employee, employee_id)
         if not emp:
             raise HTTPException(status_code=404, detail="Employee not found")
-        return EmployeeOut(**emp.__dict__)
+        return EmployeeOut(**asdict(emp))
 
     async def upload_employee_photo(
             self, employee_id: str, file: UploadFile) -> dict[str, str]:
@@ -195,22 +214,29 @@ class EmployeeAPIService:
         if not emp:
             raise HTTPException(status_code=404, detail="Employee not found")
         upload_path = Path(f"static/uploads/employees/{employee_id}.jpg")
-        upload_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(upload_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        self.service.update_employee(
-            employee_id, photo_url="/" + str(upload_path))
+        await run_blocking(self._save_photo, file, upload_path)
+        await self._write(
+            self.service.update_employee,
+            employee_id,
+            photo_url="/" + str(upload_path),
+        )
         return {"status": "photo_uploaded", "url": "/" + str(upload_path)}
 
     async def delete_employee(self, employee_id: str) -> dict[str, str]:
         emp = self.service.get_employee(employee_id)
         if not emp:
             raise HTTPException(status_code=404, detail="Employee not found")
-        self.service.remove_employee(employee_id)
+        await self._write(self.service.remove_employee, employee_id)
         return {"status": "deleted"}
 
+    @staticmethod
+    def _save_photo(file: UploadFile, upload_path: Path) -> None:
+        upload_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(upload_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+
     async def export_employees_pdf(self) -> bytes:
         employees = self.service.list_employees()
         from app.services.pdf_profile import generate_employees_list_pdf
 
-        return generate_employees_list_pdf(employees)
+        return await run_blocking(generate_employees_list_pdf, employees)
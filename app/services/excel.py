@@ -1,17 +1,20 @@
 from __future__ import annotations
 
-import json
 import os
 import re
 import textwrap
+import threading
 from datetime import datetime
 
 import pandas as pd
 from fpdf import FPDF
-from openpyxl import load_workbook
+from openpyxl.utils.cell import coordinate_from_string
 
-from ..config import ADVANCE_REQUESTS_FILE, EXCEL_FILE
+from ..config import EXCEL_FILE
+from ..data.factory import get_payout_repository
+from ..data.payout_index import datetime_epoch
 from ..utils.logger import log
+from .workbook_cache import get_workbook_cache
 
 
 def unmerge_cells(sheet):
@@ -28,23 +31,23 @@ def unmerge_cells(sheet):
     return sheet
 
 
+# строка DataFrame с индексом 0 соответствует третьей строке листа
+COMMENT_ROW_OFFSET = 3
+
+
 def get_cell_comment(sheet_name, row_index, column_letter):
     """Получает примечание из указанной ячейки Excel."""
     if not os.path.exists(EXCEL_FILE):
         log(f"❌ Error: File {EXCEL_FILE} not found!")
         return "File error"
     try:
-        workbook = load_workbook(EXCEL_FILE, data_only=False)
-        if sheet_name not in workbook.sheetnames:
+        comments = get_workbook_cache().comments(EXCEL_FILE, sheet_name)
+        if comments is None:
             log(f"❌ Error: Sheet {sheet_name} not found!")
             return "Sheet error"
-        sheet = workbook[sheet_name]
-        cell_ref = f"{column_letter}{row_index + 3}"
-        cell = sheet[cell_ref]
-        if cell.comment:
-            return cell.comment.text.strip()
-        else:
-            return "No comment"
+        return comments.get(
+            f"{column_letter}{row_index + COMMENT_ROW_OFFSET}", "No comment"
+        )
     except Exception as e:
         log(
             f"❌ Error loading comment from {column_letter}{row_index + 1}: {e}"
@@ -52,6 +55,33 @@ def get_cell_comment(sheet_name, row_index, column_letter):
         return "Error"
 
 
+def get_sheet_comments(sheet_name, columns=None):
+    """
+    Возвращает все примечания листа за один проход по книге.
+    :param sheet_name: Название листа (месяц).
+    :param columns: Буквы столбцов, которыми ограничить выборку, или None.
+    :return: {(номер строки Excel, буква столбца): текст} или None при ошибке.
+    """
+    if not os.path.exists(EXCEL_FILE):
+        log(f"❌ Error: File {EXCEL_FILE} not found!")
+        return None
+    try:
+        comments = get_workbook_cache().comments(EXCEL_FILE, sheet_name)
+    except Exception as e:
+        log(f"❌ Error loading comments from {sheet_name}: {e}")
+        return None
+    if comments is None:
+        log(f"❌ Error: Sheet {sheet_name} not found!")
+        return None
+    wanted = set(columns) if columns else None
+    result = {}
+    for coordinate, text in comments.items():
+        column, row = coordinate_from_string(coordinate)
+        if wanted is None or column in wanted:
+            result[(row, column)] = text
+    return result
+
+
 def load_data(sheet_name=None):
     """
     Загружает данные из Excel.
@@ -63,21 +93,22 @@ def load_data(sheet_name=None):
         return None
 
     try:
-        xls = pd.ExcelFile(EXCEL_FILE)
+        cache = get_workbook_cache()
+        sheet_names = cache.sheet_names(EXCEL_FILE)
         log(
-            f"📂 Доступные листы в файле: {xls.sheet_names}"
+            f"📂 Доступные листы в файле: {sheet_names}"
         )  # ✅ Логируем все листы
 
         if sheet_name is None:
-            return xls.sheet_names  # Если `None`, возвращаем список листов
+            return sheet_names  # Если `None`, возвращаем список листов
 
-        if sheet_name not in xls.sheet_names:
+        if sheet_name not in sheet_names:
             log(
-                f"❌ Ошибка: Лист '{sheet_name}' не найден! Доступные листы: {xls.sheet_names}"
+                f"❌ Ошибка: Лист '{sheet_name}' не найден! Доступные листы: {sheet_names}"
             )
             return None
 
-        return pd.read_excel(xls, sheet_name=sheet_name, header=1)
+        return cache.dataframe(EXCEL_FILE, sheet_name, header=1)
     except Exception as e:
         log(f"❌ Ошибка при загрузке Excel: {e}")
         return None
@@ -111,6 +142,21 @@ def clean_line(text: str) -> str:
     return re.sub(r"[^\x00-\x7Fа-яА-ЯёЁ0-9\s.,!?@\-:;()|₽💳🏠✅❌]+", "", text)
 
 
+_payout_repo = None
+_payout_repo_lock = threading.Lock()
+
+
+def _default_payout_repository():
+    """Return the payout repository shared by callers that pass none."""
+    global _payout_repo
+    with _payout_repo_lock:
+        if _payout_repo is None:
+            _payout_repo = get_payout_repository()
+        else:
+            _payout_repo.reload()
+        return _payout_repo
+
+
 def export_advances_to_pdf(
     filter_type=None,
     status=None,
@@ -119,10 +165,14 @@ def export_advances_to_pdf(
     after_date=None,
     before_date=None,
     filename="advance_report.pdf",
+    repo=None,
+    data=None,
 ):
+    """Render payouts to a PDF; ``data`` defaults to every row of ``repo``."""
     try:
-        with open(ADVANCE_REQUESTS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        repo = repo or _default_payout_repository()
+        if data is None:
+            data = repo.load_all()
     except Exception as e:
         log(f"❌ Ошибка чтения файла: {e}")
         return None
@@ -131,6 +181,15 @@ def export_advances_to_pdf(
         log("⚠️ Нет данных для экспорта.")
         return None
 
+    def parse_bound(value):
+        try:
+            return datetime_epoch(datetime.strptime(value, "%Y-%m-%d"))
+        except Exception:
+            return None
+
+    after_epoch = parse_bound(after_date) if after_date else None
+    before_epoch = parse_bound(before_date) if before_date else None
+
     # Фильтрация по параметрам
     def match_filters(entry):
         if filter_type and entry.get("payout_type") != filter_type:
@@ -141,24 +200,14 @@ def export_advances_to_pdf(
             return False
         if method and entry.get("method") != method:
             return False
-        if after_date:
-            ts = entry.get("timestamp")
-            if ts:
-                try:
-                    dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-                    if dt < datetime.strptime(after_date, "%Y-%m-%d"):
-                        return False
-                except Exception:
-                    return False
-        if before_date:
-            ts = entry.get("timestamp")
-            if ts:
-                try:
-                    dt = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
-                    if dt > datetime.strptime(before_date, "%Y-%m-%d"):
-                        return False
-                except Exception:
-                    return False
+        if (after_date or before_date) and entry.get("timestamp"):
+            epoch = repo.timestamp_epoch(entry)
+            if epoch is None:
+                return False
+            if after_date and (after_epoch is None or epoch < after_epoch):
+                return False
+            if before_date and (before_epoch is None or epoch > before_epoch):
+                return False
         return True
 
     data = [d for d in data if match_filters(d)]
@@ -0,0 +1,237 @@
+"""Columnar snapshots of workbook sheets shared by every process.
+
+Each parsed sheet is written once per workbook version to
+``EXCEL_SNAPSHOT_DIR/<workbook>-<mtime_ns>-<size>/<sheet key>/``: numeric and
+datetime columns become ``.npy`` files that are memory-mapped on load, the
+remaining columns and the column labels go to ``schema.json``. A saved
+workbook gets a new version directory, so snapshots never go stale; when a
+new one is written, every version but it and the previous one is removed.
+
+Build the snapshots of every sheet ahead of time with::
+
+    python -m app.services.excel_snapshot
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import date, datetime, time, timedelta
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from ..config import EXCEL_FILE, EXCEL_SNAPSHOT_DIR
+from ..utils.logger import log
+
+FORMAT_VERSION = 1
+# dtype kinds that ``np.load(mmap_mode="r")`` can map directly
+_MAPPABLE_KINDS = "biufcmM"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, timedelta):
+        return {"$timedelta": value.total_seconds()}
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$datetime" in value:
+            return datetime.fromisoformat(value["$datetime"])
+        if "$date" in value:
+            return date.fromisoformat(value["$date"])
+        if "$time" in value:
+            return time.fromisoformat(value["$time"])
+        if "$timedelta" in value:
+            return timedelta(seconds=value["$timedelta"])
+    return value
+
+
+def _sheet_key(sheet: str, header: Optional[int]) -> str:
+    return hashlib.sha1(f"{sheet}\0{header}".encode("utf-8")).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """Reads and writes sheet snapshots below ``root``."""
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def version_dir(self, path: str) -> str:
+        st = os.stat(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.root, f"{name}-{st.st_mtime_ns}-{st.st_size}")
+
+    # ------------------------------------------------------------------
+    # reading
+    # ------------------------------------------------------------------
+    def load(self, path: str, sheet: str, header: Optional[int]) -> Optional[pd.DataFrame]:
+        """Return the snapshot of ``sheet`` or ``None`` when there is none."""
+        target = os.path.join(self.version_dir(path), _sheet_key(sheet, header))
+        try:
+            with open(os.path.join(target, "schema.json"), encoding="utf-8") as fh:
+                schema = json.load(fh)
+        except FileNotFoundError:
+            return None
+        if schema.get("format") != FORMAT_VERSION:
+            return None
+        columns = {}
+        for i, column in enumerate(schema["columns"]):
+            if "file" in column:
+                data = np.load(os.path.join(target, column["file"]), mmap_mode="r")
+                columns[i] = pd.Series(data, copy=False)
+            else:
+                values = np.empty(schema["rows"], dtype=object)
+                values[:] = [_decode(v) for v in column["values"]]
+                series = pd.Series(values, copy=False)
+                if column["dtype"] != "object":
+                    series = series.astype(column["dtype"])
+                columns[i] = series
+        df = pd.DataFrame(columns, copy=False)
+        if not columns:
+            df = pd.DataFrame(index=pd.RangeIndex(schema["rows"]))
+        df.columns = pd.Index(
+            [_decode(c["label"]) for c in schema["columns"]],
+            dtype=schema["labels_dtype"],
+        )
+        return df
+
+    def sheet_names(self, path: str) -> Optional[list[str]]:
+        try:
+            with open(
+                os.path.join(self.version_dir(path), "sheets.json"), encoding="utf-8"
+            ) as fh:
+                return json.load(fh)
+        except FileNotFoundError:
+            return None
+
+    # ------------------------------------------------------------------
+    # writing
+    # ------------------------------------------------------------------
+    def _publish(self, version: str, name: str, write) -> None:
+        """Write into a temporary directory and rename it into ``version``."""
+        os.makedirs(version, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".tmp-", dir=version)
+        try:
+            write(tmp)
+            os.replace(tmp, os.path.join(version, name))
+        except OSError:
+            # another process published the same snapshot first
+            shutil.rmtree(tmp, ignore_errors=True)
+        self._drop_old_versions(version)
+
+    def _drop_old_versions(self, current: str) -> None:
+        """Remove versions older than the one before ``current``.
+
+        The previous version is kept because processes that have not noticed
+        the new workbook yet may still have its columns memory-mapped.
+        """
+        name = os.path.basename(current).rsplit("-", 2)[0]
+        older = []
+        for entry in os.listdir(self.root):
+            full = os.path.join(self.root, entry)
+            parts = entry.rsplit("-", 2)
+            if full != current and parts[0] == name and os.path.isdir(full):
+                mtime = int(parts[1]) if len(parts) == 3 and parts[1].isdigit() else 0
+                older.append((mtime, full))
+        older.sort()
+        for _, full in older[:-1]:
+            try:
+                shutil.rmtree(full)
+            except OSError as e:
+                # still mapped by a slow reader; the next new version retries
+                log(f"⚠️ Failed to remove snapshot {full}: {e}")
+
+    def save(self, path: str, sheet: str, header: Optional[int], df: pd.DataFrame) -> None:
+        def write(target: str) -> None:
+            columns = []
+            for i, label in enumerate(df.columns):
+                series = df.iloc[:, i]
+                column: dict[str, Any] = {"label": _encode(label), "dtype": str(series.dtype)}
+                if isinstance(series.dtype, np.dtype) and series.dtype.kind in _MAPPABLE_KINDS:
+                    column["file"] = f"{i}.npy"
+                    np.save(os.path.join(target, column["file"]), series.to_numpy())
+                else:
+                    column["values"] = [_encode(v) for v in series.astype(object)]
+                columns.append(column)
+            schema = {
+                "format": FORMAT_VERSION,
+                "sheet": sheet,
+                "header": header,
+                "rows": len(df),
+                "labels_dtype": str(df.columns.dtype),
+                "columns": columns,
+            }
+            with open(os.path.join(target, "schema.json"), "w", encoding="utf-8") as fh:
+                json.dump(schema, fh, ensure_ascii=False)
+
+        self._publish(self.version_dir(path), _sheet_key(sheet, header), write)
+
+    def save_sheet_names(self, path: str, names: list[str]) -> None:
+        version = self.version_dir(path)
+        os.makedirs(version, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=version)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(names, fh, ensure_ascii=False)
+        os.replace(tmp, os.path.join(version, "sheets.json"))
+        self._drop_old_versions(version)
+
+    def build(self, path: str, headers: tuple[Optional[int], ...] = (1, None)) -> int:
+        """Snapshot every sheet of ``path`` for ``headers`` and return the count."""
+        wb = load_workbook(path, read_only=True)
+        try:
+            names = list(wb.sheetnames)
+        finally:
+            wb.close()
+        self.save_sheet_names(path, names)
+        count = 0
+        for sheet in names:
+            for header in headers:
+                if self.load(path, sheet, header) is None:
+                    df = pd.read_excel(path, sheet_name=sheet, header=header)
+                    self.save(path, sheet, header, df)
+                    count += 1
+        return count
+
+
+_store_instance: SnapshotStore | None = None
+
+
+def get_snapshot_store() -> SnapshotStore | None:
+    """Return the shared store, or ``None`` when snapshots are disabled."""
+    global _store_instance
+    if not EXCEL_SNAPSHOT_DIR:
+        return None
+    if _store_instance is None:
+        _store_instance = SnapshotStore(EXCEL_SNAPSHOT_DIR)
+    return _store_instance
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workbook", default=EXCEL_FILE)
+    parser.add_argument("--snapshot-dir", default=EXCEL_SNAPSHOT_DIR or ".excel_snapshot")
+    args = parser.parse_args(argv)
+    count = SnapshotStore(args.snapshot_dir).build(args.workbook)
+    log(f"✅ Snapshots written: {count}")
+
+
+if __name__ == "__main__":
+    main()
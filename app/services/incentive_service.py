@@ -1,12 +1,20 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, Callable, List, Optional
 
 from app.schemas.incentive import Incentive, IncentiveCreate, IncentiveUpdate
+from app.data.factory import get_incentive_repository
 from app.data.incentive_repository import IncentiveRepository
+from app.utils.executor import run_blocking
 
 
 class IncentiveService:
     def __init__(self, repo: Optional[IncentiveRepository] = None) -> None:
-        self._repo = repo or IncentiveRepository()
+        self._repo = repo or get_incentive_repository()
+        self._repo_lock = asyncio.Lock()
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run repository work in the executor, one call at a time."""
+        return await run_blocking(func, *args, lock=self._repo_lock)
 
     async def list_incentives(
         self,
@@ -15,19 +23,21 @@ class IncentiveService:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
     ) -> List[Incentive]:
-        rows = self._repo.list(employee_id, typ, date_from, date_to)
+        rows = await self._run(self._repo.list, employee_id, typ, date_from, date_to)
         return [Incentive(**r) for r in rows]
 
     async def create_incentive(self, data: IncentiveCreate) -> Incentive:
-        created = self._repo.create(data.model_dump())
+        created = await self._run(self._repo.create, data.model_dump())
         return Incentive(**created)
 
     async def update_incentive(self, item_id: str, data: IncentiveUpdate) -> Optional[Incentive]:
-        updated = self._repo.update(item_id, data.model_dump(exclude_none=True))
+        updated = await self._run(
+            self._repo.update, item_id, data.model_dump(exclude_none=True)
+        )
         return Incentive(**updated) if updated else None
 
     async def delete_incentive(self, item_id: str) -> bool:
-        return self._repo.delete(item_id)
+        return await self._run(self._repo.delete, item_id)
 
     def get_incentive_employee(self, item_id: str) -> Optional[str]:
         for item in self._repo.list():
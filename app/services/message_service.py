@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from app.schemas.message import MessageRequest, MessageOut
 from app.data.message_repository import MessageRepository
 from app.data.employee_repository import EmployeeRepository
+from app.data.factory import get_employee_repository, get_message_repository
+from app.data.timeline_index import decode_cursor, encode_cursor
 from .telegram_service import TelegramService
 
 
@@ -12,12 +14,31 @@ class MessageService:
             self,
             repo: Optional[MessageRepository] = None,
             employee_repo: Optional[EmployeeRepository] = None) -> None:
-        self._repo = repo or MessageRepository()
-        self._employees = employee_repo or EmployeeRepository()
+        self._repo = repo or get_message_repository()
+        self._employees = employee_repo or get_employee_repository()
         self._telegram = TelegramService(self._employees)
 
-    async def list_messages(self) -> List[MessageOut]:
-        return [MessageOut(**m) for m in self._repo.list()]
+    async def page_messages(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        user_id: Optional[str] = None,
+        accepted: Optional[bool] = None,
+    ) -> Tuple[List[MessageOut], Optional[str]]:
+        """Return a page of messages newest first and the next page cursor.
+
+        Raises ``ValueError`` for a malformed ``cursor``.
+        """
+        items, next_key = self._repo.page(
+            limit,
+            decode_cursor(cursor) if cursor else None,
+            user_id=user_id,
+            accepted=accepted,
+        )
+        return (
+            [MessageOut(**m) for m in items],
+            encode_cursor(next_key) if next_key else None,
+        )
 
     async def send_message(self, data: MessageRequest) -> MessageOut:
         message_id = await self._telegram.send_message_to_user(
@@ -53,8 +74,8 @@ class MessageService:
 
     @staticmethod
     def accept_by_details(user_id: str, message_id: int) -> None:
-        MessageRepository().accept_by_details(user_id, message_id)
+        get_message_repository().accept_by_details(user_id, message_id)
 
     @staticmethod
     def mark_message_as_accepted(msg_id: str) -> None:
-        MessageRepository().accept(msg_id)
+        get_message_repository().accept(msg_id)
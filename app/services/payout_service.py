@@ -1,14 +1,25 @@
+import asyncio
+from bisect import bisect_left
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from app.schemas.payout import Payout, PayoutCreate, PayoutUpdate
+from app.data.factory import get_payout_repository
 from app.data.payout_repository import PayoutRepository
+from app.data.records import field_reader
 from .telegram_service import TelegramService
 from app.core.enums import PAYOUT_STATUSES
+from app.utils.executor import run_blocking
 
 import logging
 from pathlib import Path
 
+_read_owner = field_reader("id", "user_id")
+_read_status = field_reader("status")
+_read_control = field_reader(
+    "id", "user_id", "name", "amount", "timestamp", "status", "payout_type", "method", "bank"
+)
+
 logger = logging.getLogger("payout_actions")
 if not logger.handlers:
     Path("logs").mkdir(exist_ok=True)
@@ -25,8 +36,26 @@ class PayoutService:
         repo: Optional[PayoutRepository] = None,
         telegram_service: Optional["TelegramService"] = None,
     ) -> None:
-        self._repo = repo or PayoutRepository()
+        self._repo = repo or get_payout_repository()
         self._telegram = telegram_service
+        # the repository is reloaded and changed from executor threads; waiting
+        # for it on the loop keeps queued calls from holding pool threads
+        self._repo_lock = asyncio.Lock()
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Reload the repository and run ``func`` in the executor, one call at a time."""
+        return await run_blocking(
+            self._reloaded,
+            func,
+            *args,
+            label=func.__qualname__,
+            lock=self._repo_lock,
+            **kwargs,
+        )
+
+    def _reloaded(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        self._repo.reload()
+        return func(*args, **kwargs)
 
     @staticmethod
     def _serialize_timestamp(value: datetime | str) -> str:
@@ -52,19 +81,20 @@ class PayoutService:
         method: Optional[str] = None,
         from_date: Optional[str] = None,
         to_date: Optional[str] = None,
+        user_ids: Optional[Iterable[str]] = None,
     ) -> List[Payout]:
-        self._repo.reload()
-        rows = self._repo.list(
+        rows = await self._run(
+            self._repo.list,
             employee_id,
             payout_type,
             status,
             method,
             from_date,
-            to_date)
+            to_date,
+            user_ids=user_ids)
         return [Payout(**r) for r in rows]
 
     async def create_payout(self, data: PayoutCreate) -> Payout:
-        self._repo.reload()
         payout_dict: Dict = {
             "user_id": data.user_id,
             "name": data.name,
@@ -81,7 +111,7 @@ class PayoutService:
         }
         timestamp_value = data.timestamp or datetime.now()
         payout_dict["timestamp"] = self._serialize_timestamp(timestamp_value)
-        created = self._repo.create(payout_dict)
+        created = await self._run(self._repo.create, payout_dict)
         logger.info(
             f"🆕 Выплата '{created['payout_type']}' на {created['amount']} ₽ для user_id {created['user_id']} — статус: {created['status']}"
         )
@@ -97,14 +127,13 @@ class PayoutService:
         payout_id: str,
         update: PayoutUpdate,
     ) -> Optional[Payout]:
-        self._repo.reload()
         updates = update.model_dump(exclude_none=True)
         notify = updates.pop("notify_user", True)
         if "timestamp" in updates:
             updates["timestamp"] = self._serialize_timestamp(updates["timestamp"])
         if not updates:
             return None
-        updated = self._repo.update(payout_id, updates)
+        updated = await self._run(self._repo.update, payout_id, updates)
         if not updated:
             return None
         if "status" in updates:
@@ -133,8 +162,9 @@ class PayoutService:
     async def update_status(
         self, payout_id: str, status: str, notify: bool = True
     ) -> Optional[Payout]:
-        self._repo.reload()
-        updated = self._repo.update(payout_id, {"status": status})
+        updated = await self._run(
+            self._repo.update, payout_id, {"status": status}
+        )
         if not updated:
             return None
         logger.info(
@@ -158,35 +188,32 @@ class PayoutService:
     async def delete_payouts(self, ids: List[str]) -> None:
         if not ids:
             return
-        self._repo.reload()
-        self._repo.delete_many(ids)
+        await self._run(self._repo.delete_many, ids)
         logger.info(f"🗑 Удалены выплаты: {', '.join(ids)}")
 
     async def delete_payout(self, payout_id: str) -> bool:
-        self._repo.reload()
-        deleted = self._repo.delete(payout_id)
+        deleted = await self._run(self._repo.delete, payout_id)
         if deleted:
             logger.info(f"🗑 Удалена выплата {payout_id}")
         return deleted
 
-    def get_payout_employee(self, payout_id: str) -> Optional[str]:
+    async def get_payout_employee(self, payout_id: str) -> Optional[str]:
         """Return employee identifier associated with the payout."""
-        self._repo.reload()
+        return await self._run(self._payout_employee, payout_id)
+
+    def _payout_employee(self, payout_id: str) -> Optional[str]:
+        payout_id = str(payout_id)
         for item in self._repo.load_all():
-            if str(item.get("id")) == str(payout_id):
-                user_id = item.get("user_id")
+            item_id, user_id = _read_owner(item)
+            if str(item_id) == payout_id:
                 return str(user_id) if user_id is not None else None
         return None
 
     async def list_active_payouts(self) -> List[Payout]:
         """Return payouts that are pending approval or already approved."""
-        self._repo.reload()
-        rows = self._repo.load_all()
-        active = [
-            r
-            for r in rows
-            if r.get("status") in PAYOUT_STATUSES[:2]
-        ]
+        rows = await self._run(self._repo.load_all)
+        statuses = PAYOUT_STATUSES[:2]
+        active = [r for r in rows if _read_status(r)[0] in statuses]
         return [Payout(**r) for r in active]
 
     async def export_to_pdf(
@@ -199,16 +226,12 @@ class PayoutService:
         to_date: Optional[str] = None,
     ) -> Optional[str]:
         from app.services.excel import export_advances_to_pdf
-        self._repo.reload()
-
-        name = None
-        if employee_id:
-            rows = self._repo.list(employee_id=employee_id)
-            if rows:
-                name = rows[0].get("name")
 
+        name, rows = await self._run(self._export_rows, employee_id)
         filename = f"payouts_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        return export_advances_to_pdf(
+        # only the reload needs the lock; rendering can take a while
+        return await run_blocking(
+            export_advances_to_pdf,
             filter_type=payout_type,
             status=status,
             name=name,
@@ -216,8 +239,32 @@ class PayoutService:
             after_date=from_date,
             before_date=to_date,
             filename=filename,
+            repo=self._repo,
+            data=rows,
         )
 
+    def _export_rows(
+        self, employee_id: Optional[str]
+    ) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """Return the employee name for ``employee_id`` and a copy of all rows."""
+        name = None
+        if employee_id:
+            rows = self._repo.list(employee_id=employee_id)
+            if rows:
+                name = rows[0].get("name")
+        return name, self._repo.load_all()
+
+    def _request_epochs(self, rows: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+        """Return sorted request epochs per employee."""
+        epochs: Dict[str, List[int]] = {}
+        for r in rows:
+            r_epoch = self._repo.timestamp_epoch(r)
+            if r_epoch is not None:
+                epochs.setdefault(str(r.get("user_id")), []).append(r_epoch)
+        for values in epochs.values():
+            values.sort()
+        return epochs
+
     async def list_control(
         self,
         date_from: Optional[str] = None,
@@ -227,13 +274,36 @@ class PayoutService:
         employee_id: Optional[str] = None,
         department: Optional[str] = None,
         status: Optional[str] = None,
+        user_ids: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self._run(
+            self._control_rows,
+            date_from,
+            date_to,
+            payout_type,
+            method,
+            employee_id,
+            department,
+            status,
+            user_ids,
+        )
+
+    def _control_rows(
+        self,
+        date_from: Optional[str],
+        date_to: Optional[str],
+        payout_type: Optional[str],
+        method: Optional[str],
+        employee_id: Optional[str],
+        department: Optional[str],
+        status: Optional[str],
+        user_ids: Optional[Iterable[str]],
     ) -> List[Dict[str, Any]]:
         from datetime import datetime, timedelta
         from app.config import MAX_ADVANCE_AMOUNT_PER_MONTH
+        from app.data.payout_index import epoch_to_datetime
         from app.services.users import load_users_map
 
-        self._repo.reload()
-
         all_rows = self._repo.load_all()
         rows = self._repo.list(
             employee_id,
@@ -242,50 +312,51 @@ class PayoutService:
             method,
             date_from,
             date_to,
+            user_ids=user_ids,
         )
         users = load_users_map()
         now = datetime.now()
         result: List[Dict[str, Any]] = []
+        epochs = self._request_epochs(all_rows)
+        window = 3 * 24 * 3600
 
         for item in rows:
-            uid = str(item.get("user_id"))
-            ts_str = item.get("timestamp")
-            ts = None
-            if ts_str:
-                try:
-                    ts = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    pass
+            (
+                item_id,
+                user_id,
+                name,
+                amount,
+                ts_str,
+                item_status,
+                item_type,
+                item_method,
+                bank,
+            ) = _read_control(item)
+            uid = str(user_id)
+            epoch = self._repo.timestamp_epoch(item)
+            ts = epoch_to_datetime(epoch) if epoch is not None else None
             user = users.get(uid, {})
             is_active = user.get("status", "active") == "active"
             warnings: list[str] = []
 
-            # monthly total
+            # monthly total and requests in the 3 days before this one
             monthly_total = 0.0
             prev_count = 0
-            for r in all_rows:
-                if str(r.get("user_id")) != uid:
-                    continue
-                r_ts_str = r.get("timestamp")
-                if not r_ts_str:
-                    continue
-                try:
-                    r_ts = datetime.strptime(r_ts_str, "%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    continue
-                if ts and r_ts.year == ts.year and r_ts.month == ts.month:
-                    monthly_total += float(r.get("amount") or 0)
-                if ts and 0 < (ts - r_ts).total_seconds() <= 3 * 24 * 3600:
-                    prev_count += 1
+            if ts:
+                monthly_total = self._repo.monthly_total(uid, ts.strftime("%Y-%m"))
+                user_epochs = epochs.get(uid, [])
+                prev_count = bisect_left(user_epochs, epoch) - bisect_left(
+                    user_epochs, epoch - window
+                )
 
             if monthly_total > MAX_ADVANCE_AMOUNT_PER_MONTH:
                 warnings.append("limit_exceeded")
-            if item.get("status") == PAYOUT_STATUSES[0] and ts:
+            if item_status == PAYOUT_STATUSES[0] and ts:
                 if now - ts > timedelta(hours=48):
                     warnings.append("pending_too_long")
             if prev_count > 0:
                 warnings.append("frequent_request")
-            if user and user.get("bank") and item.get("bank") != user.get("bank"):
+            if user and user.get("bank") and bank != user.get("bank"):
                 warnings.append("changed_bank_data")
             if item.get("is_manual"):
                 warnings.append("manual_created")
@@ -294,14 +365,14 @@ class PayoutService:
 
             result.append(
                 {
-                    "id": str(item.get("id")),
+                    "id": str(item_id),
                     "user_id": uid,
-                    "name": item.get("name"),
-                    "amount": float(item.get("amount") or 0),
+                    "name": name,
+                    "amount": float(amount or 0),
                     "date": ts_str,
-                    "status": item.get("status"),
-                    "type": item.get("payout_type"),
-                    "method": item.get("method"),
+                    "status": item_status,
+                    "type": item_type,
+                    "method": item_method,
                     "warnings": warnings,
                     "is_manual": bool(item.get("is_manual")),
                     "is_employee_active": is_active,
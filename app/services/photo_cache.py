@@ -0,0 +1,60 @@
+"""Persistent map of photo URLs to the Telegram ``file_id`` of the upload.
+
+Sending a ``file_id`` lets Telegram reuse the stored photo instead of
+fetching the URL again for every recipient.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from app.utils.logger import log
+
+
+def photo_file_id(message: Any) -> Optional[str]:
+    """Return the ``file_id`` of the largest photo in a sent ``message``."""
+    sizes = getattr(message, "photo", None)
+    if not sizes:
+        return None
+    return getattr(sizes[-1], "file_id", None)
+
+
+class PhotoFileIdCache:
+    """``{url: file_id}`` kept in memory and mirrored to a JSON file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._ids: dict[str, str] = {}
+        if self.path.exists():
+            try:
+                self._ids = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as exc:
+                log(f"⚠️ Ignoring unreadable photo cache {self.path}: {exc}")
+
+    def get(self, url: str) -> Optional[str]:
+        return self._ids.get(url)
+
+    def remember(self, url: str, message: Any) -> None:
+        file_id = photo_file_id(message)
+        if file_id and self._ids.get(url) != file_id:
+            with self._lock:
+                self._ids[url] = file_id
+                self._save()
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            if self._ids.pop(url, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=self.path.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(self._ids, fh, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
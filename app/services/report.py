@@ -1,6 +1,9 @@
 import pandas as pd
 from pandas import DataFrame
-from .excel import get_cell_comment
+from .excel import COMMENT_ROW_OFFSET, get_sheet_comments
+
+# столбцы с пояснениями к авансу, удержанию и бонусу
+COMMENT_COLUMNS = ("CM", "CI", "CA")
 
 
 def generate_employee_report(
@@ -33,6 +36,13 @@ def generate_employee_report(
             return str(value)
         return "Нет данных"
 
+    comments = get_sheet_comments(month, COMMENT_COLUMNS)
+
+    def get_comment(column: str) -> str:
+        if comments is None:
+            return "Error"
+        return comments.get((row_index + COMMENT_ROW_OFFSET, column), "No comment")
+
     def format_kpi(value, num1, text1, num2, text2):
         try:
             value = float(value)
@@ -97,8 +107,8 @@ def generate_employee_report(
         ],
         [
             ("ПОЯСНЕНИЕ НАЧИСЛЕНИЙ", ""),
-            ("Аванс", get_cell_comment(month, row_index, "CM")),
-            ("Удержание", get_cell_comment(month, row_index, "CI")),
-            ("Бонус", get_cell_comment(month, row_index, "CA")),
+            ("Аванс", get_comment("CM")),
+            ("Удержание", get_comment("CI")),
+            ("Бонус", get_comment("CA")),
         ],
     ]
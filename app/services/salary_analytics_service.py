@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Optional
+
+import pandas as pd
+
+from .salary_service import SalaryService
+from ..utils.executor import run_blocking
+from ..schemas.salary import (
+    SalaryPointTotal,
+    SalaryRow,
+    SalaryTotals,
+    SalaryTrend,
+    SalaryTrendPoint,
+)
+
+MONTHS = (
+    "ЯНВАРЬ",
+    "ФЕВРАЛЬ",
+    "МАРТ",
+    "АПРЕЛЬ",
+    "МАЙ",
+    "ИЮНЬ",
+    "ИЮЛЬ",
+    "АВГУСТ",
+    "СЕНТЯБРЬ",
+    "ОКТЯБРЬ",
+    "НОЯБРЬ",
+    "ДЕКАБРЬ",
+)
+METRICS = tuple(
+    name
+    for name, info in SalaryRow.model_fields.items()
+    if info.annotation in (int, float)
+)
+
+
+class SalaryAnalyticsService:
+    """Cross-month salary aggregations.
+
+    Every month sheet is stacked once into a long table with the columns
+    ``name``, ``month``, ``metric`` and ``value``; the table is rebuilt only
+    when the workbook changes. Employee ids and work places are joined at
+    query time, so employee edits show up without a rebuild.
+    """
+
+    def __init__(self, salary_service: SalaryService) -> None:
+        self._salary = salary_service
+        self._cube: pd.DataFrame | None = None
+        self._version: object = None
+
+    async def cube(self) -> pd.DataFrame:
+        version = self._salary.workbook_version()
+        if self._cube is not None and version == self._version:
+            return self._cube
+        sheets = set(await self._salary.list_months())
+        cube = await run_blocking(self._build_cube, sheets)
+        self._cube = cube
+        self._version = version
+        return cube
+
+    def _build_cube(self, sheets: set[str]) -> pd.DataFrame:
+        frames = []
+        for month in MONTHS:
+            if month not in sheets:
+                continue
+            columns = self._salary.salary_columns(month)
+            if columns is None:
+                continue
+            wide = pd.DataFrame({field: columns[field] for field in ("name", *METRICS)})
+            # rows without a name hold the sheet totals
+            wide = wide[wide["name"] != "nan"]
+            long = wide.melt(id_vars="name", var_name="metric", value_name="value")
+            long["month"] = month
+            frames.append(long)
+        if frames:
+            cube = pd.concat(frames, ignore_index=True)
+        else:
+            cube = pd.DataFrame(
+                {
+                    "name": pd.Series(dtype=object),
+                    "metric": pd.Series(dtype=object),
+                    "value": pd.Series(dtype="float64"),
+                    "month": pd.Series(dtype=object),
+                }
+            )
+        cube["month"] = pd.Categorical(cube["month"], categories=MONTHS, ordered=True)
+        cube["metric"] = pd.Categorical(cube["metric"], categories=METRICS)
+        cube["value"] = cube["value"].astype("float64")
+        return cube
+
+    def _employees(self) -> pd.DataFrame:
+        # the last employee wins for duplicate names, as in SalaryService
+        employees = {
+            e.name: e for e in self._salary.employee_repo.list_employees(archived=False)
+        }
+        return pd.DataFrame(
+            {
+                "employee_id": [e.id for e in employees.values()],
+                "work_place": [e.work_place or "" for e in employees.values()],
+            },
+            index=pd.Index(list(employees), name="name", dtype=object),
+        )
+
+    async def _select(
+        self,
+        metrics: Iterable[str],
+        until: Optional[str] = None,
+        month: Optional[str] = None,
+        employee_ids: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        metrics = list(metrics)
+        unknown = [m for m in metrics if m not in METRICS]
+        if unknown:
+            raise ValueError(f"unknown metrics: {', '.join(unknown)}")
+        for value in (until, month):
+            if value and value.upper() not in MONTHS:
+                raise ValueError(f"unknown month: {value}")
+        cube = await self.cube()
+        mask = cube["metric"].isin(metrics)
+        if until:
+            mask &= cube["month"] <= until.upper()
+        if month:
+            mask &= cube["month"] == month.upper()
+        rows = cube[mask].join(self._employees(), on="name")
+        rows["employee_id"] = rows["employee_id"].fillna("")
+        rows["work_place"] = rows["work_place"].fillna("")
+        if employee_ids is not None:
+            rows = rows[rows["employee_id"].isin(set(employee_ids))]
+        return rows
+
+    async def year_to_date(
+        self,
+        until: Optional[str] = None,
+        metrics: Optional[Iterable[str]] = None,
+        employee_ids: Optional[Iterable[str]] = None,
+    ) -> List[SalaryTotals]:
+        """Sum ``metrics`` per employee over the months up to ``until``."""
+        metrics = list(metrics or METRICS)
+        rows = await self._select(metrics, until=until, employee_ids=employee_ids)
+        totals = rows.pivot_table(
+            index=["name", "employee_id"],
+            columns="metric",
+            values="value",
+            aggfunc="sum",
+            observed=True,
+        )
+        months = rows.groupby("name", observed=True)["month"].unique()
+        result = []
+        for (name, emp_id), values in totals.iterrows():
+            result.append(
+                SalaryTotals(
+                    employee_id=emp_id,
+                    name=name,
+                    months=[str(m) for m in months[name].sort_values()],
+                    totals={m: float(values.get(m, 0.0)) for m in metrics},
+                )
+            )
+        return result
+
+    async def trend(
+        self,
+        metric: str = "final_amount",
+        employee_ids: Optional[Iterable[str]] = None,
+    ) -> List[SalaryTrend]:
+        """Return the monthly values of ``metric`` for each employee."""
+        rows = await self._select([metric], employee_ids=employee_ids)
+        series = rows.groupby(["name", "employee_id", "month"], observed=True)[
+            "value"
+        ].sum()
+        result = []
+        for (name, emp_id), points in series.groupby(level=[0, 1], observed=True):
+            result.append(
+                SalaryTrend(
+                    employee_id=emp_id,
+                    name=name,
+                    metric=metric,
+                    points=[
+                        SalaryTrendPoint(month=str(key[2]), value=float(value))
+                        for key, value in points.items()
+                    ],
+                )
+            )
+        return result
+
+    async def points(
+        self, month: Optional[str] = None, metric: str = "final_amount"
+    ) -> List[SalaryPointTotal]:
+        """Sum ``metric`` per work place for ``month`` or the whole year."""
+        rows = await self._select([metric], month=month)
+        grouped = rows.groupby("work_place").agg(
+            employees=("name", "nunique"), total=("value", "sum")
+        )
+        return [
+            SalaryPointTotal(
+                work_place=place, employees=int(row.employees), total=float(row.total)
+            )
+            for place, row in grouped.sort_values("total", ascending=False).iterrows()
+        ]
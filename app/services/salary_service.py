@@ -1,33 +1,57 @@
 from __future__ import annotations
 
+import os
+import threading
 from typing import List, Optional
 
+import numpy as np
 import pandas as pd
 
 from .excel import load_data
+from ..config import EXCEL_FILE
 from ..data.employee_repository import EmployeeRepository
+from ..data.factory import get_employee_repository
 from ..schemas.salary import SalaryRow
+from ..utils.executor import run_blocking
 
 
 class SalaryService:
     """Service to load salary data from Excel."""
 
     def __init__(self, repo: EmployeeRepository | None = None) -> None:
-        self._repo = repo or EmployeeRepository()
-        self._cache: dict[str, pd.DataFrame] = {}
+        self._repo = repo or get_employee_repository()
+        self._cache: dict[str, tuple[tuple[int, int] | None, pd.DataFrame]] = {}
+        # sheets are parsed in executor threads; one parse at a time for all months
+        self._lock = threading.Lock()
+
+    @property
+    def employee_repo(self) -> EmployeeRepository:
+        return self._repo
+
+    @staticmethod
+    def workbook_version() -> tuple[int, int] | None:
+        """Return ``(mtime_ns, size)`` of the workbook, ``None`` if missing."""
+        try:
+            st = os.stat(EXCEL_FILE)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
 
     def _load_month(self, month: str) -> pd.DataFrame | None:
         month = month.upper()
-        if month in self._cache:
-            return self._cache[month]
-        df = load_data(sheet_name=month)
-        if df is not None:
-            df.columns = [str(c).strip() for c in df.columns]
-            self._cache[month] = df
-        return df
+        with self._lock:
+            version = self.workbook_version()
+            cached = self._cache.get(month)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            df = load_data(sheet_name=month)
+            if df is not None:
+                df.columns = [str(c).strip() for c in df.columns]
+                self._cache[month] = (version, df)
+            return df
 
     async def list_months(self) -> List[str]:
-        months = load_data(None)
+        months = await run_blocking(load_data, None, label="load_data")
         return months or []
 
     async def get_salary(
@@ -35,13 +59,24 @@ class SalaryService:
     ) -> List[SalaryRow]:
         if not month:
             return []
+        columns = await run_blocking(self.salary_columns, month, employee_id)
+        if columns is None:
+            return []
+        # plain lists keep None comments, a DataFrame would infer str and NaN
+        fields = list(columns)
+        records = zip(*(values.tolist() for values in columns.values()))
+        return [SalaryRow(month=month, **dict(zip(fields, record))) for record in records]
+
+    def salary_columns(
+        self, month: str, employee_id: Optional[str] = None
+    ) -> dict[str, np.ndarray] | None:
+        """Return the ``SalaryRow`` fields of ``month`` as column arrays."""
         df = self._load_month(month)
         if df is None or "ИМЯ" not in df.columns:
-            return []
+            return None
         name_map = {
             e.name: e.id for e in self._repo.list_employees(archived=False)
         }
-        result: List[SalaryRow] = []
         cols = {str(c).strip().lower(): c for c in df.columns}
 
         def pick(*names: str) -> Optional[str]:
@@ -68,60 +103,46 @@ class SalaryService:
             "deduction": pick("удержание", "deduction"),
             "advance": pick("аванс", "advance"),
             "final_amount": pick("к выплате", "final_amount"),
-            "comment": pick("комментарий", "comment"),
         }
-        for _, row in df.iterrows():
-            name = str(row.get("ИМЯ", "")).strip()
-            if not name:
-                continue
-            emp_id = name_map.get(name, "")
-            if employee_id and emp_id != employee_id:
-                continue
 
-            def to_float(val: object) -> float:
-                try:
-                    if pd.isna(val):
-                        return 0.0
-                    return float(val)
-                except Exception:
-                    return 0.0
-
-            def to_int(val: object) -> int:
-                try:
-                    if pd.isna(val):
-                        return 0
-                    return int(float(val))
-                except Exception:
-                    return 0
-
-            values = {}
-            for field, col in colmap.items():
-                if col is None:
-                    if field == "comment":
-                        values[field] = ""
-                    else:
-                        values[field] = 0
-                    continue
-                if field.startswith("shifts_"):
-                    values[field] = to_int(row.get(col))
-                elif field in {"comment"}:
-                    values[field] = str(row.get(col, "")).strip()
-                else:
-                    values[field] = to_float(row.get(col))
-
-            if values.get("shifts_total") == 0:
-                values["shifts_total"] = values.get(
-                    "shifts_main", 0) + values.get("shifts_extra", 0)
-
-            comment_raw = values.pop("comment", "")
-            comment = str(comment_raw).strip() or None
-            result.append(
-                SalaryRow(
-                    employee_id=emp_id,
-                    name=name,
-                    month=month,
-                    comment=comment,
-                    **values,
-                )
-            )
-        return result
+        # str() of a missing cell is "nan", which is kept as a name
+        names = df["ИМЯ"].astype(object).map(str).str.strip()
+        ids = names.map(name_map).fillna("")
+        mask = names != ""
+        if employee_id:
+            mask &= ids == employee_id
+        rows = np.flatnonzero(mask.to_numpy())
+
+        columns: dict[str, np.ndarray] = {
+            "employee_id": ids.to_numpy(dtype=object)[rows],
+            "name": names.to_numpy(dtype=object)[rows],
+        }
+        for field, col in colmap.items():
+            if col is None:
+                columns[field] = np.zeros(len(rows), dtype="int64")
+                continue
+            values = df[col].to_numpy()[rows]
+            if values.dtype.kind == "O":
+                values = pd.to_numeric(values, errors="coerce")
+            elif values.dtype.kind not in "iufb":
+                # a date column is not an amount; to_numeric would give nanoseconds
+                values = np.full(len(rows), np.nan)
+            values = values.astype("float64")
+            if field.startswith("shifts_"):
+                values = np.where(np.isfinite(values), values, 0).astype("int64")
+            else:
+                values = np.where(np.isnan(values), 0.0, values)
+            columns[field] = values
+        columns["shifts_total"] = np.where(
+            columns["shifts_total"] == 0,
+            columns["shifts_main"] + columns["shifts_extra"],
+            columns["shifts_total"],
+        )
+        comment_col = pick("комментарий", "comment")
+        if comment_col is None:
+            columns["comment"] = np.full(len(rows), None, dtype=object)
+        else:
+            comments = df[comment_col].astype(object).map(str).str.strip()
+            comments = comments.to_numpy(dtype=object)[rows]
+            columns["comment"] = np.where(comments != "", comments, None)
+        return columns
@@ -4,11 +4,12 @@ from datetime import date
 from typing import Dict, List
 
 import os
-from openpyxl import load_workbook
 
 from ..config import EXCEL_FILE
 from ..schemas.schedule import SchedulePointOut
 from ..core.constants import MONTHS_RU
+from ..utils.executor import run_blocking
+from .workbook_cache import get_workbook_cache
 
 POINTS = {
     "Ц": "Цех",
@@ -30,7 +31,9 @@ class ScheduleService:
     async def get_schedule_by_day(
             self, date_str: str) -> List[SchedulePointOut]:
         """Return list of points and assigned employees for given date."""
+        return await run_blocking(self._schedule_by_day, date_str)
 
+    def _schedule_by_day(self, date_str: str) -> List[SchedulePointOut]:
         try:
             day_date = date.fromisoformat(date_str)
         except Exception:
@@ -44,8 +47,9 @@ class ScheduleService:
                 for code, name in POINTS.items()
             ]
 
+        cache = get_workbook_cache()
         try:
-            wb = load_workbook(EXCEL_FILE, data_only=True)
+            sheet_names = cache.sheet_names(EXCEL_FILE)
         except Exception:
             return [
                 SchedulePointOut(point=name, short=code, employee="")
@@ -53,15 +57,15 @@ class ScheduleService:
             ]
 
         sheet = None
-        if month_name in wb.sheetnames:
-            sheet = wb[month_name]
-        elif month_name.upper() in wb.sheetnames:
-            sheet = wb[month_name.upper()]
+        if month_name in sheet_names:
+            sheet = month_name
+        elif month_name.upper() in sheet_names:
+            sheet = month_name.upper()
         else:
-            for title in wb.sheetnames:
+            for title in sheet_names:
                 if title.startswith(month_name) or title.startswith(
                         month_name.upper()):
-                    sheet = wb[title]
+                    sheet = title
                     break
 
         if sheet is None:
@@ -70,11 +74,25 @@ class ScheduleService:
                 for code, name in POINTS.items()
             ]
 
+        try:
+            rows = cache.values(EXCEL_FILE, sheet)
+        except Exception:
+            return [
+                SchedulePointOut(point=name, short=code, employee="")
+                for code, name in POINTS.items()
+            ]
+
+        def cell(row: int, column: int):
+            if row > len(rows) or column > len(rows[row - 1]):
+                return None
+            return rows[row - 1][column - 1]
+
         day_col = None
         target = str(day_date.day)
-        for col in range(1, sheet.max_column + 1):
-            v1 = str(sheet.cell(row=1, column=col).value or "").strip()
-            v2 = str(sheet.cell(row=2, column=col).value or "").strip()
+        max_column = max((len(r) for r in rows), default=0)
+        for col in range(1, max_column + 1):
+            v1 = str(cell(1, col) or "").strip()
+            v2 = str(cell(2, col) or "").strip()
             if v1 == target or v2 == target:
                 day_col = col
                 break
@@ -86,11 +104,11 @@ class ScheduleService:
             ]
 
         assignments: Dict[str, str] = {}
-        for row in range(3, sheet.max_row + 1):
-            code = str(sheet.cell(row=row, column=day_col).value or "").strip()
+        for row in range(3, len(rows) + 1):
+            code = str(cell(row, day_col) or "").strip()
             if code not in POINTS or code in assignments:
                 continue
-            employee_cell = sheet.cell(row=row, column=1).value
+            employee_cell = cell(row, 1)
             employee_name = str(employee_cell).strip() if employee_cell else ""
             assignments[code] = employee_name
             if len(assignments) == len(POINTS):
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
-import json
 import logging
+from dataclasses import asdict
 from pathlib import Path
 from typing import Optional, Sequence, List, Dict, Any
 from datetime import datetime
@@ -16,6 +16,17 @@ from app.utils import is_valid_user_id
 
 from app.config import TOKEN, ADMIN_CHAT_ID
 from app.data.employee_repository import EmployeeRepository
+from app.data.sent_message_log import SentMessageLog, get_sent_message_log
+from app.data.timeline_index import decode_cursor, encode_cursor
+from .broadcast_engine import (
+    FAILED,
+    SENT,
+    UNKNOWN,
+    BroadcastEngine,
+    BroadcastProgress,
+    MonotonicClock,
+)
+from .photo_cache import PhotoFileIdCache
 
 logger = logging.getLogger("broadcast")
 if not logger.handlers:
@@ -44,92 +55,45 @@ class TelegramAPIError(TelegramServiceError):
 
 
 class TelegramService:
-    def __init__(self, repo: EmployeeRepository) -> None:
+    def __init__(
+        self,
+        repo: EmployeeRepository,
+        clock: Optional[MonotonicClock] = None,
+        msg_log: Optional[SentMessageLog] = None,
+    ) -> None:
         self.repo = repo
+        self.clock = clock
+        self._msg_log = msg_log
         if TOKEN and TOKEN != "dummy":
             self.bot = Bot(token=TOKEN)
         else:
             self.bot = None
-        Path("logs").mkdir(exist_ok=True)
-        self.msg_log = Path("logs/sent_messages.json")
-        if not self.msg_log.exists():
-            self.msg_log.write_text("[]", encoding="utf-8")
+        self.photo_ids = PhotoFileIdCache(Path("logs/photo_file_ids.json"))
         if not ADMIN_CHAT_ID:
             log("⚠️ ADMIN_CHAT_ID not configured")
 
-    def _load_log_all(self) -> List[Dict]:
-        try:
-            data = json.loads(self.msg_log.read_text(encoding="utf-8"))
-        except Exception:
-            return []
-        return self._enrich_log_entries(data)
-
-    def _load_log(self) -> List[Dict]:
-        """Return log records sorted by timestamp descending."""
-        data = self._load_log_all()
-        return sorted(
-            data,
-            key=lambda x: x.get("timestamp", ""),
-            reverse=True,
-        )[:50]
-
-    def _resolve_employee_name(self, user_id: str | int | None) -> str | None:
-        if not user_id:
-            return None
-        try:
-            employee = self.repo.get_employee(str(user_id))
-        except Exception as exc:
-            log(f"⚠️ Failed to resolve employee {user_id}: {exc}")
-            return None
-        if not employee:
-            return None
-        return getattr(employee, "full_name", None) or getattr(employee, "name", None)
-
-    def _enrich_log_entries(self, data: List[Dict]) -> List[Dict]:
-        changed = False
-
-        for entry in data:
-            if not isinstance(entry, dict):
-                continue
-
-            if entry.get("user_id") and not entry.get("user_name"):
-                name = self._resolve_employee_name(entry.get("user_id"))
-                if name:
-                    entry["user_name"] = name
-                    changed = True
+    @property
+    def msg_log(self) -> SentMessageLog:
+        """The sent-message log, opened on first use."""
+        if self._msg_log is None:
+            self._msg_log = get_sent_message_log()
+        return self._msg_log
 
-            if "broadcast" not in entry:
-                entry["broadcast"] = False
-                changed = True
-
-            status = entry.get("status")
-            if isinstance(status, str) and "принят" in status.lower():
-                if not entry.get("accepted"):
-                    entry["accepted"] = True
-                    changed = True
-
-            recipients = entry.get("recipients") or []
-            for recipient in recipients:
-                if not isinstance(recipient, dict):
-                    continue
-                if recipient.get("user_id") and not recipient.get("name"):
-                    name = self._resolve_employee_name(recipient.get("user_id"))
-                    if name:
-                        recipient["name"] = name
-                        changed = True
-
-        if changed:
-            try:
-                self._save_log(data)
-            except Exception as exc:
-                log(f"⚠️ Failed to persist enriched log entries: {exc}")
-
-        return data
-
-    def _save_log(self, data: List[Dict]) -> None:
-        self.msg_log.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
+    def list_log(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        **filters: Any,
+    ) -> tuple[List[Dict], Optional[str]]:
+        """Return a filtered page of log records and the next page cursor.
+
+        ``filters`` are ``user_id``, ``batch_id``, ``broadcast`` and
+        ``accepted``; a malformed ``cursor`` raises ``ValueError``.
+        """
+        items, next_key = self.msg_log.page(
+            limit, decode_cursor(cursor) if cursor else None, **filters
         )
+        return items, encode_cursor(next_key) if next_key else None
 
     def _append_personal_log_entry(
         self,
@@ -162,43 +126,36 @@ class TelegramService:
             entry["batch_id"] = batch_id
         if extra:
             entry.update(extra)
-        data = self._load_log_all()
-        data.append(entry)
-        self._save_log(data)
+        self.msg_log.put(entry)
 
     def delete_log_entry(self, entry_id: str) -> None:
-        data = self._load_log_all()
-        data = [d for d in data if str(d.get("id")) != str(entry_id)]
-        self._save_log(data)
+        self.msg_log.delete(entry_id)
 
     @classmethod
     def update_sent_message_status(
         cls, user_id: str, message_id: int, status: str
     ) -> None:
-        log_file = Path("logs/sent_messages.json")
-        if not log_file.exists():
-            return
-        try:
-            data = json.loads(log_file.read_text(encoding="utf-8"))
-        except Exception:
-            return
-        accepted_at = None
+        fields: Dict[str, Any] = {"status": status}
         normalized_status = status.lower() if isinstance(status, str) else ""
         if "принят" in normalized_status:
-            accepted_at = datetime.utcnow().isoformat()
-        for item in data:
-            if (
-                str(item.get("user_id")) == str(user_id)
-                and item.get("message_id") == message_id
-            ):
-                item["status"] = status
-                if accepted_at:
-                    item["accepted"] = True
-                    item["timestamp_accept"] = accepted_at
-                break
-        log_file.write_text(
-            json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8"
-        )
+            fields["accepted"] = True
+            fields["timestamp_accept"] = datetime.utcnow().isoformat()
+        get_sent_message_log().update_by_message(user_id, message_id, fields)
+
+    async def _send_photo(self, chat_id: str | int, photo_url: str, **kwargs: Any) -> Any:
+        """Send ``photo_url`` by its cached ``file_id`` when there is one."""
+        file_id = self.photo_ids.get(photo_url)
+        if file_id:
+            try:
+                return await self.bot.send_photo(chat_id=chat_id, photo=file_id, **kwargs)
+            except BadRequest as exc:
+                if "file" not in str(exc).lower():
+                    raise
+                # the id belongs to another bot or expired; upload again
+                self.photo_ids.forget(photo_url)
+        result = await self.bot.send_photo(chat_id=chat_id, photo=photo_url, **kwargs)
+        self.photo_ids.remember(photo_url, result)
+        return result
 
     async def broadcast_message_to_all(
             self,
@@ -206,7 +163,14 @@ class TelegramService:
             parse_mode: str = "HTML",
             photo_url: Optional[str] = None,
             filters: Optional[Dict[str, Any]] = None,
-            test_user_id: Optional[str] = None) -> dict:
+            test_user_id: Optional[str] = None,
+            batch_id: Optional[str] = None) -> dict:
+        """Send ``message`` to the matching employees through the broadcast engine.
+
+        Progress is kept in ``logs/broadcasts/<batch_id>.json`` until every
+        employee is reached, so calling again with the returned ``batch_id``
+        after an interruption or failures only sends to the remaining ones.
+        """
         if filters is None:
             filters = {}
         if "archived" not in filters:
@@ -218,71 +182,83 @@ class TelegramService:
             log("⚠️ Telegram bot not configured; cannot broadcast")
             raise TelegramNotConfiguredError("Telegram bot not configured")
 
-        success = 0
-        recipients: List[Dict[str, Any]] = []
+        batch_id = batch_id or str(uuid4())
+        texts: Dict[str, str] = {}
+        rows: List[tuple[Any, Optional[str]]] = []
         for emp in employees:
             if not is_valid_user_id(emp.id):
                 log(f"⚠️ Skipping message — invalid or fake user_id: {emp.id}")
-                recipients.append({
-                    "user_id": str(emp.id),
-                    "name": emp.full_name or emp.name,
-                    "status": "невалидный id",
-                })
+                rows.append((emp, "невалидный id"))
                 continue
             try:
-                personalized = message.format(**emp.__dict__)
+                texts[str(emp.id)] = message.format(**asdict(emp))
             except (KeyError, ValueError) as exc:
                 logger.error(f"Failed to format message for {emp.id}: {exc}")
                 continue
+            rows.append((emp, None))
+
+        async def send(chat_id: str) -> None:
+            personalized = texts[chat_id]
             log(
-                f"[Telegram] Broadcasting to {emp.id} — text: '{personalized[:50]}', photo: {bool(photo_url)}"
+                f"[Telegram] Broadcasting to {chat_id} — text: '{personalized[:50]}', photo: {bool(photo_url)}"
             )
-            try:
-                if photo_url:
-                    await self.bot.send_photo(
-                        chat_id=emp.id,
-                        photo=photo_url,
-                        caption=personalized,
-                        parse_mode=parse_mode,
-                    )
+            if photo_url:
+                await self._send_photo(
+                    chat_id,
+                    photo_url,
+                    caption=personalized,
+                    parse_mode=parse_mode,
+                )
+            else:
+                await self.bot.send_message(
+                    chat_id=chat_id,
+                    text=personalized,
+                    parse_mode=parse_mode,
+                )
+
+        progress = BroadcastProgress(Path("logs/broadcasts") / f"{batch_id}.jsonl")
+        engine = BroadcastEngine(clock=self.clock, progress=progress)
+        # the first photo is uploaded alone, the rest reuse its file_id
+        lead = bool(photo_url) and self.photo_ids.get(photo_url) is None
+        results = {r.chat_id: r for r in await engine.run(texts, send, lead=lead)}
+
+        success = 0
+        recipients: List[Dict[str, Any]] = []
+        for emp, status in rows:
+            result = results.get(str(emp.id))
+            if status is None and result is not None:
+                if result.status == SENT:
+                    success += 1
+                    status = "отправлено"
+                    logger.info(f"Sent to {emp.id}")
+                elif result.status == UNKNOWN:
+                    status = f"не подтверждено: {result.error}"
+                    log(f"⚠️ Broadcast to chat {emp.id} timed out, not resending")
                 else:
-                    await self.bot.send_message(
-                        chat_id=emp.id,
-                        text=personalized,
-                        parse_mode=parse_mode,
-                    )
-                success += 1
-                logger.info(f"Sent to {emp.id}")
-                recipients.append({
-                    "user_id": str(emp.id),
-                    "name": emp.full_name or emp.name,
-                    "status": "отправлено",
-                })
-            except BadRequest as exc:
-                log(f"❌ Failed to send broadcast to chat {emp.id} — {exc}")
-                recipients.append({
-                    "user_id": str(emp.id),
-                    "name": emp.full_name or emp.name,
-                    "status": f"ошибка: {exc}",
-                })
-            except Exception as exc:
-                logger.warning(f"Failed for {emp.id}: {exc}")
-                recipients.append({
-                    "user_id": str(emp.id),
-                    "name": emp.full_name or emp.name,
-                    "status": f"ошибка: {exc}",
-                })
+                    status = f"ошибка: {result.error}"
+                    log(f"❌ Failed to send broadcast to chat {emp.id} — {result.error}")
+            recipients.append({
+                "user_id": str(emp.id),
+                "name": emp.full_name or emp.name,
+                "status": status,
+            })
         log_entry = {
-            "id": str(uuid4()),
+            "id": batch_id,
             "broadcast": True,
             "message": message,
             "timestamp": datetime.utcnow().isoformat(),
             "recipients": recipients,
         }
-        data = self._load_log_all()
-        data.append(log_entry)
-        self._save_log(data)
-        return {"success": True, "sent": success, "total": len(employees)}
+        self.msg_log.put(log_entry)
+        # keep the progress file only when a rerun has chats left to send
+        if all(r.status != FAILED for r in results.values()):
+            progress.discard()
+        return {
+            "success": True,
+            "sent": success,
+            "total": len(employees),
+            "batch_id": batch_id,
+        }
 
     async def send_message_to_user(
             self,
@@ -342,9 +318,9 @@ class TelegramService:
         )
         try:
             if photo_url:
-                result = await self.bot.send_photo(
-                    chat_id=user_id,
-                    photo=photo_url,
+                result = await self._send_photo(
+                    user_id,
+                    photo_url,
                     caption=message,
                     parse_mode=parse_mode,
                     reply_markup=reply_markup,
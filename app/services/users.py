@@ -4,10 +4,10 @@ from datetime import datetime
 from typing import Any, Dict, List
 
 from app.core.types import Employee, EmployeeStatus
-from app.data.employee_repository import EmployeeRepository
+from app.data.factory import get_employee_repository
 from ..utils.logger import log
 
-_repo = EmployeeRepository()
+_repo = get_employee_repository()
 
 
 def _parse_datetime(value: Any) -> datetime | None:
@@ -21,6 +21,56 @@ def _parse_datetime(value: Any) -> datetime | None:
         return None
 
 
+def _user_dict(emp: Employee) -> Dict[str, Any]:
+    return {
+        "id": int(emp.id) if str(emp.id).isdigit() else emp.id,
+        "name": emp.name,
+        "full_name": emp.full_name,
+        "phone": emp.phone,
+        "position": emp.position,
+        "is_admin": emp.is_admin,
+        "card_number": emp.card_number,
+        "bank": emp.bank,
+        "birthdate": emp.birthdate.isoformat() if emp.birthdate else None,
+        "note": emp.note,
+        "photo_url": emp.photo_url,
+        "status": emp.status.value,
+        "payout_chat_key": getattr(emp, "payout_chat_key", None),
+        "archived": getattr(emp, "archived", False),
+        "archived_at": emp.archived_at.isoformat() if emp.archived_at else None,
+    }
+
+
+# archived filter -> (repository, repository version, users keyed by id)
+_users_cache: Dict[bool | None, tuple[Any, Any, Dict[str, Dict[str, Any]]]] = {}
+
+
+def _users(archived: bool | None) -> Dict[str, Dict[str, Any]]:
+    """Return the cached users map, rebuilt when the repository changes.
+
+    Repositories without a ``version`` attribute are read on every call.
+    The returned dicts are shared and must not be modified.
+    """
+    version = getattr(_repo, "version", None)
+    cached = _users_cache.get(archived)
+    if (
+        cached is not None
+        and version is not None
+        and cached[0] is _repo
+        and cached[1] == version
+    ):
+        return cached[2]
+    storage = getattr(_repo, "_storage", None)
+    log(f"📂 Загрузка сотрудников из: {storage.path if storage else 'database'}")
+    users = {}
+    for emp in _repo.list_employees(archived=archived):
+        user = _user_dict(emp)
+        users[str(user["id"])] = user
+    log(f"✅ Загружено сотрудников: {len(users)}")
+    _users_cache[archived] = (_repo, version, users)
+    return users
+
+
 def load_users(archived: bool | None = False) -> List[Dict[str, Any]]:
     """Return users as a list of objects suitable for frontend.
 
@@ -29,42 +79,26 @@ def load_users(archived: bool | None = False) -> List[Dict[str, Any]]:
             active employees, ``True`` returns only archived ones and ``None``
             returns everyone.
     """
-    path = getattr(_repo, "_storage").path
-    log(f"📂 Загрузка сотрудников из: {path}")
-    result: List[Dict[str, Any]] = []
-    for emp in _repo.list_employees(archived=archived):
-        result.append(
-            {
-                "id": int(emp.id) if str(emp.id).isdigit() else emp.id,
-                "name": emp.name,
-                "full_name": emp.full_name,
-                "phone": emp.phone,
-                "position": emp.position,
-                "is_admin": emp.is_admin,
-                "card_number": emp.card_number,
-                "bank": emp.bank,
-                "birthdate": emp.birthdate.isoformat() if emp.birthdate else None,
-                "note": emp.note,
-                "photo_url": emp.photo_url,
-                "status": emp.status.value,
-                "payout_chat_key": getattr(emp, "payout_chat_key", None),
-                "archived": getattr(emp, "archived", False),
-                "archived_at": emp.archived_at.isoformat() if emp.archived_at else None,
-            }
-        )
-    log(f"✅ Загружено сотрудников: {len(result)}")
-    return result
+    return [dict(u) for u in _users(archived).values()]
 
 
 def load_users_map(archived: bool | None = False) -> Dict[str, Any]:
     """Return users keyed by id for legacy handlers."""
 
     return {
-        str(u["id"]): {k: v for k, v in u.items() if k != "id"}
-        for u in load_users(archived=archived)
+        uid: {k: v for k, v in u.items() if k != "id"}
+        for uid, u in _users(archived).items()
     }
 
 
+def get_user(user_id: Any, archived: bool | None = False) -> Dict[str, Any] | None:
+    """Return one user in the ``load_users_map`` format or ``None``."""
+    user = _users(archived).get(str(user_id))
+    if user is None:
+        return None
+    return {k: v for k, v in user.items() if k != "id"}
+
+
 def save_users(users: Dict[str, Any]) -> None:
     """Persist provided user dict via the repository."""
     employees = []
@@ -112,7 +146,7 @@ def add_user(user_id: str, user_data: Dict[str, Any]) -> None:
 
 
 def update_user(user_id: str, fields: Dict[str, Any]) -> None:
-    emp_dict = load_users_map(archived=None).get(str(user_id))
+    emp_dict = get_user(user_id, archived=None)
     if not emp_dict:
         log(f"⚠️ update_user: user {user_id} not found")
         return
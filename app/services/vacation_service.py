@@ -1,12 +1,20 @@
-from typing import List, Optional
+import asyncio
+from typing import Any, Callable, List, Optional
 
 from app.schemas.vacation import Vacation, VacationCreate, VacationUpdate
+from app.data.factory import get_vacation_repository
 from app.data.vacation_repository import VacationRepository
+from app.utils.executor import run_blocking
 
 
 class VacationService:
     def __init__(self, repo: Optional[VacationRepository] = None) -> None:
-        self._repo = repo or VacationRepository()
+        self._repo = repo or get_vacation_repository()
+        self._repo_lock = asyncio.Lock()
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run repository work in the executor, one call at a time."""
+        return await run_blocking(func, *args, lock=self._repo_lock)
 
     async def list_vacations(
         self,
@@ -15,18 +23,22 @@ class VacationService:
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
     ) -> List[Vacation]:
-        rows = self._repo.list(employee_id, vac_type, date_from, date_to)
+        rows = await self._run(self._repo.list, employee_id, vac_type, date_from, date_to)
         return [Vacation(**r) for r in rows]
 
     async def create_vacation(self, data: VacationCreate) -> Vacation:
         self._validate_dates(data.start_date, data.end_date)
-        created = self._repo.create(data.model_dump())
+        created = await self._run(self._repo.create, data.model_dump())
         return Vacation(**created)
 
     async def update_vacation(
             self,
             vac_id: str,
             data: VacationUpdate) -> Optional[Vacation]:
+        updated = await self._run(self._update, vac_id, data)
+        return Vacation(**updated) if updated else None
+
+    def _update(self, vac_id: str, data: VacationUpdate) -> Optional[dict]:
         existing = next(
             (v for v in self._repo.list() if str(v.get("id")) == str(vac_id)),
             None,
@@ -36,18 +48,17 @@ class VacationService:
         start = data.start_date or existing.get("start_date")
         end = data.end_date or existing.get("end_date")
         self._validate_dates(start, end)
-        updated = self._repo.update(vac_id, data.model_dump(exclude_none=True))
-        return Vacation(**updated) if updated else None
+        return self._repo.update(vac_id, data.model_dump(exclude_none=True))
 
     async def delete_vacation(self, vac_id: str) -> None:
-        self._repo.delete(vac_id)
+        await self._run(self._repo.delete, vac_id)
 
     async def list_active(self) -> List[Vacation]:
-        rows = self._repo.list_active()
+        rows = await self._run(self._repo.list_active)
         return [Vacation(**r) for r in rows]
 
     async def list_tomorrow(self) -> List[Vacation]:
-        rows = self._repo.list_tomorrow()
+        rows = await self._run(self._repo.list_tomorrow)
         return [Vacation(**r) for r in rows]
 
     def get_vacation_employee(self, vac_id: str) -> Optional[str]:
@@ -0,0 +1,224 @@
+"""Process-wide cache of data parsed from the Excel workbook."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, Mapping
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from ..config import EXCEL_CACHE_MAX_MB
+from ..utils.logger import log
+from .excel_snapshot import SnapshotStore, get_snapshot_store
+
+
+def _footprint(value: Any) -> int:
+    """Rough memory footprint of a cached value in bytes."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_footprint(v) for v in value)
+    if isinstance(value, Mapping):
+        return sys.getsizeof(value) + sum(
+            sys.getsizeof(k) + _footprint(v) for k, v in value.items()
+        )
+    return sys.getsizeof(value)
+
+
+class WorkbookCache:
+    """LRU cache of sheet names, DataFrames, cell grids and comment maps.
+
+    Entries are keyed by the workbook path plus its mtime and size, so a
+    saved workbook is re-read on the next access and the stale entries of
+    that file are dropped. The least recently used entries are evicted once
+    the estimated footprint exceeds ``max_bytes``.
+
+    With a :class:`SnapshotStore`, sheet names and DataFrames missing from
+    memory are read from the on-disk snapshot before falling back to parsing
+    the workbook, and freshly parsed frames are written back for other
+    processes.
+    """
+
+    def __init__(self, max_bytes: int, snapshots: SnapshotStore | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.snapshots = snapshots
+        self._entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self._signatures: dict[str, tuple[int, int]] = {}
+        self._size = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+    def _signature(self, path: str) -> tuple[str, int, int]:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if self._signatures.get(path) != signature:
+                if path in self._signatures:
+                    log(f"🔄 Workbook {path} changed, dropping cached data")
+                self._drop(path)
+                self._signatures[path] = signature
+        return (path, *signature)
+
+    def _drop(self, path: str) -> None:
+        for key in [k for k in self._entries if k[0] == path]:
+            self._size -= self._entries.pop(key)[1]
+
+    def _get(self, path: str, part: Hashable, loader: Callable[[str], Any]) -> Any:
+        key = (*self._signature(path), part)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = loader(key[0])
+        self._put(key, value)
+        return value
+
+    def _put(self, key: tuple, value: Any) -> None:
+        size = _footprint(value)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def _read_frame(self, path: str, sheet: str, header: int | None) -> pd.DataFrame:
+        if self.snapshots is not None:
+            try:
+                df = self.snapshots.load(path, sheet, header)
+                if df is not None:
+                    return df
+            except Exception as e:
+                log(f"⚠️ Snapshot of {sheet} is unreadable: {e}")
+        df = pd.read_excel(path, sheet_name=sheet, header=header)
+        if self.snapshots is not None:
+            try:
+                self.snapshots.save(path, sheet, header, df)
+            except Exception as e:
+                log(f"⚠️ Could not write snapshot of {sheet}: {e}")
+        return df
+
+    # ------------------------------------------------------------------
+    # public API
+    # ------------------------------------------------------------------
+    def sheet_names(self, path: str) -> list[str]:
+        def load(p: str) -> tuple[str, ...]:
+            if self.snapshots is not None:
+                names = self.snapshots.sheet_names(p)
+                if names is not None:
+                    return tuple(names)
+            wb = load_workbook(p, read_only=True)
+            try:
+                names = list(wb.sheetnames)
+            finally:
+                wb.close()
+            if self.snapshots is not None:
+                try:
+                    self.snapshots.save_sheet_names(p, names)
+                except OSError as e:
+                    log(f"⚠️ Could not write snapshot of sheet names: {e}")
+            return tuple(names)
+
+        return list(self._get(path, "sheets", load))
+
+    def dataframe(self, path: str, sheet: str, header: int | None = 0) -> pd.DataFrame:
+        """Return a copy of ``pd.read_excel(path, sheet, header=header)``."""
+        df = self._get(
+            path,
+            ("frame", sheet, header),
+            lambda p: self._read_frame(p, sheet, header),
+        )
+        return df.copy()
+
+    def values(self, path: str, sheet: str) -> tuple[tuple[Any, ...], ...]:
+        """Return computed cell values of ``sheet`` as rows starting at A1."""
+
+        def load(p: str) -> tuple[tuple[Any, ...], ...]:
+            wb = load_workbook(p, read_only=True, data_only=True)
+            try:
+                ws = wb[sheet]
+                ws.reset_dimensions()
+                return tuple(tuple(row) for row in ws.iter_rows(values_only=True))
+            finally:
+                wb.close()
+
+        return self._get(path, ("values", sheet), load)
+
+    def comments(self, path: str, sheet: str) -> Mapping[str, str] | None:
+        """Return ``{"A1": text}`` for the comments of ``sheet``.
+
+        The workbook is opened once and the comments of every sheet are
+        cached together. ``None`` means the sheet does not exist.
+        """
+        part = ("comments", sheet)
+        key = (*self._signature(path), part)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        if sheet not in self.sheet_names(path):
+            return None
+        with self._lock:
+            self.misses += 1
+        wb = load_workbook(key[0], data_only=False)
+        try:
+            found = None
+            for ws in wb.worksheets:
+                texts = MappingProxyType(
+                    {
+                        cell.coordinate: cell.comment.text.strip()
+                        for row in ws.iter_rows()
+                        for cell in row
+                        if cell.comment
+                    }
+                )
+                self._put((*key[:3], ("comments", ws.title)), texts)
+                if ws.title == sheet:
+                    found = texts
+            return found
+        finally:
+            wb.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._signatures.clear()
+            self._size = 0
+
+
+_cache_instance: WorkbookCache | None = None
+
+
+def get_workbook_cache() -> WorkbookCache:
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = WorkbookCache(
+            EXCEL_CACHE_MAX_MB * 1024 * 1024, snapshots=get_snapshot_store()
+        )
+    return _cache_instance
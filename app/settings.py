@@ -55,6 +55,40 @@ class Settings(BaseSettings):
         validation_alias="MAX_ADVANCE_AMOUNT_PER_MONTH",
     )
     secret_key: str = Field("change_me", validation_alias="SECRET_KEY")
+    storage_engine: str = Field("json", validation_alias="STORAGE_ENGINE")
+    journal_compact_threshold: int = Field(
+        500, validation_alias="JOURNAL_COMPACT_THRESHOLD"
+    )
+    database_url: str = Field(
+        "sqlite:///bot.db", validation_alias="DATABASE_URL"
+    )
+    excel_cache_max_mb: int = Field(
+        256, validation_alias="EXCEL_CACHE_MAX_MB"
+    )
+    excel_snapshot_dir: str = Field(
+        ".excel_snapshot", validation_alias="EXCEL_SNAPSHOT_DIR"
+    )
+    auth_cache_ttl_seconds: int = Field(
+        60, validation_alias="AUTH_CACHE_TTL_SECONDS"
+    )
+    auth_cache_size: int = Field(
+        1024, validation_alias="AUTH_CACHE_SIZE"
+    )
+    broadcast_concurrency: int = Field(
+        8, validation_alias="BROADCAST_CONCURRENCY"
+    )
+    broadcast_rate: float = Field(
+        25.0, validation_alias="BROADCAST_RATE"
+    )
+    broadcast_chat_rate: float = Field(
+        1.0, validation_alias="BROADCAST_CHAT_RATE"
+    )
+    broadcast_max_retries: int = Field(
+        3, validation_alias="BROADCAST_MAX_RETRIES"
+    )
+    blocking_executor_workers: int = Field(
+        8, validation_alias="BLOCKING_EXECUTOR_WORKERS"
+    )
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,172 @@
+"""Thread pool for blocking work called from async handlers.
+
+Repositories, the Excel loader and the PDF builders are synchronous. Calling
+them straight from an ``async def`` stalls the event loop, and with it every
+other API request and the embedded Telegram application. :func:`run_blocking`
+runs such a call in a shared pool of ``BLOCKING_EXECUTOR_WORKERS`` threads.
+
+:class:`ExecutorMetrics` keeps the time each kind of call waited for a
+thread and ran in it. :func:`track_request` additionally splits the time of
+an API request into the part spent waiting for the pool and the rest, which
+ran on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from app.config import BLOCKING_EXECUTOR_WORKERS
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# seconds the current request waited for the pool; a list so tasks spawned
+# by the request share it with the middleware
+_request_offload: ContextVar[Optional[List[float]]] = ContextVar(
+    "request_offload", default=None
+)
+
+
+@dataclass
+class CallStats:
+    calls: int = 0
+    errors: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+    max_run_seconds: float = 0.0
+
+
+class ExecutorMetrics:
+    """Thread-safe counters for :func:`run_blocking` and API requests."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls: Dict[str, CallStats] = {}
+            self._requests = 0
+            self._request_seconds = 0.0
+            self._offloaded_seconds = 0.0
+
+    def record_call(self, label: str, wait: float, run: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._calls.setdefault(label, CallStats())
+            stats.calls += 1
+            stats.errors += int(failed)
+            stats.wait_seconds += wait
+            stats.run_seconds += run
+            stats.max_run_seconds = max(stats.max_run_seconds, run)
+
+    def record_request(self, elapsed: float, offloaded: float) -> None:
+        with self._lock:
+            self._requests += 1
+            self._request_seconds += elapsed
+            self._offloaded_seconds += min(offloaded, elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": max(1, BLOCKING_EXECUTOR_WORKERS),
+                "requests": {
+                    "count": self._requests,
+                    "total_seconds": self._request_seconds,
+                    "executor_seconds": self._offloaded_seconds,
+                    "loop_seconds": self._request_seconds - self._offloaded_seconds,
+                },
+                "calls": {label: asdict(s) for label, s in sorted(self._calls.items())},
+            }
+
+
+_metrics = ExecutorMetrics()
+
+
+def get_executor_metrics() -> ExecutorMetrics:
+    return _metrics
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, BLOCKING_EXECUTOR_WORKERS),
+                thread_name_prefix="blocking",
+            )
+        return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+async def run_blocking(
+    func: Callable[..., T],
+    *args: Any,
+    label: Optional[str] = None,
+    lock: Optional[asyncio.Lock] = None,
+    **kwargs: Any,
+) -> T:
+    """Run ``func(*args, **kwargs)`` in the pool and return its result.
+
+    ``lock`` is held around the call, which serializes work on objects that
+    are not thread-safe, such as an in-memory repository. It is acquired on
+    the event loop before the call is submitted, so queued calls do not hold
+    pool threads; time spent waiting for it counts as waiting for the pool.
+    """
+    label = label or getattr(func, "__qualname__", repr(func))
+    submitted = time.perf_counter()
+    timing: Dict[str, float] = {}
+
+    def call() -> T:
+        started = time.perf_counter()
+        timing["wait"] = started - submitted
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timing["run"] = time.perf_counter() - started
+
+    failed = False
+    try:
+        async with lock if lock is not None else nullcontext():
+            return await asyncio.get_running_loop().run_in_executor(
+                get_executor(), call
+            )
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - submitted
+        _metrics.record_call(
+            label, timing.get("wait", elapsed), timing.get("run", 0.0), failed
+        )
+        offloaded = _request_offload.get()
+        if offloaded is not None:
+            offloaded[0] += elapsed
+
+
+@contextmanager
+def track_request() -> Iterator[None]:
+    """Record the wall time of a request and how much of it was offloaded."""
+    offloaded = [0.0]
+    token = _request_offload.set(offloaded)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _request_offload.reset(token)
+        _metrics.record_request(time.perf_counter() - started, offloaded[0])
@@ -1,8 +1,12 @@
+from functools import lru_cache
+
 from PIL import Image, ImageDraw, ImageFont
 import pandas as pd
 import os
 from .logger import log
 
+FONT_NAME = "arial.ttf"
+
 COLORS = {
     "П": "#ADD8E6",  # голубой
     "Ц": "#8A2BE2",  # фиолетовый
@@ -17,15 +21,39 @@ COLORS = {
 }
 
 
+@lru_cache(maxsize=None)
+def _load_font(name: str, size: int):
+    try:
+        return ImageFont.truetype(name, size)
+    except IOError:
+        return ImageFont.load_default()
+
+
+def get_font(size: int, name: str = FONT_NAME):
+    """Загружает шрифт один раз на процесс; без файла — шрифт по умолчанию."""
+    return _load_font(name, size)
+
+
+@lru_cache(maxsize=4096)
+def text_length(text: str, size: int, name: str = FONT_NAME) -> float:
+    """Ширина строки, как у ``ImageDraw.textlength``."""
+    return get_font(size, name).getlength(text, mode="L")
+
+
+@lru_cache(maxsize=4096)
+def text_size(text: str, size: int, name: str = FONT_NAME) -> tuple[int, int]:
+    """Ширина и высота рамки строки, как у ``ImageDraw.textbbox``."""
+    left, top, right, bottom = get_font(size, name).getbbox(text, mode="L")
+    return right - left, bottom - top
+
+
 def create_combined_table_image(tables, filename="salary_report.png"):
     """
     Генерирует изображение с таблицами отчёта.
     Заголовки таблиц центрируются, ключи выравниваются вправо, значения — влево.
     """
-    try:
-        font = ImageFont.truetype("arial.ttf", 18)
-    except IOError:
-        font = ImageFont.load_default()
+    font_size = 18
+    font = get_font(font_size)
 
     padding = 40
     column_spacing = 20
@@ -85,7 +113,7 @@ def create_combined_table_image(tables, filename="salary_report.png"):
             fill="lightgray",
             outline="black",
         )
-        text_width = draw.textlength(table[0][0], font=font)
+        text_width = text_length(table[0][0], font_size)
         draw.text(
             ((img_width - text_width) / 2, y_offset + 15),
             table[0][0],
@@ -102,7 +130,7 @@ def create_combined_table_image(tables, filename="salary_report.png"):
                 continue
             key, value = row
             value_lines = value.split("\n")
-            key_x = padding + max_key_width - draw.textlength(key, font=font)
+            key_x = padding + max_key_width - text_length(key, font_size)
             value_x = padding + max_key_width + column_spacing
             draw.line(
                 [(padding, y_offset), (img_width - padding, y_offset)],
@@ -196,17 +224,14 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
     img = Image.new("RGB", (img_width, img_height), "white")
     draw = ImageDraw.Draw(img)
 
-    try:
-        font = ImageFont.truetype("arial.ttf", 16)
-    except IOError:
-        font = ImageFont.load_default()
+    font_size = 16
+    font = get_font(font_size)
 
     draw.rectangle(
         [0, 0, img_width, month_header_height], fill="#E0E0E0", outline="black"
     )
     month_text = sheet_name.upper()
-    bbox = draw.textbbox((0, 0), month_text, font=font)
-    w_text, h_text = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    w_text, h_text = text_size(month_text, font_size)
     draw.text(
         ((img_width - w_text) / 2, (month_header_height - h_text) / 2),
         month_text,
@@ -235,8 +260,7 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
             fill=fill_color,
             outline="black",
         )
-        bbox = draw.textbbox((0, 0), day, font=font)
-        w_day, h_day = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        w_day, h_day = text_size(day, font_size)
         draw.text(
             (
                 x0 + (cell_width - w_day) / 2,
@@ -264,8 +288,7 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
             fill=fill_color,
             outline="black",
         )
-        bbox = draw.textbbox((0, 0), wd, font=font)
-        w_wd, h_wd = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        w_wd, h_wd = text_size(wd, font_size)
         draw.text(
             (
                 x0 + (cell_width - w_wd) / 2,
@@ -283,8 +306,7 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
         fill="#D3D3D3",
         outline="black",
     )
-    bbox = draw.textbbox((0, 0), employee_name, font=font)
-    w_emp, h_emp = bbox[2] - bbox[0], bbox[3] - bbox[1]
+    w_emp, h_emp = text_size(employee_name, font_size)
     draw.text(
         ((left_width - w_emp) / 2, y_data_top + (data_row_height - h_emp) / 2),
         employee_name,
@@ -305,8 +327,7 @@ def create_schedule_image(data, employee_name, sheet_name, weekdays):
             fill=cell_bg,
             outline="black",
         )
-        bbox = draw.textbbox((0, 0), val_str, font=font)
-        w_val, h_val = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        w_val, h_val = text_size(val_str, font_size)
         draw.text(
             (
                 x0 + (cell_width - w_val) / 2,
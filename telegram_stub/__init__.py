@@ -9,6 +9,9 @@ class Bot:
     async def send_message(self, *args, **kwargs):
         pass
 
+    async def send_photo(self, *args, **kwargs):
+        pass
+
 class Chat:
     def __init__(self, id=None, type=None):
         self.id = id
@@ -1,2 +1,24 @@
-class BadRequest(Exception):
+class TelegramError(Exception):
     pass
+
+
+class NetworkError(TelegramError):
+    pass
+
+
+class BadRequest(NetworkError):
+    pass
+
+
+class TimedOut(NetworkError):
+    pass
+
+
+class Forbidden(TelegramError):
+    pass
+
+
+class RetryAfter(TelegramError):
+    def __init__(self, retry_after):
+        super().__init__(f"Flood control exceeded. Retry in {retry_after} seconds")
+        self.retry_after = retry_after
@@ -0,0 +1,25 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _redirect_file_logs(tmp_path_factory):
+    """Send the app's file logs (``bot.log``, ``logs/*.log``) to a temp dir.
+
+    The handlers are attached when the modules are imported, before any test
+    can change the working directory.
+    """
+    target = tmp_path_factory.mktemp("logs")
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    for logger in loggers:
+        for handler in logger.handlers:
+            if isinstance(handler, logging.FileHandler):
+                handler.close()
+                handler.baseFilename = str(target / Path(handler.baseFilename).name)
+    yield
@@ -71,3 +71,93 @@ def test_user_permissions_override(tmp_path: Path) -> None:
 
     buttons = service.get_bot_button_texts("123")
     assert any("Личный кабинет" in text for text in buttons)
+
+
+class VersionedEmployeeRepo(DummyEmployeeRepo):
+    version = 0
+
+
+def test_verified_tokens_are_cached_until_config_changes(tmp_path: Path) -> None:
+    employee = type('Employee', (), {'full_name': 'Manager User', 'name': 'Manager User'})
+    repo = VersionedEmployeeRepo({'admin': employee})
+    service = AccessControlService(
+        path=tmp_path / "access.json", secret_key="secret", employee_repo=repo
+    )
+    token = service.issue_token("admin")
+
+    first = service.verify_token(token)
+    assert service.verify_token(token) is first
+    assert repo.called == ["admin"]
+
+    repo.version += 1
+    assert service.verify_token(token) is not first
+    assert len(repo.called) == 2
+
+    service.update_user("admin", {"permissions": ["employees"]})
+    assert service.verify_token(token).permissions == ["employees"]
+    assert len(repo.called) == 3
+
+
+def test_visibility_is_materialized_per_user(tmp_path: Path) -> None:
+    def employee(emp_id: str, work_place: str, archived: bool = False):
+        return type('Employee', (), {'id': emp_id, 'work_place': work_place, 'archived': archived})
+
+    class ScopedRepo(VersionedEmployeeRepo):
+        listed = 0
+
+        def list_employees(self, archived=False, work_place=None):
+            self.listed += 1
+            return [
+                e for e in self.mapping.values()
+                if (archived is None or e.archived == archived)
+                and (work_place is None or e.work_place in work_place)
+            ]
+
+    repo = ScopedRepo({
+        "1": employee("1", "Центр"),
+        "2": employee("2", "Север"),
+        "3": employee("3", "Центр", archived=True),
+    })
+    service = AccessControlService(
+        path=tmp_path / "access.json", secret_key="secret", employee_repo=repo
+    )
+    service.create_user({
+        "id": "m", "login": "m", "password": "p", "allowed_departments": ["Центр"],
+    })
+    user = service.resolve_user("m")
+    listed = repo.listed
+
+    assert service.visible_employee_ids(user) == {"1"}
+    assert service.is_employee_visible(user, "3")
+    assert not service.is_employee_visible(user, "2")
+    assert service.is_employee_visible(user, None, "Центр")
+    assert repo.listed == listed + 1
+
+    repo.mapping["2"] = employee("2", "Центр")
+    repo.version += 1
+    assert service.visible_employee_ids(user) == {"1", "2"}
+
+
+def test_user_and_role_indexes_follow_changes(tmp_path: Path) -> None:
+    service = AccessControlService(
+        path=tmp_path / "access.json", secret_key="secret", employee_repo=DummyEmployeeRepo()
+    )
+    for i in range(50):
+        service.create_user({"id": f"u{i}", "login": f"user{i}", "password": "p", "role_id": "employee"})
+
+    assert len(service.list_users()) == 51
+    assert service.authenticate("user7", "p").role_name == "Сотрудник"
+
+    service.update_user("u7", {"login": "renamed"})
+    assert service.authenticate("user7", "p") is None
+    assert service.authenticate("renamed", "p").id == "u7"
+
+    service.delete_user("u7")
+    assert service.resolve_user("u7") is None
+    service.update_role("employee", {"name": "Staff"})
+    assert service.resolve_user("u8").role_name == "Staff"
+
+    reopened = AccessControlService(
+        path=tmp_path / "access.json", secret_key="secret", employee_repo=DummyEmployeeRepo()
+    )
+    assert reopened.resolve_user("u8").login == "user8"
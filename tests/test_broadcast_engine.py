@@ -0,0 +1,238 @@
+import asyncio
+import json
+
+from telegram_stub import Bot
+from telegram_stub.error import BadRequest, RetryAfter
+
+from app.core.types import Employee
+from app.services.broadcast_engine import (
+    FAILED,
+    SENT,
+    UNKNOWN,
+    BroadcastEngine,
+    BroadcastProgress,
+)
+from app.services.telegram_service import TelegramService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = 0
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        target = self.now + seconds
+        self.sleeps += 1
+        await asyncio.sleep(0)
+        self.now = max(self.now, target)
+
+
+class FloodBot(Bot):
+    """Stub bot that enforces Telegram's limits like the real API."""
+
+    def __init__(self, clock, retry_after=1, failing=()):
+        super().__init__("token")
+        self.clock = clock
+        self.retry_after = retry_after
+        self.failing = set(failing)
+        self.sent = []
+        self.floods = 0
+
+    async def send_message(self, chat_id, text=None, **kwargs):
+        now = self.clock.now
+        if str(chat_id) in self.failing:
+            raise BadRequest("Chat not found")
+        recent = [c for t, c in self.sent if t > now - 1]
+        if len(recent) >= 30 or str(chat_id) in recent:
+            self.floods += 1
+            raise RetryAfter(self.retry_after)
+        self.sent.append((now, str(chat_id)))
+
+    send_photo = send_message
+
+
+def test_engine_paces_sends_under_flood_limits():
+    clock = FakeClock()
+    bot = FloodBot(clock)
+    engine = BroadcastEngine(concurrency=8, rate=25, clock=clock)
+    chats = [str(i) for i in range(200)]
+
+    results = asyncio.run(engine.run(chats, lambda c: bot.send_message(chat_id=c)))
+
+    assert [r.chat_id for r in results] == chats
+    assert all(r.status == SENT and r.attempts == 1 for r in results)
+    assert bot.floods == 0
+    # one send every 1/25 s
+    assert 7.5 < clock.now < 8.5
+
+
+def test_engine_waits_out_retry_after():
+    clock = FakeClock()
+    bot = FloodBot(clock, retry_after=5)
+    # twice the allowed rate makes the bot answer with RetryAfter
+    engine = BroadcastEngine(concurrency=4, rate=60, clock=clock)
+
+    results = asyncio.run(
+        engine.run([str(i) for i in range(90)], lambda c: bot.send_message(chat_id=c))
+    )
+
+    assert all(r.status == SENT for r in results)
+    assert bot.floods > 0
+    assert len(bot.sent) == 90
+    assert clock.now >= 5
+
+
+def test_progress_resumes_only_missing_chats(tmp_path):
+    clock = FakeClock()
+    path = tmp_path / "batch.json"
+    bot = FloodBot(clock, failing={"2"})
+
+    first = asyncio.run(
+        BroadcastEngine(clock=clock, progress=BroadcastProgress(path)).run(
+            ["1", "2", "3"], lambda c: bot.send_message(chat_id=c)
+        )
+    )
+    assert [r.status for r in first] == [SENT, FAILED, SENT]
+    assert first[1].attempts == 1
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert {r["chat_id"]: r["status"] for r in lines}["2"] == FAILED
+
+    bot.failing.clear()
+    clock.now += 10
+    second = asyncio.run(
+        BroadcastEngine(clock=clock, progress=BroadcastProgress(path)).run(
+            ["1", "2", "3"], lambda c: bot.send_message(chat_id=c)
+        )
+    )
+    assert [(r.status, r.resumed) for r in second] == [
+        (SENT, True),
+        (SENT, False),
+        (SENT, True),
+    ]
+    assert [c for _, c in bot.sent] == ["1", "3", "2"]
+
+
+def test_telegram_service_broadcast_uses_engine(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class Repo:
+        def list_employees(self, **filters):
+            return [
+                Employee(id=str(100000 + i), name=f"E{i}", full_name="", phone="")
+                for i in range(60)
+            ] + [Employee(id="fake", name="Fake", full_name="", phone="")]
+
+    clock = FakeClock()
+    service = TelegramService(Repo(), clock=clock)
+    service.bot = FloodBot(clock, failing={"100007"})
+
+    result = asyncio.run(service.broadcast_message_to_all("Привет, {name}!"))
+
+    assert result["sent"] == 59 and result["total"] == 61
+    assert service.bot.floods == 0
+    (entry,), _ = service.list_log()
+    assert entry["id"] == result["batch_id"]
+    statuses = {r["user_id"]: r["status"] for r in entry["recipients"]}
+    assert statuses["100000"] == "отправлено"
+    assert statuses["100007"].startswith("ошибка")
+    assert statuses["fake"] == "невалидный id"
+    # the failed chat keeps the progress file for a resumed run
+    assert (tmp_path / "logs" / "broadcasts" / f"{result['batch_id']}.jsonl").exists()
+
+
+def test_network_errors_are_retried_with_backoff():
+    from telegram.error import NetworkError
+
+    clock = FakeClock()
+    calls = []
+
+    async def send(chat_id):
+        calls.append(clock.now)
+        if len(calls) < 3:
+            raise NetworkError("connection reset")
+
+    (result,) = asyncio.run(BroadcastEngine(clock=clock, backoff=1).run(["1"], send))
+
+    assert result.status == SENT and result.attempts == 3
+    assert calls[2] - calls[0] >= 3  # waited 1 s, then 2 s
+
+
+def test_timeouts_are_not_resent(tmp_path):
+    from telegram.error import TimedOut
+
+    clock = FakeClock()
+    path = tmp_path / "batch.jsonl"
+    calls = []
+
+    async def send(chat_id):
+        calls.append(chat_id)
+        if chat_id == "1":
+            raise TimedOut()
+
+    def run():
+        engine = BroadcastEngine(clock=clock, progress=BroadcastProgress(path))
+        return asyncio.run(engine.run(["1", "2"], send))
+
+    assert [r.status for r in run()] == [UNKNOWN, SENT]
+    # a resumed run sends to neither chat again
+    assert [(r.status, r.resumed) for r in run()] == [(UNKNOWN, True), (SENT, True)]
+    assert calls == ["1", "2"]
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+
+def test_broadcast_photo_is_uploaded_once(tmp_path, monkeypatch):
+    import types
+
+    monkeypatch.chdir(tmp_path)
+
+    class PhotoBot(Bot):
+        def __init__(self):
+            super().__init__("token")
+            self.photos = []
+
+        async def send_photo(self, chat_id, photo, **kwargs):
+            self.photos.append(photo)
+            size = types.SimpleNamespace(file_id=f"id-{len(self.photos)}")
+            return types.SimpleNamespace(message_id=len(self.photos), photo=[size])
+
+    class Repo:
+        def list_employees(self, **filters):
+            return [
+                Employee(id=str(100000 + i), name=f"E{i}", full_name="", phone="")
+                for i in range(20)
+            ]
+
+        def get_employee(self, employee_id):
+            return None
+
+    url = "https://example.com/a.png"
+    service = TelegramService(Repo(), clock=FakeClock())
+    service.bot = PhotoBot()
+    result = asyncio.run(service.broadcast_message_to_all("Hi", photo_url=url))
+
+    assert result["sent"] == 20
+    assert service.bot.photos == [url] + ["id-1"] * 19
+
+    # the file id survives into a new service and personal messages
+    service = TelegramService(Repo(), clock=FakeClock())
+    service.bot = PhotoBot()
+    asyncio.run(service.send_message_to_user("100001", "Hi", photo_url=url))
+    assert service.bot.photos == ["id-1"]
+
+
+def test_admin_broadcast_fails_messages_without_text_or_photo():
+    from types import SimpleNamespace
+
+    from app.handlers.admin.broadcast import send_broadcast_message
+
+    bot = FloodBot(FakeClock())
+    app = SimpleNamespace(bot=bot)
+    message = SimpleNamespace(text=None, photo=None, caption=None)
+
+    delivered = asyncio.run(send_broadcast_message(app, message, [101, 102]))
+
+    assert delivered == 0
+    assert bot.sent == []
@@ -0,0 +1,57 @@
+import json
+import os
+
+from app.data.change_detector import FileChangeDetector
+from app.data.payout_repository import PayoutRepository
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_detector_ignores_touch_but_sees_new_content(tmp_path):
+    path = tmp_path / "data.json"
+    _write(path, [1])
+    detector = FileChangeDetector([path], racy_window=0)
+    detector.mark_seen()
+
+    assert detector.changed() is False
+    os.utime(path, ns=(1, 1))
+    assert detector.changed() is False
+
+    _write(path, [2])
+    assert detector.changed() is True
+    assert detector.stats() == {"hits": 2, "misses": 1}
+
+
+def test_detector_hashes_racy_same_size_rewrite(tmp_path):
+    path = tmp_path / "data.json"
+    _write(path, [1])
+    detector = FileChangeDetector([path])
+    detector.mark_seen()
+    stat = os.stat(path)
+
+    _write(path, [2])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert detector.changed() is True
+
+
+def test_payout_reload_skips_unchanged_file(tmp_path, monkeypatch):
+    path = tmp_path / "advance_requests.json"
+    _write(path, [{"id": 1, "user_id": "1", "amount": 100}])
+    repo = PayoutRepository(str(path))
+    loads = []
+    original = repo._load
+    monkeypatch.setattr(repo, "_load", lambda: loads.append(1) or original())
+
+    repo.reload()
+    repo.create({"user_id": "2", "amount": 50})
+    repo.reload()
+    assert loads == []
+
+    _write(path, [{"id": 1, "user_id": "1", "amount": 300}])
+    repo.reload()
+    assert loads == [1]
+    assert repo.load_all()[0]["amount"] == 300
+    assert repo.reload_stats() == {"hits": 2, "misses": 1}
@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+
+from app.core.enums import EmployeeStatus
+from app.core.types import Employee
+from app.data.employee_repository import EmployeeRepository
+from app.data.json_storage import JsonStorage
+from app.services.employee_service import EmployeeService
+
+
+def _repo(tmp_path):
+    today = datetime.utcnow().date()
+    users = {
+        "1": {"name": "A", "position": "cook", "work_place": "Цех", "tags": ["x"], "birthdate": "1990-01-01"},
+        "2": {"name": "B", "position": "admin", "work_place": "Пассаж", "tags": ["x", "y"],
+              "birthdate": today.replace(year=1995).isoformat()},
+        "3": {"name": "C", "status": "inactive", "archived": True, "work_place": "Цех"},
+        "4": "broken",
+    }
+    path = tmp_path / "user.json"
+    path.write_text(json.dumps(users), encoding="utf-8")
+    return EmployeeRepository(JsonStorage(str(path)))
+
+
+def test_filters_use_indexes_and_keep_file_order(tmp_path):
+    repo = _repo(tmp_path)
+
+    assert [e.id for e in repo.list_employees()] == ["1", "2"]
+    assert [e.id for e in repo.list_employees(archived=None)] == ["1", "2", "3"]
+    assert [e.id for e in repo.list_employees(archived=None, work_place="Цех")] == ["1", "3"]
+    assert [e.id for e in repo.list_employees(tags=["y"])] == ["2"]
+    assert [e.id for e in repo.list_employees(position=["cook", "admin"], tags=["x"])] == ["1", "2"]
+    assert [e.id for e in repo.list_employees(archived=None, status="inactive")] == ["3"]
+    assert [e.id for e in repo.list_employees(birthday_today=True)] == ["2"]
+    # materialized objects are reused between calls
+    assert repo.list_employees()[0] is repo.get_employee("1")
+    assert repo.get_employee("4") is None
+
+
+def test_writes_invalidate_only_changed_records(tmp_path):
+    repo = _repo(tmp_path)
+    service = EmployeeService(repo)
+    untouched = repo.get_employee("2")
+    version = repo.version
+
+    service.update_employee("1", position="admin", tags=["z"])
+
+    assert repo.version > version
+    assert repo.get_employee("2") is untouched
+    assert [e.id for e in repo.list_employees(position="admin")] == ["1", "2"]
+    assert repo.list_employees(position="cook") == []
+    assert [e.id for e in repo.list_employees(tags=["z"])] == ["1"]
+
+    service.add_employee(Employee(id="5", name="E", full_name="", phone="", position="cook"))
+    service.remove_employee("2")
+    assert [e.id for e in repo.list_employees()] == ["1", "5"]
+    assert repo.get_employee("5").status is EmployeeStatus.ACTIVE
@@ -81,3 +81,15 @@ def test_archive_employee_with_string_status_after_update():
 
     assert archived is not None
     assert archived.archived is True
+
+
+def test_update_to_taken_id_leaves_cached_employee_untouched():
+    first = make_employee("1", EmployeeStatus.ACTIVE)
+    repo = InMemoryEmployeeRepo([first, make_employee("2", EmployeeStatus.ACTIVE)])
+    service = EmployeeService(repo)
+
+    with pytest.raises(ValueError):
+        service.update_employee("1", id="2", name="Renamed")
+
+    assert first.name == "Emp 1"
+    assert service.get_employee("1").name == "Emp 1"
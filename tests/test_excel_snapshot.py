@@ -0,0 +1,61 @@
+import os
+from datetime import datetime
+
+import pandas as pd
+from openpyxl import Workbook
+
+from app.services import workbook_cache
+from app.services.excel_snapshot import SnapshotStore
+from app.services.workbook_cache import WorkbookCache
+
+
+def _workbook(path, amount):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "МАРТ"
+    ws.append(["отчёт"])
+    ws.append(["ИМЯ", "ОКЛАД", "ДАТА", "Комментарий", datetime(2025, 3, 1)])
+    ws.append(["Вера", amount, datetime(2025, 3, 5), "ок", 1])
+    ws.append(["Юля", 2.5, datetime(2025, 3, 6), 7, None])
+    wb.save(path)
+
+
+def test_snapshot_round_trips_sheet(tmp_path):
+    path = str(tmp_path / "salary.xlsx")
+    _workbook(path, 100)
+    store = SnapshotStore(str(tmp_path / "snap"))
+
+    assert store.build(path) == 2
+    for header in (1, None):
+        expected = pd.read_excel(path, sheet_name="МАРТ", header=header)
+        snapshot = store.load(path, "МАРТ", header)
+        assert snapshot.columns.tolist() == expected.columns.tolist()
+        assert snapshot.dtypes.tolist() == expected.dtypes.tolist()
+        assert snapshot.astype(object).equals(expected.astype(object))
+    assert store.sheet_names(path) == ["МАРТ"]
+    assert store.build(path) == 0
+
+
+def test_cache_reads_snapshot_written_by_another_process(tmp_path, monkeypatch):
+    path = str(tmp_path / "salary.xlsx")
+    _workbook(path, 100)
+    store = SnapshotStore(str(tmp_path / "snap"))
+    WorkbookCache(10 * 1024 * 1024, snapshots=store).dataframe(path, "МАРТ", header=1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("workbook parsed again")
+
+    monkeypatch.setattr(workbook_cache.pd, "read_excel", fail)
+    fresh = WorkbookCache(10 * 1024 * 1024, snapshots=store)
+    assert fresh.dataframe(path, "МАРТ", header=1)["ОКЛАД"].tolist() == [100, 2.5]
+    monkeypatch.undo()
+
+    versions = [os.path.basename(store.version_dir(path))]
+    for amount in (300, 400):
+        _workbook(path, amount)
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + amount * 1_000_000_000))
+        versions.append(os.path.basename(store.version_dir(path)))
+        assert fresh.dataframe(path, "МАРТ", header=1)["ОКЛАД"].tolist() == [amount, 2.5]
+    # the previous version may still be mapped by other processes
+    assert sorted(os.listdir(store.root)) == sorted(versions[1:])
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.executor import get_executor_metrics, run_blocking, track_request
+
+
+def test_blocking_work_leaves_the_loop_free():
+    metrics = get_executor_metrics()
+    metrics.reset()
+    release = threading.Event()
+    active = []
+    overlap = []
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        lock = asyncio.Lock()
+        entered = asyncio.Event()
+
+        def blocked(value):
+            active.append(value)
+            overlap.append(len(active))
+            loop.call_soon_threadsafe(entered.set)
+            # returns only once the loop, still free, releases it
+            release.wait(timeout=5)
+            active.remove(value)
+            return value, threading.current_thread().name
+
+        with track_request():
+            calls = asyncio.gather(
+                *(run_blocking(blocked, i, lock=lock, label="blocked") for i in range(2))
+            )
+            await entered.wait()
+            assert not release.is_set()
+            release.set()
+            return await calls
+
+    results = asyncio.run(main())
+
+    assert sorted(value for value, _ in results) == [0, 1]
+    assert all(name.startswith("blocking") for _, name in results)
+    # the lock serialized the calls, so one of them waited for the other
+    assert overlap == [1, 1]
+    snapshot = metrics.snapshot()
+    stats = snapshot["calls"]["blocked"]
+    assert stats["calls"] == 2 and stats["errors"] == 0
+    assert stats["wait_seconds"] > 0
+    requests = snapshot["requests"]
+    assert requests["count"] == 1
+    assert requests["executor_seconds"] <= requests["total_seconds"]
+
+
+def test_calls_without_a_lock_run_in_parallel():
+    barrier = threading.Barrier(2, timeout=5)
+
+    async def main():
+        # both calls must be inside the pool at once to pass the barrier
+        return await asyncio.gather(*(run_blocking(barrier.wait) for _ in range(2)))
+
+    assert sorted(asyncio.run(main())) == [0, 1]
+
+
+def test_errors_are_counted_and_raised():
+    metrics = get_executor_metrics()
+    metrics.reset()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run_blocking(fail))
+    stats = metrics.snapshot()["calls"]
+    assert list(stats.values())[0]["errors"] == 1
+
+
+def test_vacation_service_uses_the_pool():
+    from app.schemas.vacation import VacationUpdate
+    from app.services.vacation_service import VacationService
+
+    class Repo:
+        def __init__(self):
+            self.threads = []
+
+        def list(self, *args):
+            self.threads.append(threading.current_thread().name)
+            return [{"id": "1", "start_date": "2024-05-10", "end_date": "2024-05-20"}]
+
+    repo = Repo()
+    service = VacationService(repo=repo)
+
+    with pytest.raises(ValueError):
+        asyncio.run(
+            service.update_vacation("1", VacationUpdate(start_date="2024-06-01"))
+        )
+    assert repo.threads and all(name.startswith("blocking") for name in repo.threads)
@@ -0,0 +1,33 @@
+import pandas as pd
+from PIL import Image, ImageDraw
+
+from app.utils import image
+from app.utils.image import get_font, text_length, text_size
+
+
+def test_metrics_match_image_draw():
+    draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+    font = get_font(16)
+    for text in ("31", "сб", "Оз", "Иванов Иван"):
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        assert text_size(text, 16) == (right - left, bottom - top)
+        assert text_length(text, 16) == draw.textlength(text, font=font)
+
+
+def test_schedule_images_reuse_fonts_and_metrics(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    image._load_font.cache_clear()
+    text_size.cache_clear()
+    days = list(range(1, 31))
+    data = pd.DataFrame(
+        [[f"E{i}", ""] + ["П" if d % 2 else "Оз" for d in days] for i in range(5)],
+        columns=["ИМЯ", "X"] + days,
+    )
+    weekdays = ["пн", "вт", "ср", "чт", "пт", "сб", "вс"] * 5
+
+    for i in range(5):
+        assert image.create_schedule_image(data, f"E{i}", "май", weekdays)
+
+    assert image._load_font.cache_info().misses == 1
+    # day numbers, weekdays and codes are measured once for all employees
+    assert text_size.cache_info().misses == 1 + 30 + 7 + 5 + 2
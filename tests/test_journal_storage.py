@@ -0,0 +1,109 @@
+import json
+
+from app.data import journal_storage
+from app.data.journal_storage import JournalStorage, journal_path
+from app.data.payout_repository import PayoutRepository, load_advance_requests
+
+
+def _journal_lines(path):
+    return journal_path(path).read_text(encoding="utf-8").splitlines()
+
+
+def test_payout_changes_are_appended_and_replayed(monkeypatch, tmp_path):
+    monkeypatch.setattr(journal_storage, "STORAGE_ENGINE", "journal")
+    monkeypatch.setattr(journal_storage, "JOURNAL_COMPACT_THRESHOLD", 1000)
+    path = tmp_path / "advance_requests.json"
+    path.write_text(json.dumps([{"id": 1, "user_id": "1", "amount": 100}]), encoding="utf-8")
+
+    repo = PayoutRepository(str(path))
+    created = repo.create({"user_id": "2", "amount": 200})
+    repo.update("1", {"amount": 150})
+    repo.delete(created["id"])
+
+    # snapshot is untouched, every change went to the journal
+    assert json.loads(path.read_text(encoding="utf-8"))[0]["amount"] == 100
+    assert len(_journal_lines(path)) == 3
+
+    reopened = PayoutRepository(str(path))
+    assert [(p["id"], p["amount"]) for p in reopened.load_all()] == [(1, 150)]
+    assert [p["amount"] for p in load_advance_requests(str(path))] == [150]
+
+
+def test_first_write_creates_snapshot(monkeypatch, tmp_path):
+    monkeypatch.setattr(journal_storage, "STORAGE_ENGINE", "journal")
+    path = tmp_path / "advance_requests.json"
+
+    repo = PayoutRepository(str(path))
+    repo.create({"user_id": "1", "amount": 100})
+
+    assert path.exists()
+    assert [p["amount"] for p in PayoutRepository(str(path)).load_all()] == [100]
+
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    path = tmp_path / "users.json"
+    storage = JournalStorage(path, compact_threshold=2)
+    storage.save({"1": {"name": "A"}})
+    storage.save({"1": {"name": "A"}, "2": {"name": "B"}})
+    storage.compact({"1": {"name": "A"}, "2": {"name": "B"}})
+
+    assert not journal_path(path).exists()
+    assert json.loads(path.read_text(encoding="utf-8")) == {
+        "1": {"name": "A"},
+        "2": {"name": "B"},
+    }
+
+
+def test_dict_save_journals_only_changed_keys(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps({"1": {"name": "A"}, "2": {"name": "B"}}), encoding="utf-8")
+    storage = JournalStorage(path, compact_threshold=1000)
+    data = storage.load()
+
+    data["2"] = {"name": "C"}
+    del data["1"]
+    storage.save(data)
+
+    entries = [json.loads(line) for line in _journal_lines(path)]
+    assert entries == [
+        {"op": "put", "key": "2", "value": {"name": "C"}},
+        {"op": "delete", "key": "1"},
+    ]
+    assert JournalStorage(path, compact_threshold=1000).load() == {"2": {"name": "C"}}
+
+
+def test_leftover_journal_is_replayed_by_json_engine(monkeypatch, tmp_path):
+    monkeypatch.setattr(journal_storage, "STORAGE_ENGINE", "json")
+    path = tmp_path / "advance_requests.json"
+    path.write_text(json.dumps([{"id": 1, "amount": 100}]), encoding="utf-8")
+    journal_path(path).write_text(
+        json.dumps({"op": "put", "key": "1", "value": {"id": 1, "amount": 300}}) + "\n"
+        + '{"op": "put", "key"',
+        encoding="utf-8",
+    )
+
+    repo = PayoutRepository(str(path))
+    assert repo.load_all()[0]["amount"] == 300
+
+    repo.update("1", {"amount": 400})
+    assert not journal_path(path).exists()
+    assert json.loads(path.read_text(encoding="utf-8"))[0]["amount"] == 400
+
+
+def test_compaction_keeps_entries_of_other_instances(tmp_path):
+    path = tmp_path / "advance_requests.json"
+    path.write_text("[]", encoding="utf-8")
+    other = JournalStorage(path, compact_threshold=1000)
+    storage = JournalStorage(path, compact_threshold=0)
+
+    other.put("B1", {"id": "B1"})
+    # the caller's snapshot never saw B1; compaction must not drop it
+    storage.put("A1", {"id": "A1"}, snapshot=[{"id": "A1"}])
+    storage.put("A2", {"id": "A2"}, snapshot=[{"id": "A1"}, {"id": "A2"}])
+
+    assert not journal_path(path).exists()
+    assert json.loads(path.read_text(encoding="utf-8")) == [
+        {"id": "B1"},
+        {"id": "A1"},
+        {"id": "A2"},
+    ]
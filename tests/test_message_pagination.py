@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.messages import create_message_router
+from app.api.telegram import create_telegram_router
+from app.data.message_repository import MessageRepository
+from app.data.sent_message_log import get_sent_message_log
+from app.data.sqlite_repositories import SqliteMessageRepository
+from app.data.timeline_index import decode_cursor, encode_cursor
+from app.services.message_service import MessageService
+
+
+def _messages():
+    return [
+        {
+            "id": str(i),
+            "user_id": str(i % 3),
+            "accepted": i % 2 == 0,
+            "timestamp": f"2024-01-{i // 2 + 1:02d}T00:00:00",
+        }
+        for i in range(1, 21)
+    ]
+
+
+def _pages(repo, **filters):
+    ids, cursor = [], None
+    while True:
+        items, cursor = repo.page(3, cursor, **filters)
+        ids.extend(m["id"] for m in items)
+        if cursor is None:
+            return ids
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(("2024-01-01T00:00:00", "Ω"))) == ("2024-01-01T00:00:00", "Ω")
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+@pytest.mark.parametrize("engine", ["json", "sqlite"])
+def test_message_pages_match_sorted_filters(tmp_path, engine):
+    if engine == "json":
+        path = tmp_path / "messages.json"
+        path.write_text(json.dumps(_messages()), encoding="utf-8")
+        repo = MessageRepository(path)
+    else:
+        repo = SqliteMessageRepository(f"sqlite:///{tmp_path / 'bot.db'}")
+        repo.import_records(_messages())
+
+    def expected(pred=lambda m: True):
+        items = sorted(_messages(), key=lambda m: (m["timestamp"], m["id"]), reverse=True)
+        return [m["id"] for m in items if pred(m)]
+
+    assert _pages(repo) == expected()
+    assert _pages(repo, user_id="1") == expected(lambda m: m["user_id"] == "1")
+    assert _pages(repo, user_id="2", accepted=False) == expected(
+        lambda m: m["user_id"] == "2" and not m["accepted"]
+    )
+    repo.accept("3")
+    assert "3" in _pages(repo, accepted=True)
+    assert "3" not in _pages(repo, accepted=False)
+
+
+def test_sent_messages_api_pages_with_filters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log = get_sent_message_log()
+    for i in range(7):
+        log.put({
+            "id": f"m{i}", "user_id": "1" if i % 2 else "2", "message": "Hi",
+            "message_id": i, "timestamp": f"2024-01-0{i + 1}", "broadcast": False,
+        })
+    log.put({
+        "id": "b1", "broadcast": True, "message": "All", "timestamp": "2024-01-05",
+        "recipients": [{"user_id": "1", "name": "A", "status": "отправлено"}],
+    })
+    log.update_by_message("1", 3, {"status": "принято", "accepted": True})
+
+    app = FastAPI()
+    app.include_router(create_telegram_router(object()))
+    messages = MessageService(MessageRepository(tmp_path / "messages.json"), object())
+    app.include_router(create_message_router(messages))
+    client = TestClient(app)
+
+    first = client.get("/telegram/sent_messages", params={"limit": 3, "user_id": "1"})
+    assert [m["id"] for m in first.json()] == ["m5", "b1", "m3"]
+    second = client.get(
+        "/telegram/sent_messages",
+        params={"limit": 3, "user_id": "1", "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert [m["id"] for m in second.json()] == ["m1"]
+    assert "X-Next-Cursor" not in second.headers
+
+    accepted = client.get("/telegram/sent_messages", params={"accepted": True})
+    assert [m["id"] for m in accepted.json()] == ["m3"]
+    batch = client.get("/telegram/sent_messages", params={"batch_id": "b1"})
+    assert [m["id"] for m in batch.json()] == ["b1"]
+    for url in ("/telegram/sent_messages", "/messages/"):
+        response = client.get(url, params={"cursor": "!"})
+        assert response.status_code == 400
+        assert response.json() == {"detail": "invalid_cursor"}
@@ -79,12 +79,12 @@ def test_payment_request_pattern_triggers_start():
         )
         with (
         patch("telegram_stub.Message.reply_text", new=AsyncMock()) as reply,
-        patch("app.handlers.user.payout.load_users_map", return_value={"1": {
+        patch("app.handlers.user.payout.get_user", return_value={
             "name": "Test",
             "phone": "123",
             "bank": "TB",
             "card_number": "9999",
-        }}),
+        }),
         patch("app.handlers.user.payout.check_pending_request", return_value=False),
     ):
             update = _make_message(bot, "💰 Запросить выплату")
@@ -112,18 +112,16 @@ def test_full_payout_conversation_creates_record():
                 new=AsyncMock(),
             ),
             patch(
-                "app.handlers.user.payout.load_users_map",
+                "app.handlers.user.payout.get_user",
                 return_value={
-                    "1": {
-                        "name": "Test",
-                        "phone": "123",
-                        "bank": "TB",
-                        "card_number": "9999",
-                    }
+                    "name": "Test",
+                    "phone": "123",
+                    "bank": "TB",
+                    "card_number": "9999",
                 },
             ),
             patch("app.handlers.user.payout.check_pending_request", return_value=False),
-            patch("app.handlers.user.payout.load_advance_requests", return_value=[]),
+            patch("app.handlers.user.payout.monthly_advance_total", return_value=0),
         ):
             state = await payout.request_payout_start(
                 _make_message(bot, "💰 Запросить выплату"), context
@@ -0,0 +1,105 @@
+import json
+import random
+from datetime import datetime
+
+from app.data.payout_repository import PayoutRepository
+
+
+def _linear(data, employee_id=None, status=None, from_date=None, to_date=None, user_ids=None):
+    from_dt = datetime.fromisoformat(from_date) if from_date else None
+    to_dt = datetime.fromisoformat(to_date) if to_date else None
+    dated, undated = [], []
+    for item in data:
+        if employee_id and str(item.get("user_id")) != str(employee_id):
+            continue
+        if user_ids is not None and str(item.get("user_id")) not in user_ids:
+            continue
+        if status and item.get("status") != status:
+            continue
+        try:
+            created = datetime.strptime(item["timestamp"], "%Y-%m-%d %H:%M:%S")
+        except Exception:
+            undated.append(item)
+            continue
+        if from_dt and created < from_dt or to_dt and created > to_dt:
+            continue
+        dated.append(item)
+    dated.sort(key=lambda i: i["timestamp"], reverse=True)
+    return [i["id"] for i in dated + undated]
+
+
+def test_indexed_list_matches_linear_scan(tmp_path):
+    rnd = random.Random(7)
+    path = tmp_path / "advance_requests.json"
+    path.write_text("[]", encoding="utf-8")
+    repo = PayoutRepository(str(path))
+    for _ in range(200):
+        ts = "bad" if rnd.random() < 0.05 else f"2024-0{rnd.randint(1, 6)}-1{rnd.randint(0, 9)} 10:00:00"
+        repo.create({
+            "user_id": str(rnd.randint(1, 5)),
+            "status": rnd.choice(["Ожидает", "Одобрено"]),
+            "timestamp": ts,
+        })
+    for payout_id in rnd.sample(range(1, 201), 40):
+        repo.update(str(payout_id), {"status": "Выплачено", "timestamp": "2024-03-15 10:00:00"})
+    repo.delete_many([str(i) for i in rnd.sample(range(1, 201), 30)])
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    cases = [
+        {},
+        {"employee_id": "3"},
+        {"status": "Выплачено"},
+        {"employee_id": 2, "status": "Ожидает", "from_date": "2024-02-01"},
+        {"from_date": "2024-03-15 10:00:00", "to_date": "2024-05-01"},
+        {"employee_id": "1", "to_date": "2024-01-01"},
+        {"user_ids": {"1", "4"}},
+        {"user_ids": ["2"], "status": "Выплачено", "from_date": "2024-02-01"},
+        {"user_ids": []},
+    ]
+    for case in cases:
+        assert [p["id"] for p in repo.list(**case)] == _linear(data, **case), case
+
+
+def test_timestamps_are_parsed_once(tmp_path, monkeypatch):
+    from app.data import payout_index
+
+    path = tmp_path / "advance_requests.json"
+    path.write_text(
+        json.dumps([
+            {"id": 1, "user_id": "1", "timestamp": "2024-01-02 03:04:05"},
+            {"id": 2, "user_id": "1", "timestamp": "oops"},
+        ]),
+        encoding="utf-8",
+    )
+    repo = PayoutRepository(str(path))
+    monkeypatch.setattr(payout_index, "parse_epoch", None)
+
+    first, second = repo.load_all()
+    assert repo.timestamp_epoch(first) == 1704164645
+    assert repo.timestamp_epoch(second) is None
+    assert [p["id"] for p in repo.list(from_date="2024-01-01")] == [1, 2]
+    assert payout_index.epoch_to_datetime(1704164645) == datetime(2024, 1, 2, 3, 4, 5)
+
+
+def test_monthly_totals_follow_writes(tmp_path):
+    path = tmp_path / "advance_requests.json"
+    path.write_text("[]", encoding="utf-8")
+    repo = PayoutRepository(str(path))
+    first = repo.create({"user_id": "1", "amount": 100, "payout_type": "Аванс", "status": "Ожидает", "timestamp": "2024-03-01 10:00:00"})
+    repo.create({"user_id": "1", "amount": 50, "status": "Одобрено", "timestamp": "2024-03-05 10:00:00"})
+    repo.create({"user_id": "1", "amount": 70, "payout_type": "Зарплата", "status": "Ожидает", "timestamp": "2024-03-06 10:00:00"})
+    repo.create({"user_id": "1", "amount": 30, "payout_type": "Аванс", "status": "Ожидает", "timestamp": "2024-04-01 10:00:00"})
+
+    def advances():
+        return repo.monthly_total("1", "2024-03", ["Аванс", None], ["Ожидает", "Одобрено"])
+
+    assert advances() == 150
+    assert repo.monthly_total(1, "2024-03") == 220
+
+    repo.update(str(first["id"]), {"status": "Отклонено"})
+    assert advances() == 50
+    repo.update(str(first["id"]), {"status": "Ожидает", "timestamp": "2024-04-02 10:00:00"})
+    assert advances() == 50
+    assert repo.monthly_total("1", "2024-04") == 130
+    repo.delete(str(first["id"]))
+    assert repo.monthly_total("1", "2024-04") == 30
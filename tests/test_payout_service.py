@@ -1,6 +1,7 @@
 import asyncio
 from app.schemas.payout import PayoutCreate
 from app.services.payout_service import PayoutService
+from app.utils.executor import get_executor_metrics
 
 
 class DummyPayoutRepository:
@@ -41,8 +42,65 @@ def test_create_payout_keeps_card_number_in_payload():
         sync_to_bot=True,
     )
 
+    metrics = get_executor_metrics()
+    metrics.reset()
     payout = asyncio.run(service.create_payout(data))
 
+    # executor metrics are labelled with the repository operation
+    assert list(metrics.snapshot()["calls"]) == ["DummyPayoutRepository.create"]
     assert repo.created["card_number"] == "1111 2222 3333 4444"
     assert telegram.last_payload["card_number"] == "1111 2222 3333 4444"
     assert payout.card_number == "1111 2222 3333 4444"
+
+
+def test_list_control_counts_monthly_total_and_recent_requests(tmp_path, monkeypatch):
+    import json
+
+    from app.data.payout_repository import PayoutRepository
+    from app.services import users as users_service
+
+    path = tmp_path / "advance_requests.json"
+    rows = [
+        {"id": 1, "user_id": "1", "amount": 100, "status": "Выплачено", "timestamp": "2024-03-01 10:00:00"},
+        {"id": 2, "user_id": "1", "amount": 200, "status": "Выплачено", "timestamp": "2024-03-03 09:00:00"},
+        {"id": 3, "user_id": "1", "amount": 400, "status": "Выплачено", "timestamp": "2024-03-20 09:00:00"},
+        {"id": 4, "user_id": "2", "amount": 50, "status": "Выплачено", "timestamp": "2024-03-03 08:00:00"},
+        {"id": 5, "user_id": "1", "amount": 800, "status": "Выплачено", "timestamp": "2024-02-28 12:00:00"},
+    ]
+    path.write_text(json.dumps(rows), encoding="utf-8")
+    monkeypatch.setattr(users_service, "load_users_map", lambda: {})
+    service = PayoutService(repo=PayoutRepository(str(path)))
+
+    result = {r["id"]: r for r in asyncio.run(service.list_control())}
+
+    assert result["2"]["previous_total_month"] == 700
+    assert result["2"]["previous_requests_count"] == 1
+    assert "frequent_request" in result["2"]["warnings"]
+    assert result["3"]["previous_requests_count"] == 0
+    assert result["4"]["previous_total_month"] == 50
+    assert result["5"]["previous_total_month"] == 800
+
+
+def test_pdf_export_builds_the_default_repository_once(monkeypatch):
+    from app.services import excel
+
+    built = []
+
+    class Repo(DummyPayoutRepository):
+        def __init__(self):
+            super().__init__()
+            self.reloads = 0
+            built.append(self)
+
+        def reload(self):
+            self.reloads += 1
+
+        def load_all(self):
+            return []
+
+    monkeypatch.setattr(excel, "get_payout_repository", Repo)
+    monkeypatch.setattr(excel, "_payout_repo", None)
+
+    assert excel.export_advances_to_pdf() is None
+    assert excel.export_advances_to_pdf() is None
+    assert len(built) == 1 and built[0].reloads == 1
@@ -0,0 +1,41 @@
+import json
+import pickle
+
+from app.data import journal_storage
+from app.data.payout_repository import PayoutRepository
+from app.data.records import PayoutRecord, json_default
+
+
+def test_record_behaves_like_a_dict():
+    record = PayoutRecord({"id": 1, "amount": 100, "is_manual": True})
+
+    assert not hasattr(record, "__dict__")
+    assert record["amount"] == record.amount == 100
+    assert record.get("status") is None and "status" not in record
+    assert record == {"id": 1, "amount": 100, "is_manual": True}
+    assert dict(record) == {"id": 1, "amount": 100, "is_manual": True}
+
+    record.update(status="Ожидает", amount=150)
+    del record["is_manual"]
+    assert list(record) == ["id", "amount", "status"]
+    assert {**record} == record.copy() == {"id": 1, "amount": 150, "status": "Ожидает"}
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert json.loads(json.dumps([record], default=json_default)) == [dict(record)]
+
+
+def test_payout_repository_keeps_records(monkeypatch, tmp_path):
+    monkeypatch.setattr(journal_storage, "STORAGE_ENGINE", "journal")
+    monkeypatch.setattr(journal_storage, "JOURNAL_COMPACT_THRESHOLD", 1000)
+    path = tmp_path / "advance_requests.json"
+    path.write_text(json.dumps([{"id": 1, "user_id": "1", "amount": 100}]), encoding="utf-8")
+
+    repo = PayoutRepository(str(path))
+    created = repo.create({"user_id": "2", "amount": 200, "is_manual": True})
+    repo.update("1", {"amount": 150})
+
+    assert all(isinstance(p, PayoutRecord) for p in repo.load_all())
+    reopened = PayoutRepository(str(path))
+    assert reopened.load_all() == [
+        {"id": 1, "user_id": "1", "amount": 150},
+        {"id": int(created["id"]), "user_id": "2", "amount": 200, "is_manual": True},
+    ]
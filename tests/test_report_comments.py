@@ -0,0 +1,36 @@
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.comments import Comment
+
+from app.services import excel
+from app.services.report import generate_employee_report
+from app.services.workbook_cache import WorkbookCache
+
+
+def test_report_reads_comments_from_one_sheet_map(tmp_path, monkeypatch):
+    path = str(tmp_path / "salary.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "МАРТ"
+    ws["CM4"].comment = Comment("аванс 5000", "admin")
+    ws["CA4"].comment = Comment("бонус за план", "admin")
+    ws["B4"].comment = Comment("не нужен", "admin")
+    wb.save(path)
+    cache = WorkbookCache(max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr(excel, "EXCEL_FILE", path)
+    monkeypatch.setattr(excel, "get_workbook_cache", lambda: cache)
+
+    assert excel.get_sheet_comments("МАРТ", ["CM", "CA"]) == {
+        (4, "CM"): "аванс 5000",
+        (4, "CA"): "бонус за план",
+    }
+    assert excel.get_sheet_comments("АПРЕЛЬ") is None
+
+    report = generate_employee_report("Вера", "МАРТ", pd.DataFrame({"ИМЯ": ["А", "Вера"]}), 1)
+
+    assert report[-1][1:] == [
+        ("Аванс", "аванс 5000"),
+        ("Удержание", "No comment"),
+        ("Бонус", "бонус за план"),
+    ]
+    assert cache.stats()["misses"] == 2  # sheet names + one comments pass
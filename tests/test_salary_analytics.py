@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services import salary_service as salary_module
+from app.services.salary_analytics_service import SalaryAnalyticsService
+from app.services.salary_service import SalaryService
+
+SHEETS = {
+    "ЯНВАРЬ": pd.DataFrame({"ИМЯ": ["Вера", "Юля", np.nan], "К выплате": [100, 50, 150]}),
+    "ФЕВРАЛЬ": pd.DataFrame({"ИМЯ": ["Вера", "Юля"], "К выплате": [200, 70], "ОКЛАД": [10, 0]}),
+    "МАРТ": pd.DataFrame({"ИМЯ": ["Вера"], "К выплате": [300]}),
+}
+
+
+class _Repo:
+    def list_employees(self, archived=None):
+        return [
+            SimpleNamespace(name="Вера", id="1", work_place="Цех"),
+            SimpleNamespace(name="Юля", id="2", work_place="Пассаж"),
+        ]
+
+
+@pytest.fixture
+def analytics(monkeypatch):
+    calls = []
+
+    def load(sheet_name):
+        calls.append(sheet_name)
+        if sheet_name is None:
+            return ["Лист1", *SHEETS]
+        return SHEETS[sheet_name].copy()
+
+    monkeypatch.setattr(salary_module, "load_data", load)
+    service = SalaryAnalyticsService(SalaryService(_Repo()))
+    service.calls = calls
+    return service
+
+
+def test_year_to_date_and_trend(analytics):
+    ytd = asyncio.run(analytics.year_to_date(until="февраль", metrics=["final_amount"]))
+    assert [(t.employee_id, t.months, t.totals) for t in ytd] == [
+        ("1", ["ЯНВАРЬ", "ФЕВРАЛЬ"], {"final_amount": 300.0}),
+        ("2", ["ЯНВАРЬ", "ФЕВРАЛЬ"], {"final_amount": 120.0}),
+    ]
+
+    trend = asyncio.run(analytics.trend(employee_ids={"1"}))
+    assert [(p.month, p.value) for p in trend[0].points] == [
+        ("ЯНВАРЬ", 100.0),
+        ("ФЕВРАЛЬ", 200.0),
+        ("МАРТ", 300.0),
+    ]
+
+    # one read per sheet: later queries reuse the cached cube
+    assert analytics.calls.count("ЯНВАРЬ") == 1
+
+
+def test_points_and_validation(analytics):
+    points = asyncio.run(analytics.points())
+    assert [(p.work_place, p.employees, p.total) for p in points] == [
+        ("Цех", 1, 600.0),
+        ("Пассаж", 1, 120.0),
+    ]
+    assert asyncio.run(analytics.points(month="ЯНВАРЬ", metric="salary_fixed"))[0].total == 0
+
+    with pytest.raises(ValueError):
+        asyncio.run(analytics.trend(metric="unknown"))
+    with pytest.raises(ValueError):
+        asyncio.run(analytics.year_to_date(until="ЛИСТ1"))
@@ -0,0 +1,43 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+
+from app.services import salary_service as salary_module
+from app.services.salary_service import SalaryService
+
+
+class _Repo:
+    def list_employees(self, archived=None):
+        return [SimpleNamespace(name="Вера", id="1")]
+
+
+def test_get_salary_coerces_columns(monkeypatch):
+    service = SalaryService(_Repo())
+    sheet = pd.DataFrame(
+        {
+            "ИМЯ": [" Вера ", "Юля", "", np.nan],
+            "ОСН.": [10.7, "5", "x", np.nan],
+            "ДОП.": [2, 1, 0, 0],
+            "ОБЩ": [0, 9, 0, 0],
+            "ОКЛАД": ["1500.5", np.nan, 3, "ошибка"],
+            "Комментарий": ["  премия ", "", np.nan, None],
+            "БОНУС": pd.to_datetime(["2025-03-01"] * 4),
+            "АВАНС": [pd.Timestamp("2025-03-01"), 200, None, "50"],
+        }
+    )
+    monkeypatch.setattr(salary_module, "load_data", lambda sheet_name: sheet.copy())
+
+    rows = asyncio.run(service.get_salary("МАРТ"))
+
+    assert [(r.name, r.employee_id) for r in rows] == [("Вера", "1"), ("Юля", ""), ("nan", "")]
+    assert [(r.shifts_main, r.shifts_total) for r in rows] == [(10, 12), (5, 9), (0, 0)]
+    assert [r.salary_fixed for r in rows] == [1500.5, 0.0, 0.0]
+    assert [r.comment for r in rows] == ["премия", None, "nan"]
+    # date cells count as empty, not as nanoseconds since the epoch
+    assert [r.salary_bonus for r in rows] == [0.0, 0.0, 0.0]
+    assert [r.advance for r in rows] == [0.0, 200.0, 50.0]
+
+    only = asyncio.run(service.get_salary("МАРТ", employee_id="1"))
+    assert [r.name for r in only] == ["Вера"]
@@ -0,0 +1,93 @@
+import json
+
+from app.core.types import Employee
+from app.data.sent_message_log import (
+    SentMessageLog,
+    employee_name_lookup,
+    get_sent_message_log,
+)
+from app.services.telegram_service import TelegramService
+
+
+def test_log_is_append_only_with_tombstones(tmp_path):
+    path = tmp_path / "sent_messages.jsonl"
+    legacy = tmp_path / "sent_messages.json"
+    legacy.write_text(
+        json.dumps([
+            {"id": "b", "user_id": "2", "message_id": 20, "timestamp": "2024-01-02"},
+            {"id": "a", "user_id": "1", "message_id": 10, "timestamp": "2024-01-01"},
+        ]),
+        encoding="utf-8",
+    )
+    log = SentMessageLog(path, legacy)
+    assert [e["id"] for e in log.page()[0]] == ["b", "a"]
+
+    before = path.read_bytes()
+    log.put({"id": "c", "user_id": "1", "message_id": 11, "timestamp": "2024-01-03"})
+    assert path.read_bytes().startswith(before)
+
+    assert log.update_by_message("1", 10, {"status": "принято"})
+    assert not log.update_by_message("1", 99, {"status": "принято"})
+    log.delete("b")
+    log.put({"id": "c", "user_id": "1", "message_id": 11, "timestamp": "2024-01-03",
+             "status": "заменено"})
+
+    assert log.page()[0] == [
+        {"id": "c", "user_id": "1", "message_id": 11, "timestamp": "2024-01-03",
+         "status": "заменено"},
+        {"id": "a", "user_id": "1", "message_id": 10, "timestamp": "2024-01-01",
+         "status": "принято"},
+    ]
+    assert log.page(1)[0][0]["id"] == "c"
+    # a second process appending to the same file is picked up by the index
+    SentMessageLog(path).put({"id": "d", "user_id": "3", "message_id": 30})
+    assert log.update_by_message("3", 30, {"status": "принято"})
+    assert {e["id"] for e in log.load_all()} == {"a", "c", "d"}
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 8
+
+
+def test_ack_updates_service_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    class Repo:
+        def get_employee(self, employee_id):
+            return None
+
+    service = TelegramService(Repo())
+    service._append_personal_log_entry(
+        user_id=42, user_name="Ivan", message="Hi", status="отправлено", message_id=7
+    )
+    TelegramService.update_sent_message_status(42, 7, "принято")
+
+    (entry,), _ = service.list_log()
+    assert entry["status"] == "принято" and entry["accepted"] is True
+    assert get_sent_message_log() is service.msg_log
+    service.delete_log_entry(entry["id"])
+    assert service.list_log() == ([], None)
+
+
+def test_backfill_fills_old_records_once(tmp_path):
+    log = SentMessageLog(tmp_path / "log.jsonl")
+    log.put({"id": "a", "user_id": "1", "status": "Принято", "timestamp": "t"})
+    log.put({
+        "id": "b", "broadcast": True, "timestamp": "t",
+        "recipients": [{"user_id": "1"}, {"user_id": "2", "name": "Петр"}],
+    })
+
+    class Repo:
+        calls = 0
+
+        def get_employee(self, employee_id):
+            Repo.calls += 1
+            return Employee(id=employee_id, name="Иван", full_name="", phone="")
+
+    resolve = employee_name_lookup(Repo())
+    assert log.backfill(resolve) == 2
+    assert Repo.calls == 1
+    assert log.page()[0] == [
+        {"id": "b", "broadcast": True, "timestamp": "t",
+         "recipients": [{"user_id": "1", "name": "Иван"}, {"user_id": "2", "name": "Петр"}]},
+        {"id": "a", "user_id": "1", "status": "Принято", "timestamp": "t",
+         "user_name": "Иван", "broadcast": False, "accepted": True},
+    ]
+    assert log.backfill(resolve) == 0
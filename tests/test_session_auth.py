@@ -44,3 +44,48 @@ def test_root_redirects_when_cookie_valid():
     response = client.get("/", follow_redirects=False)
     assert response.status_code == 307
     assert response.headers["location"] == "/admin"
+
+
+def test_executor_metrics_require_login():
+    client = create_test_client()
+    assert client.get("/metrics/executor").status_code == 401
+
+    login_response = client.post(
+        "/session/login", json={"login": "admin", "password": "admin"}
+    )
+    client.cookies.set("access_token", login_response.json()["token"])
+    response = client.get("/metrics/executor")
+    assert response.status_code == 200
+    assert "requests" in response.json()
+
+
+def test_employee_edits_invalidate_cached_tokens(tmp_path, monkeypatch):
+    from app.data.employee_repository import EmployeeRepository
+    from app.data.json_storage import JsonStorage
+    from app.services import access_control_service
+    from app.services.access_control_service import AccessControlService
+
+    users = tmp_path / "user.json"
+    users.write_text('{"900": {"name": "Old", "full_name": "Old", "phone": ""}}', encoding="utf-8")
+    service = AccessControlService(
+        path=tmp_path / "access.json",
+        secret_key="secret",
+        employee_repo=EmployeeRepository(JsonStorage(users)),
+    )
+    service.create_user(
+        {"id": "900", "login": "manager", "password": "pass", "role_id": "owner"}
+    )
+    monkeypatch.setattr(access_control_service, "_service_instance", service)
+    client = create_test_client()
+    token = client.post(
+        "/session/login", json={"login": "manager", "password": "pass"}
+    ).json()["token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/auth/me", headers=headers).json()["display_name"] == "Old"
+
+    response = client.put(
+        "/api/employees/900", json={"name": "New", "full_name": "New"}, headers=headers
+    )
+    assert response.status_code == 200
+    # the cached resolution of the token is dropped with the edit
+    assert client.get("/api/auth/me", headers=headers).json()["display_name"] == "New"
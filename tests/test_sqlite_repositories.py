@@ -0,0 +1,102 @@
+import json
+from datetime import date
+
+from app.core.types import Employee, EmployeeStatus
+from app.data.sqlite_repositories import (
+    SqliteEmployeeRepository,
+    SqliteIncentiveRepository,
+    SqliteMessageRepository,
+    SqlitePayoutRepository,
+)
+from app.db import migrate_json
+
+
+def _url(tmp_path):
+    return f"sqlite:///{tmp_path / 'bot.db'}"
+
+
+def test_payout_list_filters_and_orders(tmp_path):
+    repo = SqlitePayoutRepository(_url(tmp_path))
+    repo.create({"user_id": "1", "status": "Ожидает", "payout_type": "Аванс", "timestamp": "2024-05-01 10:00:00"})
+    repo.create({"user_id": "1", "status": "Выплачено", "payout_type": "Аванс", "timestamp": "2024-06-01 10:00:00"})
+    repo.create({"user_id": "2", "status": "Ожидает", "payout_type": "Зарплата", "timestamp": "broken"})
+
+    assert [p["id"] for p in repo.list(employee_id="1")] == [2, 1]
+    assert [p["id"] for p in repo.list(status="Ожидает")] == [3, 1]
+    # unparsable timestamps are kept by date filters, as in the JSON repository
+    assert [p["id"] for p in repo.list(from_date="2024-05-15")] == [3, 2]
+
+    updated = repo.update("1", {"status": "Одобрено", "note": None})
+    assert updated["status"] == "Одобрено"
+    assert [p["id"] for p in repo.list(status="Одобрено")] == [1]
+
+    repo.delete_many(["1", "2"])
+    assert [p["id"] for p in repo.load_all()] == [3]
+
+
+def test_locked_incentives_are_not_changed(tmp_path):
+    repo = SqliteIncentiveRepository(_url(tmp_path))
+    item = repo.create({"employee_id": "1", "type": "bonus", "date": "2024-01-01", "locked": True})
+
+    assert repo.update(str(item["id"]), {"amount": 10}) is None
+    assert repo.delete(str(item["id"])) is False
+    assert repo.list(employee_id="1")[0]["id"] == item["id"]
+
+
+def test_message_accept_by_details(tmp_path):
+    repo = SqliteMessageRepository(_url(tmp_path))
+    repo.create({"user_id": "5", "message_id": 42, "timestamp": "2024-01-01T00:00:00"})
+
+    accepted = repo.accept_by_details("5", 42)
+    assert accepted["accepted"] is True
+    assert repo.list()[0]["status"] == "Принято"
+
+
+def test_employee_filters(tmp_path):
+    repo = SqliteEmployeeRepository(_url(tmp_path))
+    repo.add_employee(Employee(id="1", name="A", full_name="A A", phone="1", position="cook", tags=["x"]))
+    repo.add_employee(
+        Employee(id="2", name="B", full_name="B B", phone="2", status=EmployeeStatus.INACTIVE, archived=True)
+    )
+
+    assert [e.id for e in repo.list_employees()] == ["1"]
+    assert [e.id for e in repo.list_employees(archived=None, tags=["x"])] == ["1"]
+    assert repo.get_employee("2").status is EmployeeStatus.INACTIVE
+
+    repo.delete_employee_by_id("1")
+    assert repo.get_employee("1") is None
+
+
+def test_migration_copies_json_files(tmp_path, monkeypatch):
+    users = tmp_path / "user.json"
+    users.write_text(json.dumps({"7": {"name": "G", "birthdate": "1990-02-03"}}), encoding="utf-8")
+    payouts = tmp_path / "advance_requests.json"
+    payouts.write_text(json.dumps([{"id": 1, "user_id": "7", "status": "Проведено"}]), encoding="utf-8")
+    monkeypatch.setattr(migrate_json, "DATA_FILE", users)
+    files = {
+        "PayoutRepository": payouts,
+        "VacationRepository": tmp_path / "vacations.json",
+        "IncentiveRepository": tmp_path / "incentives.json",
+        "AssetRepository": tmp_path / "assets.json",
+    }
+    for name, path in files.items():
+        cls = getattr(migrate_json, name)
+        monkeypatch.setattr(migrate_json, name, lambda cls=cls, path=path: cls(str(path)))
+
+    counts = migrate_json.migrate(_url(tmp_path), messages_file=str(tmp_path / "messages.json"))
+
+    assert counts["employees"] == 1 and counts["payouts"] == 1
+    assert SqliteEmployeeRepository(_url(tmp_path)).get_employee("7").birthdate == date(1990, 2, 3)
+    assert SqlitePayoutRepository(_url(tmp_path)).load_all()[0]["status"] == "Выплачено"
+
+
+def test_payout_monthly_total(tmp_path):
+    repo = SqlitePayoutRepository(_url(tmp_path))
+    repo.create({"user_id": "1", "amount": 100, "payout_type": "Аванс", "status": "Ожидает", "timestamp": "2024-12-01 10:00:00"})
+    repo.create({"user_id": "1", "amount": 50, "status": "Одобрено", "timestamp": "2024-12-31 23:59:59"})
+    repo.create({"user_id": "1", "amount": 70, "payout_type": "Зарплата", "status": "Ожидает", "timestamp": "2024-12-06 10:00:00"})
+    repo.create({"user_id": "1", "amount": 30, "payout_type": "Аванс", "status": "Ожидает", "timestamp": "2025-01-01 00:00:00"})
+
+    assert repo.monthly_total("1", "2024-12", ["Аванс", None], ["Ожидает", "Одобрено"]) == 150
+    assert repo.monthly_total("1", "2024-12") == 220
+    assert repo.monthly_total("1", "2025-01") == 30
@@ -12,7 +12,9 @@ class DummyRepo:
         return [Employee(id="123456", name="Test", full_name="Test User", phone="123")] 
 
 
-def test_broadcast_unknown_placeholder_does_not_crash():
+def test_broadcast_unknown_placeholder_does_not_crash(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
     async def _run():
         repo = DummyRepo()
         svc = TelegramService(repo)
@@ -40,7 +42,8 @@ def test_sent_message_schema_allows_broadcast_without_status():
     assert model.status is None
 
 
-def test_send_payout_request_uses_card_number():
+def test_send_payout_request_uses_card_number(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
     repo = DummyRepo()
     svc = TelegramService(repo)
     svc.bot = types.SimpleNamespace(send_message=AsyncMock())
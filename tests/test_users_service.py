@@ -49,3 +49,23 @@ def test_update_user_clears_timestamp_when_restoring(monkeypatch, tmp_path):
     assert updated is not None
     assert updated.archived is False
     assert updated.archived_at is None
+
+
+def test_user_lookup_is_cached_until_repository_changes(monkeypatch, tmp_path):
+    repo = _setup_repo(tmp_path, monkeypatch)
+    repo.add_employee(_make_employee("7"))
+    calls = []
+    list_employees = repo.list_employees
+    monkeypatch.setattr(repo, "list_employees", lambda **kw: calls.append(kw) or list_employees(**kw))
+
+    user = users_service.get_user(7, archived=None)
+    user["name"] = "changed by caller"
+    assert users_service.get_user("7", archived=None)["name"] == "Emp 7"
+    assert users_service.load_users_map(archived=None)["7"]["phone"] == "70000000000"
+    assert len(calls) == 1
+
+    users_service.update_user("7", {"name": "Renamed"})
+
+    assert users_service.get_user("7", archived=None)["name"] == "Renamed"
+    assert users_service.get_user("8") is None
+    assert len(calls) == 3
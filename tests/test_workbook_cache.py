@@ -0,0 +1,57 @@
+import os
+
+from openpyxl import Workbook
+from openpyxl.comments import Comment
+
+from app.services.workbook_cache import WorkbookCache
+
+
+def _workbook(path, value, comment="note"):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "ЯНВАРЬ"
+    ws["A1"] = "ИМЯ"
+    ws["A2"] = value
+    ws["B3"] = 1
+    ws["B3"].comment = Comment(f" {comment} ", "admin")
+    wb.create_sheet("ФЕВРАЛЬ")
+    wb.save(path)
+
+
+def test_cache_reuses_parsed_data_until_file_changes(tmp_path):
+    path = str(tmp_path / "data.xlsx")
+    _workbook(path, "Вера")
+    cache = WorkbookCache(max_bytes=10 * 1024 * 1024)
+
+    assert cache.sheet_names(path) == ["ЯНВАРЬ", "ФЕВРАЛЬ"]
+    df = cache.dataframe(path, "ЯНВАРЬ", header=None)
+    df.iloc[1, 0] = "changed by caller"
+    assert cache.dataframe(path, "ЯНВАРЬ", header=None).iloc[1, 0] == "Вера"
+    assert cache.values(path, "ЯНВАРЬ")[1][0] == "Вера"
+    assert cache.comments(path, "ЯНВАРЬ") == {"B3": "note"}
+    assert cache.comments(path, "ФЕВРАЛЬ") == {}
+    assert cache.comments(path, "МАРТ") is None
+    misses = cache.stats()["misses"]
+
+    cache.dataframe(path, "ЯНВАРЬ", header=None)
+    cache.values(path, "ЯНВАРЬ")
+    assert cache.stats()["misses"] == misses
+
+    _workbook(path, "Юля", comment="other")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.dataframe(path, "ЯНВАРЬ", header=None).iloc[1, 0] == "Юля"
+    assert cache.comments(path, "ЯНВАРЬ") == {"B3": "other"}
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    path = str(tmp_path / "data.xlsx")
+    _workbook(path, "Вера")
+    cache = WorkbookCache(max_bytes=1)
+
+    cache.dataframe(path, "ЯНВАРЬ", header=None)
+    cache.dataframe(path, "ЯНВАРЬ", header=1)
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0